@@ -24,77 +24,195 @@
 ================================================================================
 """
 
+import sys
+import time
+_STARTUP_T0 = time.perf_counter() # Reference point for the --startup-timing breakdown
+STARTUP_TIMING_FLAG = '--startup-timing'
+
+# Batch commands (e.g. 'python ALULA.py sweep ...') are dispatched before
+# tkinter and the GUI modules are imported, so scripted runs never load them.
+if __name__ == "__main__" and len(sys.argv) > 1 and sys.argv[1:] != [STARTUP_TIMING_FLAG]:
+    import alula_cli
+    sys.exit(alula_cli.main(sys.argv[1:]))
+
 # Standard library imports for GUI, math, and file operations.
+# The dialog modules (filedialog, messagebox, simpledialog) are imported on first use.
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
+from tkinter import ttk
 import math
 import json
-from typing import Any, List, Tuple, Dict, Callable
+import os
+from collections import OrderedDict
+from typing import Callable, List, Tuple, Dict
+
+# Headless calculation engine shared with batch tooling.
+import alula_engine
+import alula_cache
+import alula_components
+import alula_history
+import alula_jobs
+import alula_profile
+
+def tessellate_curve(f: Callable[[float], float], v_start: float, v_end: float,
+                     to_canvas: Callable[[float, float], Tuple[float, float]],
+                     tolerance_px: float = 0.25, max_depth: int = 12) -> List[Tuple[float, float]]:
+    """
+    Samples the curve g = f(v) between v_start and v_end as a canvas polyline.
+    Intervals are split in half while the curve's midpoint lies more than
+    `tolerance_px` pixels from the chord between the interval's endpoints,
+    so points gather where the curve bends on screen and straight stretches
+    get few. The polyline starts and ends exactly at v_start and v_end.
+    """
+    def deviation(p, a, b):
+        # Perpendicular distance of p from the chord a-b (in pixels)
+        dx, dy = b[0] - a[0], b[1] - a[1]
+        length = math.hypot(dx, dy)
+        if length == 0: return math.hypot(p[0] - a[0], p[1] - a[1])
+        return abs(dx * (p[1] - a[1]) - dy * (p[0] - a[0])) / length
+
+    p_start = to_canvas(v_start, f(v_start))
+    points = [p_start]
+    # Depth-first subdivision with an explicit stack of (v_a, p_a, v_b, p_b, depth)
+    stack = [(v_start, p_start, v_end, to_canvas(v_end, f(v_end)), 0)]
+    while stack:
+        v_a, p_a, v_b, p_b, depth = stack.pop()
+        v_mid = (v_a + v_b) / 2
+        p_mid = to_canvas(v_mid, f(v_mid))
+        # Always split once so a curve that is symmetric about the chord is not missed
+        if depth < max_depth and (depth == 0 or deviation(p_mid, p_a, p_b) > tolerance_px):
+            stack.append((v_mid, p_mid, v_b, p_b, depth + 1))
+            stack.append((v_a, p_a, v_mid, p_mid, depth + 1))
+        else:
+            points.append(p_b)
+    return points
+
+# Errors the engine raises for designs it cannot evaluate, such as a half-typed
+# zero span or a negative envelope volume; the GUI keeps the last results instead
+EVALUATION_ERRORS = (ValueError, TypeError, ZeroDivisionError, OverflowError)
+
 
 class AlulaApp(tk.Tk):
     """
     Main application class for ALULA, handling the GUI, data management,
     calculations, and compliance checks for ultralight aircraft design.
     """
-    def __init__(self):
+    def __init__(self, startup_timing: bool = False):
         """
         Initializes the ALULA application, setting up the main window,
         defining constants, configuring styles, initializing data structures,
         creating UI widgets, and performing initial display updates.
+        With `startup_timing`, a breakdown of the time to first paint is
+        printed once the window has been drawn.
         """
+        self.startup_marks: List[Tuple[str, float]] | None = [] if startup_timing else None
+        self.mark_startup("imports")
         super().__init__()
+        self.mark_startup("Tk window")
         self.title("ALULA - Accessible Learning Ultralight Layout Assistant")
         self.geometry("1200x800")
         self.minsize(1000, 700)
 
         # --- Application Constants ---
         # Defines key FAA FAR Part 103 limits and standard atmospheric/physical constants
-        # used throughout the calculation modules.
-        self.FAR_103_EMPTY_WEIGHT_LBS = 254
-        self.FAR_103_GLIDER_EMPTY_WEIGHT_LBS = 155
-        self.FAR_103_MAX_FUEL_GAL = 5
-        self.FAR_103_MAX_FUEL_LBS = self.FAR_103_MAX_FUEL_GAL * 6 # Assuming 6 lbs/gallon for aviation fuel
-        self.FAR_103_MAX_SPEED_KNOTS = 55
-        self.FAR_103_STALL_SPEED_KNOTS = 24
-        self.RHO_SEA_LEVEL_SLUG = 0.002377 # Air density at sea level (slugs/cu ft)
-        self.HELIUM_DENSITY_SLUG = 0.000332 # Helium density (slugs/cu ft)
-        self.KNOTS_TO_FPS = 1.68781 # Conversion factor from knots to feet per second
+        # used throughout the display code. The values live in the calculation engine.
+        self.FAR_103_EMPTY_WEIGHT_LBS = alula_engine.FAR_103_EMPTY_WEIGHT_LBS
+        self.FAR_103_GLIDER_EMPTY_WEIGHT_LBS = alula_engine.FAR_103_GLIDER_EMPTY_WEIGHT_LBS
+        self.FAR_103_MAX_FUEL_GAL = alula_engine.FAR_103_MAX_FUEL_GAL
+        self.FAR_103_MAX_FUEL_LBS = alula_engine.FAR_103_MAX_FUEL_LBS
+        self.FAR_103_MAX_SPEED_KNOTS = alula_engine.FAR_103_MAX_SPEED_KNOTS
+        self.FAR_103_STALL_SPEED_KNOTS = alula_engine.FAR_103_STALL_SPEED_KNOTS
+        self.RHO_SEA_LEVEL_SLUG = alula_engine.RHO_SEA_LEVEL_SLUG
+        self.HELIUM_DENSITY_SLUG = alula_engine.HELIUM_DENSITY_SLUG
+        self.KNOTS_TO_FPS = alula_engine.KNOTS_TO_FPS
 
         # GUI style configuration
         self.style = ttk.Style(self)
         self.style.theme_use('clam')
         self.configure_styles()
+        self.mark_startup("styles")
 
         # Initialize the application's data model
         self.data = self.create_data_dictionary()
-        self.component_entries: List[dict[str, tk.StringVar]] = [] # Stores references to weight & balance entry widgets
+        # Weight & balance component table (any length), shown in a virtualized view on the Weights tab.
+        # Each vehicle type has its own table; `components` is the selected type's.
+        self.components_type = self.data['inputs']['vehicle_type'].get()
+        self.components = alula_components.ComponentTable(alula_engine.default_components(self.components_type))
+        self.component_sets: Dict[str, alula_components.ComponentTable] = {self.components_type: self.components}
+        self.COMPONENT_VIEW_ROWS = 16 # Treeview rows materialized at once
+        self.component_view_first = 0 # Table index of the top visible row
+        self.component_editor = None # Entry or Combobox editing a cell, if any
+        self.component_tree = None # Created with the Weights tab
         self.sizing_tab_widgets: Dict[str, Tuple[ttk.Label, ttk.Entry]] = {}
+        self.result_cache = alula_cache.ResultCache() # Avoids re-solving designs seen before (e.g. when switching vehicle types back)
         self.aero_tab_widgets: Dict[str, Tuple[ttk.Label, ttk.Entry]] = {}
         
         # Aerodynamic coefficient maps for various configurations
-        self.cockpit_drag_map = {
-            "Open Frame Fuselage": 0.025, "Cockpit with Windshield": 0.015,
-            "Closed Cockpit": 0.008, "Streamlined Glider Type Cockpit": 0.003
-        }
-        
-        self.tail_drag_map = {
-            "Tailless": 0.0000, "V-Tail": 0.0010, "Conventional": 0.0015,
-            "Cruciform": 0.0018, "T-Tail": 0.0025, "Twin Tail": 0.0030
-        }
-        
-        self.paraglider_class_map = {
-            "EN A (Beginner)": {"cl_trim": 1.2, "cl_max": 2.2, "cd0": 0.08, "oswald": 0.4},
-            "EN B (Intermediate)": {"cl_trim": 1.1, "cl_max": 2.0, "cd0": 0.06, "oswald": 0.5},
-            "EN C (Advanced)": {"cl_trim": 1.0, "cl_max": 1.8, "cd0": 0.04, "oswald": 0.6},
-            "EN D (Expert)": {"cl_trim": 0.9, "cl_max": 1.7, "cd0": 0.03, "oswald": 0.7}
+        self.cockpit_drag_map = alula_engine.COCKPIT_DRAG_MAP
+        self.tail_drag_map = alula_engine.TAIL_DRAG_MAP
+        self.paraglider_class_map = alula_engine.PARAGLIDER_CLASS_MAP
+
+        # --- Live Update ---
+        # Edits are coalesced for a short delay, then only the views that depend on
+        # the edited inputs (directly, or through a calculation result that changed)
+        # are redrawn. Each view lists the inputs it reads and the results it shows;
+        # None means it shows every calculation result.
+        self.LIVE_UPDATE_DELAY_MS = 150
+        self.live_update = tk.BooleanVar(value=True)
+        self.view_dependencies: Dict[str, Tuple[set, set | None]] = {
+            'results': ({'vehicle_type'}, None),
+            'cg': ({'vehicle_type', 'fuselage_length'}, {"CG Location", "Static Margin"}),
+            'pie': (set(), {"Empty Weight", "Gross Weight", "Structure Weight", "Power System Weight", "Systems Weight", "Fuel Weight", "Fuel System Weight", "Pilot Weight"}),
+            'envelope': ({'vehicle_type'}, {"Stall Speed", "Min. Fwd Speed", "Stall Speed Flaps", "VH"}),
+            'feedback': ({'vehicle_type'}, None),
+            # Any change to a power curve moves VH or one of the climb results derived from it
+            'power': ({'vehicle_type'}, {"Gross Weight", "Stall Speed", "VH", "Vy", "ROC", "Min Power Speed", "Power Margin @ Min Power"}),
+            # Evaluates every vehicle type, so any input may change one of its columns
+            'comparison': ((set(alula_engine.DEFAULT_INPUTS) - alula_engine.DISPLAY_ONLY_INPUTS) | {'component_weights'}, None),
         }
+        self.dirty_inputs: set = set() # Inputs edited since the last update
+        self.update_job = None # Pending after() callback for the coalesced update
+        self.evaluation_failed = False # The last recalculation kept stale results (see report_evaluation)
+        self.canvas_items: Dict[str, dict] = {} # Retained canvas items per view, rebuilt on resize
+        self.curve_cache: OrderedDict = OrderedDict() # Tessellated stall curves, most recently used last
+        self.CURVE_CACHE_SIZE = 32
+
+        # --- Background Jobs ---
+        # Long analyses run on a worker thread; their progress is polled from the main loop.
+        self.JOB_POLL_MS = 100
+        self.MONTE_CARLO_SAMPLES = 1_000_000
+        self.job_runner = alula_jobs.JobRunner()
+        self.job_callbacks: Dict[int, Callable] = {} # Job id -> function receiving the job's result
+        self.job_poll_scheduled = False
+
+        # --- Revision History ---
+        # Every calculated state is recorded (as a delta) for undo/redo, diffs and result trends;
+        # saved and loaded designs keep it in a sidecar file next to the design.
+        self.history = alula_history.RevisionHistory()
+
+        # --- Lazy Tabs ---
+        # Notebook tabs are built the first time they are selected
+        self.pending_tabs: Dict[str, Tuple[str, Callable, ttk.Frame]] = {} # Tab widget name -> (title, builder, frame)
+        self.built_tabs: set = set() # Titles of the tabs built so far
+        self.mark_startup("data model")
 
         # Create application menu bar and main UI widgets
         self.create_menu()
         self.create_widgets()
+        self.mark_startup("widgets")
+        self.view_updaters = {
+            'results': self.update_results_panel,
+            'cg': self.update_cg_canvas,
+            'pie': self.update_pie_chart,
+            'envelope': self.update_flight_envelope,
+            'feedback': self.update_feedback_tab,
+            'power': self.update_power_chart,
+            'comparison': self.update_comparison_table,
+        }
+        self.register_input_traces()
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
         
-        # Schedule initial UI update after the main window has been drawn
-        self.after(50, self.initial_draw)
+        # Schedule initial UI update as soon as the event loop is running
+        self.after_idle(self.initial_draw)
 
     def initial_draw(self):
         """
@@ -102,7 +220,33 @@ class AlulaApp(tk.Tk):
         based on the default vehicle type selected during application startup.
         """
         self.update_idletasks()
+        self.mark_startup("layout")
         self.update_ui_for_vehicle_type()
+        self.update_idletasks()
+        self.mark_startup("first paint")
+        self.report_startup()
+
+    def mark_startup(self, phase: str):
+        """
+        Records the end of a startup phase when startup timing is on.
+        """
+        if self.startup_marks is not None:
+            self.startup_marks.append((phase, time.perf_counter()))
+
+    def report_startup(self):
+        """
+        Prints the startup breakdown (time per phase and total time to first
+        paint since ALULA.py started) to stderr, once.
+        """
+        if not self.startup_marks: return
+        lines = ["ALULA startup (ms):"]
+        previous = _STARTUP_T0
+        for phase, t in self.startup_marks:
+            lines.append(f"  {phase:<18}{(t - previous) * 1000:8.1f}")
+            previous = t
+        lines.append(f"  {'total':<18}{(previous - _STARTUP_T0) * 1000:8.1f}")
+        print("\n".join(lines), file=sys.stderr)
+        self.startup_marks = None
 
     def configure_styles(self):
         """
@@ -124,6 +268,14 @@ class AlulaApp(tk.Tk):
         self.style.configure('Red.TLabel', foreground=red_color, background=bg_color)
         self.style.configure('Green.TLabel', foreground=green_color, background=bg_color)
 
+    def configure_treeview_style(self):
+        """
+        Configures the dark Treeview style, which only the Weights and
+        Diagnostics tabs use, when the first of them is built.
+        """
+        self.style.configure('Treeview', background='#2A2A2A', fieldbackground='#2A2A2A', foreground='#FFFFFF')
+        self.style.configure('Treeview.Heading', background='#4F4F4F', foreground='#FFFFFF')
+
     def create_menu(self):
         """
         Creates the application's menu bar with 'File' and 'Help' options,
@@ -136,14 +288,33 @@ class AlulaApp(tk.Tk):
         menubar.add_cascade(label="File", menu=file_menu)
         file_menu.add_command(label="Save Design...", command=self.save_design, accelerator="Ctrl+S")
         file_menu.add_command(label="Load Design...", command=self.load_design, accelerator="Ctrl+O")
+        file_menu.add_command(label="Import Bill of Materials...", command=self.import_bom)
         file_menu.add_separator()
-        file_menu.add_command(label="Exit", command=self.destroy)
+        file_menu.add_command(label="Exit", command=self.on_close)
+        edit_menu = tk.Menu(menubar, tearoff=0, background='#383838', foreground='white')
+        menubar.add_cascade(label="Edit", menu=edit_menu)
+        edit_menu.add_command(label="Undo", command=self.undo_revision, accelerator="Ctrl+Z")
+        edit_menu.add_command(label="Redo", command=self.redo_revision, accelerator="Ctrl+Y")
+        edit_menu.add_separator()
+        edit_menu.add_command(label="Compare Revisions...", command=self.compare_revisions)
+        edit_menu.add_command(label="Export Result Trends...", command=self.export_result_trends)
+        analysis_menu = tk.Menu(menubar, tearoff=0, background='#383838', foreground='white')
+        menubar.add_cascade(label="Analysis", menu=analysis_menu)
+        analysis_menu.add_command(label="Parametric Sweep...", command=self.run_parametric_sweep)
+        analysis_menu.add_command(label="Monte Carlo Analysis...", command=self.run_monte_carlo_analysis)
+        analysis_menu.add_command(label="Altitude Performance...", command=self.show_altitude_performance)
         help_menu = tk.Menu(menubar, tearoff=0, background='#383838', foreground='white')
         menubar.add_cascade(label="Help", menu=help_menu)
         help_menu.add_command(label="About ALULA...", command=self.show_about_dialog)
         help_menu.add_command(label="Part 103 Rules...", command=self.show_rules_dialog)
+        help_menu.add_separator()
+        self.diagnostics_visible = tk.BooleanVar(value=False)
+        help_menu.add_checkbutton(label="Diagnostics", variable=self.diagnostics_visible, command=self.toggle_diagnostics, accelerator="Ctrl+Shift+D")
         self.bind_all("<Control-s>", lambda event: self.save_design())
         self.bind_all("<Control-o>", lambda event: self.load_design())
+        self.bind_all("<Control-z>", lambda event: self.undo_revision())
+        self.bind_all("<Control-y>", lambda event: self.redo_revision())
+        self.bind_all("<Control-D>", lambda event: (self.diagnostics_visible.set(not self.diagnostics_visible.get()), self.toggle_diagnostics()))
 
     def create_data_dictionary(self):
         """
@@ -153,30 +324,8 @@ class AlulaApp(tk.Tk):
         """
         return {
             'inputs': {
-                'vehicle_type': tk.StringVar(value='Fixed Wing'),
-                'tail_style': tk.StringVar(value='Conventional'),
-                'glider_class': tk.StringVar(value='EN B (Intermediate)'),
-                'flaps': tk.BooleanVar(value=True),
-                'cockpit_style': tk.StringVar(value='Cockpit with Windshield'),
-                'pilot_weight': tk.StringVar(value='180'),
-                'wing_area': tk.StringVar(value='250'),
-                'wing_span': tk.StringVar(value='35'),
-                'aspect_ratio': tk.StringVar(value='5.5'),
-                'fuselage_length': tk.StringVar(value='17'),
-                'lemac_ft': tk.StringVar(value='4.0'),
-                'cl_max': tk.StringVar(value='1.5'),
-                'cl_max_flaps': tk.StringVar(value='1.9'),
-                'cd0': tk.StringVar(value='0.025'),
-                'oswald_efficiency': tk.StringVar(value='0.8'),
-                'neutral_point_ft': tk.StringVar(value='5.5'),
-                'engine_hp': tk.StringVar(value='20'),
-                'prop_efficiency': tk.StringVar(value='0.75'),
-                'rotor_diameter': tk.StringVar(value='23'),
-                'rotor_blade_chord': tk.StringVar(value='0.6'),
-                'rotor_rpm': tk.StringVar(value='350'),
-                'num_blades': tk.StringVar(value='2'),
-                'rotor_blade_cd': tk.StringVar(value='0.012'),
-                'envelope_volume': tk.StringVar(value='8000'),
+                key: tk.BooleanVar(value=value) if isinstance(value, bool) else tk.StringVar(value=value)
+                for key, value in alula_engine.DEFAULT_INPUTS.items()
             },
             'calculations': {} # This will store computed results
         }
@@ -187,6 +336,16 @@ class AlulaApp(tk.Tk):
         left, right, and center frames, and initializes the canvases
         for CG and flight envelope visualizations.
         """
+        # Status bar for background jobs (packed first so it spans the full width)
+        status_bar = ttk.Frame(self, style='TFrame')
+        status_bar.pack(side='bottom', fill='x', padx=10, pady=(0, 5))
+        self.status_label = ttk.Label(status_bar, text="Ready", anchor='w')
+        self.status_label.pack(side='left', fill='x', expand=True)
+        self.cancel_button = ttk.Button(status_bar, text="Cancel", command=self.cancel_jobs, state='disabled')
+        self.cancel_button.pack(side='right')
+        self.progress_bar = ttk.Progressbar(status_bar, length=200, mode='determinate')
+        self.progress_bar.pack(side='right', padx=10)
+
         # Left frame for CG diagram and label
         left_frame = ttk.Frame(self, width=200, style='TFrame')
         left_frame.pack(side='left', fill='y', padx=10, pady=10)
@@ -208,6 +367,7 @@ class AlulaApp(tk.Tk):
         self.cg_label.pack(side='bottom', pady=10)
         self.cg_canvas = tk.Canvas(self.cg_canvas_frame, bg='#2A2A2A', highlightthickness=0)
         self.cg_canvas.pack(side='top', fill='both', expand=True)
+        self.cg_canvas.bind('<Configure>', lambda e: self.update_cg_canvas())
 
         # Initialize the right panel with result displays
         self.create_right_panel(right_frame)
@@ -215,6 +375,7 @@ class AlulaApp(tk.Tk):
         # Flight Envelope Visualization Canvas
         self.flight_envelope_canvas = tk.Canvas(center_frame, bg='#2A2A2A', highlightthickness=0, height=350)
         self.flight_envelope_canvas.pack(fill='x', side='bottom', pady=(10,0))
+        self.flight_envelope_canvas.bind('<Configure>', lambda e: self.update_flight_envelope())
 
         # Create notebook (tabbed interface) for input sections
         notebook = ttk.Notebook(center_frame, style='TNotebook')
@@ -228,12 +389,43 @@ class AlulaApp(tk.Tk):
             "Sizing": self.create_sizing_tab,
             "Weights": self.create_weights_tab,
             "Aerodynamics": self.create_aero_tab,
+            "Power Curves": self.create_power_tab,
+            "Comparison": self.create_comparison_tab,
             "Issues & Feedback": self.create_feedback_tab
         }
+        self.notebook = notebook
         for name, func in tab_funcs.items():
             tab = ttk.Frame(notebook, style='TFrame', padding=10)
             notebook.add(tab, text=name)
-            func(tab)
+            self.pending_tabs[str(tab)] = (name, func, tab) # Built on first selection
+
+        # Diagnostics tab (hidden until enabled from the Help menu)
+        self.diagnostics_tab = ttk.Frame(notebook, style='TFrame', padding=10)
+        notebook.add(self.diagnostics_tab, text="Diagnostics")
+        self.pending_tabs[str(self.diagnostics_tab)] = ("Diagnostics", self.create_diagnostics_tab, self.diagnostics_tab)
+        notebook.hide(self.diagnostics_tab)
+
+        notebook.bind('<<NotebookTabChanged>>', lambda e: self.build_tab(notebook.select()))
+        self.build_tab(notebook.select()) # The initially selected tab is needed right away
+
+    def build_tab(self, tab_id):
+        """
+        Builds a notebook tab's widgets if it has not been built yet, then
+        brings the new widgets up to date with the current vehicle type and
+        results.
+        """
+        pending = self.pending_tabs.pop(str(tab_id), None)
+        if pending is None: return # Already built
+        name, func, frame = pending
+        with alula_profile.stage(f'build tab:{name}'):
+            func(frame)
+        self.built_tabs.add(name)
+        if name in ("Configuration", "Sizing", "Aerodynamics"):
+            self.layout_vehicle_inputs()
+        elif name == "Issues & Feedback" and self.data['calculations']:
+            self.update_feedback_tab()
+        elif name == "Comparison" and self.data['calculations']:
+            self.update_comparison_table()
 
     def create_right_panel(self, parent):
         """
@@ -241,7 +433,8 @@ class AlulaApp(tk.Tk):
         calculated results such as weights, loadings, performance estimates,
         CG information, and a pie chart for weight fractions.
         """
-        ttk.Button(parent, text="Calculate Design", command=self.update_all_calculations).pack(pady=10, fill='x', ipady=5)
+        ttk.Button(parent, text="Calculate Design", command=self.update_all_calculations).pack(pady=(10, 2), fill='x', ipady=5)
+        ttk.Checkbutton(parent, text="Live Update", variable=self.live_update, command=self.on_live_update_toggled, style='TCheckbutton').pack(anchor='w', pady=(0, 5))
         
         # Dictionaries to store references to result labels for easy updates
         self.results_desc_labels = {} # Stores the static description labels
@@ -251,7 +444,7 @@ class AlulaApp(tk.Tk):
         sections = {
             "Weights (Estimated)": ["Est. Empty Weight:", "Max Gross Weight:", "Max Fuel Weight:"],
             "Loadings": ["Wing Loading:", "Power Loading:", "Span Loading:"],
-            "Performance (Estimated)": ["Stall Speed Clean:", "Stall Speed Flaps:", "Max Level Speed (VH):", "Rate of Climb (ROC):"],
+            "Performance (Estimated)": ["Stall Speed Clean:", "Stall Speed Flaps:", "Max Level Speed (VH):", "Rate of Climb (ROC):", "Best Climb Speed (Vy):", "Best Angle Speed (Vx):"],
             "Center of Gravity (CG)": ["Longitudinal CG:", "Est. Static Margin:", "Calculated CG Location:"]
         }
         
@@ -272,6 +465,7 @@ class AlulaApp(tk.Tk):
         ttk.Label(parent, text="Efficiency (Weight Fractions)", font=('Helvetica', 12, 'bold')).pack(pady=(20, 5), anchor='w')
         self.pie_canvas = tk.Canvas(parent, height=150, bg='#383838', highlightthickness=0)
         self.pie_canvas.pack(fill='x', pady=5)
+        self.pie_canvas.bind('<Configure>', lambda e: self.update_pie_chart())
 
     def create_dynamic_input_tab(self, parent, inputs_map, widget_dict):
         """
@@ -286,13 +480,14 @@ class AlulaApp(tk.Tk):
     def create_config_tab(self, parent):
         """
         Creates the 'Configuration' tab, allowing selection of vehicle type,
-        tail style, glider class, flap presence, cockpit style, and pilot weight.
+        tail style, glider class, flap presence, cockpit style, pilot weight,
+        and the field elevation and temperature used for density altitude.
         """
         # Vehicle Type Selection
         ttk.Label(parent, text="Vehicle Type:").grid(row=0, column=0, padx=5, pady=10, sticky='w')
-        vehicle_combo = ttk.Combobox(parent, textvariable=self.data['inputs']['vehicle_type'], values=["Fixed Wing", "Gyrocopter", "Helicopter", "Lighter Than Air", "Glider", "Paraglider"])
+        vehicle_combo = ttk.Combobox(parent, textvariable=self.data['inputs']['vehicle_type'], values=alula_engine.VEHICLE_TYPES)
         vehicle_combo.grid(row=0, column=1, padx=5, pady=10, sticky='ew')
-        vehicle_combo.bind("<<ComboboxSelected>>", lambda e: self.update_ui_for_vehicle_type())
+        vehicle_combo.bind("<<ComboboxSelected>>", lambda e: self.on_vehicle_type_selected())
         
         # Placeholders for conditionally visible elements (Tail Style, Glider Class, Flaps)
         self.tail_style_label = ttk.Label(parent, text="Tail Style:")
@@ -312,6 +507,12 @@ class AlulaApp(tk.Tk):
         # Pilot Weight Input (constant visibility)
         ttk.Label(parent, text="Pilot Weight (lbs):").grid(row=5, column=0, padx=5, pady=10, sticky='w')
         ttk.Entry(parent, textvariable=self.data['inputs']['pilot_weight']).grid(row=5, column=1, padx=5, pady=10, sticky='ew')
+
+        # Field conditions (constant visibility); results at the field's density altitude appear under 'Issues & Feedback'
+        ttk.Label(parent, text="Field Elevation (ft):").grid(row=6, column=0, padx=5, pady=10, sticky='w')
+        ttk.Entry(parent, textvariable=self.data['inputs']['field_elevation_ft']).grid(row=6, column=1, padx=5, pady=10, sticky='ew')
+        ttk.Label(parent, text="Temperature vs ISA (°C):").grid(row=7, column=0, padx=5, pady=10, sticky='w')
+        ttk.Entry(parent, textvariable=self.data['inputs']['isa_temp_offset_c']).grid(row=7, column=1, padx=5, pady=10, sticky='ew')
         parent.grid_columnconfigure(1, weight=1)
 
     def create_sizing_tab(self, parent):
@@ -351,30 +552,199 @@ class AlulaApp(tk.Tk):
             'rotor_blade_cd': "Rotor Blade Cd (profile):"
         }
         self.create_dynamic_input_tab(parent, inputs, self.aero_tab_widgets)
+        # Airfoil from the polar library; its list is filled (and the library opened) when first dropped down
+        airfoil_combo = ttk.Combobox(parent, textvariable=self.data['inputs']['airfoil'])
+        airfoil_combo.configure(postcommand=lambda: self.fill_airfoil_list(airfoil_combo))
+        self.aero_tab_widgets['airfoil'] = (ttk.Label(parent, text="Airfoil (blank for Cl_max/Cd0):"), airfoil_combo)
+
+    def fill_airfoil_list(self, combo):
+        """
+        Lists the sections of the airfoil polar library in the airfoil
+        combobox, the first time it is dropped down. The library is created
+        on first use, so opening it is kept out of the application's startup.
+        """
+        if combo.cget('values'): return
+        import alula_airfoils
+        combo.configure(values=[''] + alula_airfoils.get_library().names)
 
     def create_weights_tab(self, parent):
         """
-        Creates the 'Weights' tab, which provides an editable table for
-        entering individual component weights and their arms for weight & balance
-        calculations. Default components are pre-filled.
+        Creates the 'Weights' tab: the component table for weight & balance,
+        with a name, weight, arm and category per component and any number
+        of rows. Only the visible rows exist as Treeview items; scrolling
+        refills them from the component table. Double-click a cell to edit it.
+        """
+        toolbar = ttk.Frame(parent)
+        toolbar.pack(fill='x', pady=(0, 5))
+        ttk.Button(toolbar, text="Add Component", command=self.add_component).pack(side='left')
+        ttk.Button(toolbar, text="Delete Component", command=self.delete_component).pack(side='left', padx=5)
+        ttk.Button(toolbar, text="Import BOM...", command=self.import_bom).pack(side='left')
+        self.component_totals_label = ttk.Label(toolbar, text="")
+        self.component_totals_label.pack(side='right')
+
+        table_frame = ttk.Frame(parent)
+        table_frame.pack(fill='both', expand=True)
+        self.configure_treeview_style()
+        columns = {'name': ("Component", 200, 'w'), 'weight': ("Weight (lbs)", 90, 'e'),
+                   'arm': ("Arm (ft from datum)", 120, 'e'), 'category': ("Category", 90, 'w')}
+        self.component_tree = ttk.Treeview(table_frame, columns=list(columns), show='headings', selectmode='browse',
+                                           height=self.COMPONENT_VIEW_ROWS, style='Treeview')
+        for key, (title, width, anchor) in columns.items():
+            self.component_tree.heading(key, text=title)
+            self.component_tree.column(key, width=width, anchor=anchor, stretch=(key == 'name'))
+        self.component_scrollbar = ttk.Scrollbar(table_frame, orient='vertical', command=self.scroll_components)
+        self.component_scrollbar.pack(side='right', fill='y')
+        self.component_tree.pack(side='left', fill='both', expand=True)
+        for k in range(self.COMPONENT_VIEW_ROWS):
+            self.component_tree.insert('', 'end', iid=f"row{k}")
+
+        self.component_tree.bind('<Double-1>', self.edit_component_cell)
+        self.component_tree.bind('<MouseWheel>', lambda e: self.scroll_components('scroll', -1 if e.delta > 0 else 1, 'units'))
+        self.component_tree.bind('<Button-4>', lambda e: self.scroll_components('scroll', -1, 'units'))
+        self.component_tree.bind('<Button-5>', lambda e: self.scroll_components('scroll', 1, 'units'))
+        self.refresh_component_view()
+
+    def refresh_component_view(self):
+        """
+        Fills the pooled Treeview rows with the visible slice of the
+        component table, detaching the rows past its end, and updates the
+        scrollbar and totals.
+        """
+        if self.component_tree is None: return # Weights tab not built yet
+        count, rows = len(self.components), self.COMPONENT_VIEW_ROWS
+        self.component_view_first = max(0, min(self.component_view_first, count - rows))
+        first = self.component_view_first
+        for k in range(rows):
+            iid = f"row{k}"
+            if first + k < count:
+                self.component_tree.move(iid, '', k) # Reattaches a detached row
+                self.component_tree.item(iid, values=self.components.row(first + k))
+            else:
+                self.component_tree.detach(iid)
+        if count > rows:
+            self.component_scrollbar.set(first / count, (first + rows) / count)
+        else:
+            self.component_scrollbar.set(0.0, 1.0)
+        self.update_component_totals()
+
+    def update_component_totals(self):
+        """
+        Shows the number of components, the empty weight and its CG, and the
+        weight of each category above the table, from the table's category index.
         """
-        # Table headers
-        ttk.Label(parent, text="Component", font=('Helvetica', 10, 'bold')).grid(row=0, column=0, padx=5, pady=5)
-        ttk.Label(parent, text="Weight (lbs)", font=('Helvetica', 10, 'bold')).grid(row=0, column=1, padx=5, pady=5)
-        ttk.Label(parent, text="Arm (ft from datum)", font=('Helvetica', 10, 'bold')).grid(row=0, column=2, padx=5, pady=5)
-        
-        # Default components for the weight & balance table
-        components: List[Tuple[str, str, str]] = [("Wing", "60", "4.5"), ("Fuselage", "50", "8.5"), ("Empennage", "15", "16"), ("Engine & Mount", "45", "1.0"), ("Landing Gear", "25", "4.0"), ("Fuel System", "5", "1.5"), ("Misc Systems", "15", "6.0")]
-        self.component_entries = [] # List to hold dictionaries for each component's Tkinter variables
-        
-        # Create entry widgets for each component
-        for i, (name, weight, arm) in enumerate(components):
-            name_var, weight_var, arm_var = tk.StringVar(value=name), tk.StringVar(value=weight), tk.StringVar(value=arm)
-            ttk.Entry(parent, textvariable=name_var).grid(row=i + 1, column=0, padx=5, pady=2, sticky='ew')
-            ttk.Entry(parent, textvariable=weight_var).grid(row=i + 1, column=1, padx=5, pady=2)
-            ttk.Entry(parent, textvariable=arm_var).grid(row=i + 1, column=2, padx=5, pady=2)
-            self.component_entries.append({'name': name_var, 'weight': weight_var, 'arm': arm_var})
-        parent.grid_columnconfigure(0, weight=1)
+        if self.component_tree is None: return
+        weight, moment = self.components.empty_weight()
+        cg_text = f", CG {moment / weight:.2f} ft" if weight > 0 else ""
+        categories = "  ".join(f"{category} {w:.1f}" for category, (w, _) in self.components.totals().items() if w)
+        self.component_totals_label.config(text=f"{len(self.components)} components: {weight:.1f} lbs{cg_text}   {categories}")
+
+    def scroll_components(self, *args):
+        """Scrollbar and mouse wheel handler: moves the visible slice of the table."""
+        self.finish_component_edit()
+        count, rows = len(self.components), self.COMPONENT_VIEW_ROWS
+        if args[0] == 'moveto':
+            first = round(float(args[1]) * count)
+        else: # ('scroll', n, 'units' | 'pages')
+            first = self.component_view_first + int(args[1]) * (rows if args[2] == 'pages' else 1)
+        first = max(0, min(first, count - rows))
+        if first != self.component_view_first:
+            self.component_view_first = first
+            self.refresh_component_view()
+
+    def component_index(self, iid: str) -> int | None:
+        """Maps a pooled Treeview row to the index of the component it shows."""
+        if not iid: return None
+        index = self.component_view_first + int(iid[3:])
+        return index if index < len(self.components) else None
+
+    def edit_component_cell(self, event):
+        """
+        Opens an editor over the double-clicked cell: a combobox for the
+        category, an entry for the other fields.
+        """
+        self.finish_component_edit()
+        iid, column = self.component_tree.identify_row(event.y), self.component_tree.identify_column(event.x)
+        index = self.component_index(iid)
+        if index is None or not column: return
+        field = alula_components.FIELDS[int(column[1:]) - 1]
+        bbox = self.component_tree.bbox(iid, column)
+        if not bbox: return
+        x, y, w, h = bbox
+
+        value = tk.StringVar(value=self.components.row(index)[alula_components.FIELDS.index(field)])
+        if field == 'category':
+            editor = ttk.Combobox(self.component_tree, textvariable=value, values=alula_engine.COMPONENT_CATEGORIES, state='readonly')
+            editor.bind('<<ComboboxSelected>>', lambda e: self.finish_component_edit())
+        else:
+            editor = ttk.Entry(self.component_tree, textvariable=value)
+            editor.select_range(0, 'end')
+        editor.place(x=x, y=y, width=w, height=h)
+        editor.focus_set()
+        editor.bind('<Return>', lambda e: self.finish_component_edit())
+        editor.bind('<FocusOut>', lambda e: self.finish_component_edit())
+        editor.bind('<Escape>', lambda e: self.finish_component_edit(commit=False))
+        self.component_editor = (editor, value, index, field)
+
+    def finish_component_edit(self, commit: bool = True):
+        """Closes the cell editor, storing its value unless the edit was cancelled."""
+        if self.component_editor is None: return
+        editor, value, index, field = self.component_editor
+        self.component_editor = None
+        editor.destroy()
+        if commit and value.get() != self.components.row(index)[alula_components.FIELDS.index(field)]:
+            self.set_component_field(index, field, value.get())
+
+    def set_component_field(self, index: int, field: str, value: str):
+        """Changes one field of a component and schedules the live recalculation."""
+        self.components.set_field(index, field, value)
+        first = self.component_view_first
+        if self.component_tree is not None and first <= index < first + self.COMPONENT_VIEW_ROWS:
+            self.component_tree.item(f"row{index - first}", values=self.components.row(index))
+        self.update_component_totals()
+        self.on_input_changed('component_weights')
+
+    def add_component(self):
+        """Appends an empty component, scrolls to it and starts editing its name."""
+        self.finish_component_edit()
+        index = self.components.append("New Component", 0, 0)
+        self.component_view_first = index # Clamped so the last page is full
+        self.refresh_component_view()
+        self.component_tree.selection_set(f"row{index - self.component_view_first}")
+        self.on_input_changed('component_weights')
+
+    def import_bom(self):
+        """
+        Replaces the component table with a bill of materials read from a
+        CSV or JSON file (see alula_components.read_bom), however many parts
+        it lists.
+        """
+        from tkinter import filedialog, messagebox
+        filepath = filedialog.askopenfilename(filetypes=[("Bill of Materials", "*.csv *.json"), ("All Files", "*.*")],
+                                              title="Import Bill of Materials")
+        if not filepath: return # User cancelled
+        try:
+            components = alula_components.read_bom(filepath)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Import Error", f"Failed to import bill of materials:\n{e}")
+            return
+        self.finish_component_edit()
+        self.components.load(components)
+        self.component_view_first = 0
+        self.refresh_component_view()
+        self.on_input_changed('component_weights')
+        weight, _ = self.components.empty_weight()
+        self.status_label.config(text=f"Imported {len(components)} components ({weight:.1f} lbs) from {os.path.basename(filepath)}")
+
+    def delete_component(self):
+        """Deletes the selected component."""
+        self.finish_component_edit()
+        selection = self.component_tree.selection()
+        index = self.component_index(selection[0]) if selection else None
+        if index is None: return
+        self.components.delete(index)
+        self.component_tree.selection_remove(selection)
+        self.refresh_component_view()
+        self.on_input_changed('component_weights')
 
     def create_feedback_tab(self, parent):
         """
@@ -386,6 +756,117 @@ class AlulaApp(tk.Tk):
         self.feedback_text.insert('1.0', "Design feedback will appear here after clicking 'Calculate Design'.")
         self.feedback_text.config(state='disabled') # Make text widget read-only
 
+    def create_power_tab(self, parent):
+        """
+        Creates the 'Power Curves' tab, which plots the design's power
+        required and power available against airspeed.
+        """
+        self.power_canvas = tk.Canvas(parent, bg='#2A2A2A', highlightthickness=0)
+        self.power_canvas.pack(fill='both', expand=True)
+        self.power_canvas.bind('<Configure>', lambda e: self.update_power_chart())
+
+    def create_comparison_tab(self, parent):
+        """
+        Creates the 'Comparison' tab: a table of the current mission's main
+        results and Part 103 status in every vehicle type, side by side.
+        """
+        import alula_compare
+        self.configure_treeview_style()
+        ttk.Label(parent, text="The current mission (pilot, field and shared inputs) flown by each vehicle type, with its own component table.").pack(anchor='w', pady=(0, 5))
+        self.comparison_tree = ttk.Treeview(parent, columns=list(alula_engine.VEHICLE_TYPES), style='Treeview')
+        self.comparison_tree.heading('#0', text="Result")
+        self.comparison_tree.column('#0', width=150)
+        for v_type in alula_engine.VEHICLE_TYPES:
+            self.comparison_tree.heading(v_type, text=v_type)
+            self.comparison_tree.column(v_type, width=110, anchor='e')
+        for label in [alula_compare.PART_103_ROW] + [label for label, _, _ in alula_compare.COMPARISON_ROWS]:
+            self.comparison_tree.insert('', 'end', iid=label, text=label)
+        self.comparison_tree.pack(fill='both', expand=True)
+
+    def create_diagnostics_tab(self, parent):
+        """
+        Creates the hidden 'Diagnostics' tab, which shows the wall time and
+        call counts of each recalculation stage (engine calculations, solver
+        iterations and view redraws) while profiling is on.
+        """
+        self.configure_treeview_style()
+        controls = ttk.Frame(parent)
+        controls.pack(fill='x', pady=(0, 5))
+        self.diagnostics_summary = ttk.Label(controls, text="No recalculation profiled yet.")
+        self.diagnostics_summary.pack(side='left')
+        ttk.Button(controls, text="Reset", command=self.reset_diagnostics).pack(side='right')
+        self.diagnostics_log_button = ttk.Button(controls, text="Log to File...", command=self.toggle_diagnostics_log)
+        self.diagnostics_log_button.pack(side='right', padx=5)
+
+        columns = {'calls': "Calls", 'items': "Iterations", 'total_ms': "Total ms", 'mean_ms': "Mean ms",
+                   'per_item_ms': "ms / Iter.", 'last_ms': "Last ms", 'max_ms': "Max ms"}
+        self.diagnostics_tree = ttk.Treeview(parent, columns=list(columns), style='Treeview')
+        self.diagnostics_tree.heading('#0', text="Stage")
+        self.diagnostics_tree.column('#0', width=170)
+        for key, title in columns.items():
+            self.diagnostics_tree.heading(key, text=title)
+            self.diagnostics_tree.column(key, width=70, anchor='e')
+        self.diagnostics_tree.pack(fill='both', expand=True)
+
+    def toggle_diagnostics(self):
+        """
+        Shows or hides the Diagnostics tab; profiling runs only while it is shown.
+        """
+        if self.diagnostics_visible.get():
+            self.build_tab(self.diagnostics_tab)
+            self.notebook.add(self.diagnostics_tab) # Re-adding a hidden tab shows it again
+            self.notebook.select(self.diagnostics_tab)
+            alula_profile.PROFILER.enable()
+            self.update_all_calculations() # Profile a full recalculation right away
+        else:
+            self.notebook.hide(self.diagnostics_tab)
+            alula_profile.PROFILER.disable()
+
+    def reset_diagnostics(self):
+        """
+        Clears the collected stage statistics.
+        """
+        alula_profile.PROFILER.reset()
+        self.update_diagnostics_tab()
+
+    def toggle_diagnostics_log(self):
+        """
+        Starts appending one JSON line per profiled recalculation to a file
+        chosen by the user, or stops logging if a log is active.
+        """
+        from tkinter import filedialog
+        profiler = alula_profile.PROFILER
+        if profiler.log_path:
+            profiler.log_path = None
+        else:
+            filepath = filedialog.asksaveasfilename(defaultextension=".jsonl", filetypes=[("JSON Lines", "*.jsonl"), ("All Files", "*.*")], title="Log Profiling Data To...")
+            if not filepath: return # User cancelled
+            profiler.log_path = filepath
+        self.diagnostics_log_button.config(text="Stop Logging" if profiler.log_path else "Log to File...")
+
+    def update_diagnostics_tab(self):
+        """
+        Refreshes the Diagnostics tab with the latest stage statistics,
+        slowest stages first. Does nothing while the tab is hidden.
+        """
+        if not self.diagnostics_visible.get(): return
+        profiler = alula_profile.PROFILER
+        frame = profiler.last_frame
+        if frame:
+            slowest = max(frame['stages'].items(), key=lambda item: item[1]['ms'], default=None)
+            slowest_text = f", slowest stage {slowest[0]} ({slowest[1]['ms']:.2f} ms)" if slowest else ""
+            self.diagnostics_summary.config(text=f"Last recalculation ({frame['trigger']}): {frame['total_ms']:.2f} ms{slowest_text}")
+        else:
+            self.diagnostics_summary.config(text="No recalculation profiled yet.")
+
+        tree = self.diagnostics_tree
+        tree.delete(*tree.get_children())
+        snapshot = sorted(profiler.snapshot().items(), key=lambda item: item[1]['total_ms'], reverse=True)
+        for name, stats in snapshot:
+            values = [stats['calls'], stats['items'] or ""] + [f"{stats[key]:.3f}" if key != 'per_item_ms' or stats['items'] else ""
+                                                                 for key in ('total_ms', 'mean_ms', 'per_item_ms', 'last_ms', 'max_ms')]
+            tree.insert('', 'end', text=name, values=values)
+
     def get_input_value(self, key, default=0.0):
         """
         Safely retrieves a float value from the data['inputs'] dictionary.
@@ -394,47 +875,68 @@ class AlulaApp(tk.Tk):
         try: return float(self.data['inputs'][key].get())
         except (ValueError, KeyError): return default
 
+    def on_vehicle_type_selected(self):
+        """
+        Handles a vehicle type picked on the 'Configuration' tab. Each vehicle
+        type keeps its own component table: the table of the previous type is
+        set aside, and the new type's table is shown again as it was left (its
+        defaults, e.g. a canopy and harness for a paraglider, the first time).
+        """
+        v_type = self.data['inputs']['vehicle_type'].get()
+        if v_type != self.components_type and v_type in alula_engine.VEHICLE_TYPES:
+            self.components = self.component_table(v_type)
+            self.components_type = v_type
+            self.component_view_first = 0
+            self.refresh_component_view()
+        self.update_ui_for_vehicle_type()
+
+    def component_table(self, v_type: str) -> alula_components.ComponentTable:
+        """
+        Returns the component table of a vehicle type, starting it from the
+        type's defaults if the type has none yet.
+        """
+        table = self.component_sets.get(v_type)
+        if table is None:
+            table = self.component_sets[v_type] = alula_components.ComponentTable(alula_engine.default_components(v_type))
+        return table
+
     def update_ui_for_vehicle_type(self):
         """
-        Adjusts the visibility and default values of input fields in the
-        'Configuration', 'Sizing', and 'Aerodynamics' tabs based on the
-        selected vehicle type. It also triggers a full calculation update.
+        Adjusts the visibility of input fields in the 'Configuration',
+        'Sizing', and 'Aerodynamics' tabs based on the selected vehicle
+        type. It also triggers a full calculation update.
+        """
+        self.layout_vehicle_inputs()
+
+        # Trigger recalculations and UI updates after changing vehicle type
+        self.update_all_calculations()
+
+    def layout_vehicle_inputs(self):
+        """
+        Shows the input fields of the 'Configuration', 'Sizing' and
+        'Aerodynamics' tabs that apply to the selected vehicle type and hides
+        the rest. Tabs that have not been built yet are skipped.
         """
         v_type = self.data['inputs']['vehicle_type'].get()
-        
-        # Update component weights defaults for Paraglider vs. others
-        if v_type == 'Paraglider':
-            paraglider_weights = [("Canopy", "15", "0"), ("Harness", "10", "0"), ("Reserve", "5", "0"), ("Container", "2", "0"), ("Misc", "3", "0"), ("","",""), ("","","")]
-            for i, (name, weight, arm) in enumerate(paraglider_weights):
-                if i < len(self.component_entries):
-                    self.component_entries[i]['name'].set(name)
-                    self.component_entries[i]['weight'].set(weight)
-                    self.component_entries[i]['arm'].set(arm)
-        else:
-            standard_weights = [("Wing", "60", "4.5"), ("Fuselage", "50", "8.5"), ("Empennage", "15", "16"), ("Engine & Mount", "45", "1.0"), ("Landing Gear", "25", "4.0"), ("Fuel System", "5", "1.5"), ("Misc Systems", "15", "6.0")]
-            for i, (name, weight, arm) in enumerate(standard_weights):
-                if i < len(self.component_entries):
-                    self.component_entries[i]['name'].set(name)
-                    self.component_entries[i]['weight'].set(weight)
-                    self.component_entries[i]['arm'].set(arm)
-
-        # Hide all conditional elements first
-        self.tail_style_label.grid_forget(); self.tail_style_combo.grid_forget()
-        self.glider_class_label.grid_forget(); self.glider_class_combo.grid_forget()
-        self.flaps_label.grid_forget(); self.flaps_check.grid_forget()
-
-        # Show elements specific to the selected vehicle type
-        if v_type == 'Paraglider':
-            self.glider_class_label.grid(row=1, column=0, padx=5, pady=10, sticky='w')
-            self.glider_class_combo.grid(row=1, column=1, padx=5, pady=10, sticky='ew')
-        elif v_type in ['Fixed Wing', 'Glider']:
-            self.tail_style_label.grid(row=1, column=0, padx=5, pady=10, sticky='w')
-            self.tail_style_combo.grid(row=1, column=1, padx=5, pady=10, sticky='ew')
-            self.flaps_label.grid(row=2, column=0, padx=5, pady=10, sticky='w')
-            self.flaps_check.grid(row=2, column=1, padx=5, pady=10, sticky='w')
-        else: # For Gyrocopter, Helicopter, Lighter Than Air (show tail style as general body configuration)
-            self.tail_style_label.grid(row=1, column=0, padx=5, pady=10, sticky='w')
-            self.tail_style_combo.grid(row=1, column=1, padx=5, pady=10, sticky='ew')
+
+        if "Configuration" in self.built_tabs:
+            # Hide all conditional elements first
+            self.tail_style_label.grid_forget(); self.tail_style_combo.grid_forget()
+            self.glider_class_label.grid_forget(); self.glider_class_combo.grid_forget()
+            self.flaps_label.grid_forget(); self.flaps_check.grid_forget()
+
+            # Show elements specific to the selected vehicle type
+            if v_type == 'Paraglider':
+                self.glider_class_label.grid(row=1, column=0, padx=5, pady=10, sticky='w')
+                self.glider_class_combo.grid(row=1, column=1, padx=5, pady=10, sticky='ew')
+            elif v_type in ['Fixed Wing', 'Glider']:
+                self.tail_style_label.grid(row=1, column=0, padx=5, pady=10, sticky='w')
+                self.tail_style_combo.grid(row=1, column=1, padx=5, pady=10, sticky='ew')
+                self.flaps_label.grid(row=2, column=0, padx=5, pady=10, sticky='w')
+                self.flaps_check.grid(row=2, column=1, padx=5, pady=10, sticky='w')
+            else: # For Gyrocopter, Helicopter, Lighter Than Air (show tail style as general body configuration)
+                self.tail_style_label.grid(row=1, column=0, padx=5, pady=10, sticky='w')
+                self.tail_style_combo.grid(row=1, column=1, padx=5, pady=10, sticky='ew')
 
         # Define which inputs are visible for each vehicle type on Sizing and Aerodynamics tabs
         sizing_visibility: Dict[str, List[str]] = {
@@ -446,8 +948,8 @@ class AlulaApp(tk.Tk):
             'Paraglider': ['wing_area', 'aspect_ratio']
         }
         aero_visibility: Dict[str, List[str]] = {
-            'Fixed Wing': ['cl_max', 'cl_max_flaps', 'cd0', 'neutral_point_ft', 'engine_hp', 'prop_efficiency', 'oswald_efficiency'],
-            'Glider': ['cl_max', 'cl_max_flaps', 'cd0', 'oswald_efficiency'],
+            'Fixed Wing': ['airfoil', 'cl_max', 'cl_max_flaps', 'cd0', 'neutral_point_ft', 'engine_hp', 'prop_efficiency', 'oswald_efficiency'],
+            'Glider': ['airfoil', 'cl_max', 'cl_max_flaps', 'cd0', 'oswald_efficiency'],
             'Gyrocopter': ['rotor_blade_cd', 'cd0', 'engine_hp', 'prop_efficiency', 'rotor_rpm'],
             'Helicopter': ['rotor_blade_cd', 'cd0', 'engine_hp', 'rotor_rpm'],
             'Lighter Than Air': ['cd0', 'engine_hp', 'prop_efficiency'],
@@ -458,350 +960,149 @@ class AlulaApp(tk.Tk):
         for key, (label, entry) in self.sizing_tab_widgets.items(): label.grid_forget(); entry.grid_forget()
         for key, (label, entry) in self.aero_tab_widgets.items(): label.grid_forget(); entry.grid_forget()
         
-        # Show relevant sizing inputs
-        visible_sizing_keys: List[str] = sizing_visibility.get(v_type, [])
+        # Show relevant sizing inputs (tabs not built yet are laid out when they are built)
+        visible_sizing_keys: List[str] = sizing_visibility.get(v_type, []) if "Sizing" in self.built_tabs else []
         for i, key in enumerate(visible_sizing_keys):
             self.sizing_tab_widgets[key][0].grid(row=i, column=0, padx=5, pady=5, sticky='w')
             self.sizing_tab_widgets[key][1].grid(row=i, column=1, padx=5, pady=5)
         
         # Show relevant aerodynamic inputs
-        visible_aero_keys: List[str] = aero_visibility.get(v_type, [])
+        visible_aero_keys: List[str] = aero_visibility.get(v_type, []) if "Aerodynamics" in self.built_tabs else []
         for i, key in enumerate(visible_aero_keys):
             self.aero_tab_widgets[key][0].grid(row=i, column=0, padx=5, pady=5, sticky='w')
             self.aero_tab_widgets[key][1].grid(row=i, column=1, padx=5, pady=5)
-        
-        # Trigger recalculations and UI updates after changing vehicle type
-        self.update_all_calculations()
 
-    def update_all_calculations(self):
+    def get_design_record(self) -> dict:
         """
-        Orchestrates all design calculations. It first calculates total weight
-        and CG from component entries, then calls the specific calculation
-        function based on the selected vehicle type, and finally updates
-        all relevant UI elements.
+        Collects the current inputs and component table into a plain design
+        record (the same format written by 'Save Design...').
         """
-        v_type = self.data['inputs']['vehicle_type'].get()
-        total_weight, total_moment, pwr_sys_w = 0.0, 0.0, 0.0
-        
-        # Calculate total empty weight and CG from component entries
-        for entry in self.component_entries:
-            try:
-                w, a = float(entry['weight'].get()), float(entry['arm'].get())
-                total_weight += w
-                total_moment += w * a
-                if 'engine' in entry['name'].get().lower(): # Identify engine weight for power system
-                    pwr_sys_w += w
-            except ValueError:
-                # Silently ignore invalid entries for calculation purposes
-                continue 
-        
-        cg_location = total_moment / total_weight if total_weight > 0 else 0
-        empty_weight = total_weight
-        pilot_weight = self.get_input_value('pilot_weight')
-        fuel_weight = 0 if v_type in ['Glider', 'Paraglider'] else self.FAR_103_MAX_FUEL_LBS
-        gross_weight = empty_weight + pilot_weight + fuel_weight
-        
-        # Store basic calculated values in the data model
-        self.data['calculations'] = {
-            "Empty Weight": empty_weight,
-            "Gross Weight": gross_weight,
-            "Fuel Weight": fuel_weight,
-            "Power System Weight": pwr_sys_w,
-            "CG Location": cg_location,
-            "Pilot Weight": pilot_weight
-        }
-        
-        # Map vehicle types to their specific calculation functions
-        calc_map: Dict[str, Callable] = {
-            'Fixed Wing': self.calculate_fixed_wing,
-            'Glider': self.calculate_glider,
-            'Gyrocopter': self.calculate_gyrocopter,
-            'Helicopter': self.calculate_helicopter,
-            'Lighter Than Air': self.calculate_lta,
-            'Paraglider': self.calculate_paraglider
-        }
-        calc_function = calc_map[v_type]
-        
-        # Execute the relevant calculation function
-        calc_function()
-        
-        # Update all graphical and textual UI elements
-        self.update_results_panel()
-        self.update_cg_canvas()
-        self.update_pie_chart()
-        self.update_flight_envelope()
-        self.update_feedback_tab()
+        return alula_engine.design_record({key: var.get() for key, var in self.data['inputs'].items()}, self.components.to_records())
 
-    def calculate_fixed_wing(self, is_glider: bool = False):
+    def evaluate_current_design(self) -> dict:
         """
-        Performs aerodynamic and performance calculations specific to
-        fixed-wing aircraft (including gliders, with a flag).
-        Calculates stall speeds, max level speed (VH), rate of climb (ROC),
-        loadings, and static margin.
+        Evaluates the current inputs with the component table's running
+        totals (through the result cache), without re-summing the table.
         """
-        calc = self.data['calculations']
-        gross_weight = calc['Gross Weight']
-        wing_area = self.get_input_value('wing_area', 1)
-        wing_span = self.get_input_value('wing_span', 1)
-        base_cd0 = self.get_input_value('cd0', 0.025)
-        oswald_eff = self.get_input_value('oswald_efficiency', 0.8)
-        engine_hp = 0 if is_glider else self.get_input_value('engine_hp', 20)
-        prop_eff = self.get_input_value('prop_efficiency', 0.75)
-        lemac_ft, np_ft = self.get_input_value('lemac_ft', 4.0), self.get_input_value('neutral_point_ft', 5.5)
-        
-        # Calculate total zero-lift drag coefficient
-        cockpit_drag = self.cockpit_drag_map.get(self.data['inputs']['cockpit_style'].get(), 0)
-        tail_drag = self.tail_drag_map.get(self.data['inputs']['tail_style'].get(), 0)
-        total_cd0 = base_cd0 + cockpit_drag + tail_drag
-        
-        # Lift coefficients for stall speed calculation
-        cl_max = self.get_input_value('cl_max', 1.5)
-        cl_max_flaps = self.get_input_value('cl_max_flaps', 1.9)
-        
-        # Stall speed calculations
-        vs_fps = math.sqrt((2 * gross_weight) / (self.RHO_SEA_LEVEL_SLUG * wing_area * cl_max)) if wing_area * cl_max > 0 else 0
-        vs_flaps_fps = math.sqrt((2 * gross_weight) / (self.RHO_SEA_LEVEL_SLUG * wing_area * cl_max_flaps)) if wing_area * cl_max_flaps > 0 else 0
-        
-        # Aspect Ratio and induced drag factor (k)
-        AR = (wing_span ** 2) / wing_area if wing_area > 0 else 0
-        k = 1 / (math.pi * AR * oswald_eff) if AR * oswald_eff > 0 else float('inf')
-        
-        # For gliders, calculate L/D Max and Min Sink Rate
-        ld_max = math.sqrt( (total_cd0 / k) ) / (2*total_cd0) if k > 0 and total_cd0 > 0 else 0
-        v_ld_max_fps = math.sqrt( (2*gross_weight) / (self.RHO_SEA_LEVEL_SLUG * wing_area * math.sqrt(total_cd0/k)) ) if k > 0 and total_cd0 > 0 else 0
-        min_sink_fps = v_ld_max_fps / ld_max if ld_max > 0 else 0
-        
-        vh_fps: float = 0.0 # Max level speed
-        if not is_glider:
-            # Powered aircraft performance calculations
-            power_avail = engine_hp * prop_eff * 550 # Available power in ft-lbs/sec
-            
-            # Estimate Max Level Speed (VH) by iterating speeds
-            if vs_fps > 0:
-                for v_fps in range(int(vs_fps), 300): # Iterate from stall speed up to a reasonable max
-                    Cl = (2 * gross_weight) / (self.RHO_SEA_LEVEL_SLUG * wing_area * (v_fps**2))
-                    Cd = total_cd0 + k * (Cl**2) # Total drag coefficient
-                    power_req = 0.5 * self.RHO_SEA_LEVEL_SLUG * (v_fps**3) * wing_area * Cd # Power required
-                    if power_req > power_avail:
-                        vh_fps = float(v_fps - 1) # Set VH to the previous speed
-                        break
-            
-            # Estimate Rate of Climb (ROC) at best climb speed
-            max_excess_power = -float('inf')
-            climb_v_end_float = vh_fps * 1.05 if vh_fps > vs_fps else vs_fps * 1.5
-            climb_v_end = int(climb_v_end_float) # Search range for climb speed
-            for v_fps in range(int(vs_fps * 1.05), climb_v_end):
-                Cl = (2 * gross_weight) / (self.RHO_SEA_LEVEL_SLUG * wing_area * v_fps**2)
-                Cd = total_cd0 + k * (Cl**2)
-                power_req = 0.5 * self.RHO_SEA_LEVEL_SLUG * (v_fps**3) * wing_area * Cd
-                excess_power = power_avail - power_req
-                if excess_power > max_excess_power:
-                    max_excess_power = excess_power
-            
-            roc_fpm: float = 0.0
-            if gross_weight > 0 and max_excess_power > -float('inf'):
-                roc_fpm = (max_excess_power / gross_weight) * 60
-            
-            # Update calculation results for powered fixed-wing
-            calc.update({
-                "Wing Loading": gross_weight / wing_area if wing_area > 0 else 0,
-                "Power Loading": gross_weight / engine_hp if engine_hp > 0 else 0,
-                "Span Loading": gross_weight / wing_span if wing_span > 0 else 0,
-                "Stall Speed": vs_fps / self.KNOTS_TO_FPS,
-                "Stall Speed Flaps": vs_flaps_fps / self.KNOTS_TO_FPS if self.data['inputs']['flaps'].get() else vs_fps / self.KNOTS_TO_FPS,
-                "VH": vh_fps / self.KNOTS_TO_FPS,
-                "ROC": roc_fpm if roc_fpm > 0 else 0
-            })
+        inputs = {key: var.get() for key, var in self.data['inputs'].items()}
+        return self.result_cache.evaluate_totals(inputs, self.components.totals())
+
+    def update_all_calculations(self):
+        """
+        Orchestrates all design calculations. The current design record is
+        evaluated by the headless calculation engine (weight & balance plus
+        the vehicle-specific performance calculation), reusing the cached
+        result if the same design was evaluated before, and then all
+        relevant UI elements are updated.
+        """
+        # A full update supersedes any pending live update
+        if self.update_job is not None:
+            self.after_cancel(self.update_job)
+            self.update_job = None
+        self.dirty_inputs.clear()
+
+        profiler = alula_profile.PROFILER
+        profiler.begin_frame('full')
+        try:
+            with alula_profile.stage('evaluate'):
+                calc = self.evaluate_current_design()
+        except EVALUATION_ERRORS as e:
+            self.report_evaluation(e) # Keep the last results
         else:
-            # Update calculation results for gliders
-            calc.update({
-                "L/D Max": ld_max,
-                "Min Sink Rate": min_sink_fps * 60,
-                "Speed @ Min Sink": v_ld_max_fps / self.KNOTS_TO_FPS,
-                "Stall Speed": vs_fps / self.KNOTS_TO_FPS,
-                "Stall Speed Flaps": vs_flaps_fps / self.KNOTS_TO_FPS if self.data['inputs']['flaps'].get() else vs_fps / self.KNOTS_TO_FPS,
-                "Wing Loading": gross_weight / wing_area if wing_area > 0 else 0,
-                "VH": v_ld_max_fps / self.KNOTS_TO_FPS * 1.5 # VH for gliders estimated as 1.5 * speed at min sink
-            })
-        
-        # Longitudinal stability calculations (applicable to fixed-wing/gliders)
-        mean_chord = wing_area / wing_span if wing_span > 0 else 1
-        calc.update({
-            "Static Margin": ((np_ft - calc["CG Location"]) / mean_chord) * 100 if mean_chord > 0 else 0,
-            "CG MAC Percent": ((calc["CG Location"] - lemac_ft) / mean_chord) * 100 if mean_chord > 0 else 0,
-            "Total Cd0": total_cd0,
-            "Base Cd0": base_cd0,
-            "Cockpit Drag": cockpit_drag,
-            "Tail Drag": tail_drag
-        })
-
-    def calculate_glider(self):
-        """
-        Wrapper function to calculate glider performance by calling
-        the fixed-wing calculation with the `is_glider` flag set to True.
-        """
-        self.calculate_fixed_wing(is_glider=True)
-    
-    def calculate_paraglider(self):
+            self.report_evaluation(None)
+            self.data['calculations'] = calc
+            self.record_revision()
+
+            # Update all graphical and textual UI elements
+            for name, update_view in self.view_updaters.items():
+                with alula_profile.stage(f'view:{name}'):
+                    update_view()
+        finally:
+            profiler.end_frame()
+        self.update_diagnostics_tab()
+
+    def report_evaluation(self, error: Exception | None):
         """
-        Performs performance calculations specific to paragliders,
-        using predefined aerodynamic characteristics based on the
-        selected glider class (EN A/B/C/D).
+        Shows in the status bar why the design could not be evaluated (its
+        last results stay on display), and clears the message once it can.
         """
-        calc = self.data['calculations']
-        gross_weight = calc['Gross Weight']
-        wing_area = self.get_input_value('wing_area', 250)
-        ar = self.get_input_value('aspect_ratio', 5.5)
-        glider_class = self.data['inputs']['glider_class'].get()
-        aero_props: dict[str, Any] | None = self.paraglider_class_map.get(glider_class)
-        
-        if aero_props is None:
-            # If no valid glider class found, return to prevent errors
-            calc.update({"L/D Max": 0, "Min Sink Rate": 0, "Trim Speed": 0, "Stall Speed": 0, "Wing Loading": 0, "VH": 0, "Static Margin": "N/A", "CG MAC Percent": "N/A"})
-            return
-            
-        cl_trim, cl_max, cd0, oswald_eff = aero_props['cl_trim'], aero_props['cl_max'], aero_props['cd0'], aero_props['oswald']
-        
-        # Stall and trim speed calculations
-        vs_fps = math.sqrt((2 * gross_weight) / (self.RHO_SEA_LEVEL_SLUG * wing_area * cl_max)) if wing_area * cl_max > 0 else 0
-        trim_speed_fps = math.sqrt((2 * gross_weight) / (self.RHO_SEA_LEVEL_SLUG * wing_area * cl_trim)) if wing_area * cl_trim > 0 else 0
-        
-        # Induced drag factor (k)
-        k = 1 / (math.pi * ar * oswald_eff) if ar * oswald_eff > 0 else float('inf')
-        
-        # L/D Max and Min Sink Rate
-        ld_max = math.sqrt( (cd0 / k) ) / (2*cd0) if k > 0 and cd0 > 0 else 0
-        v_ld_max_fps = math.sqrt( (2*gross_weight) / (self.RHO_SEA_LEVEL_SLUG * wing_area * math.sqrt(cd0/k)) ) if k > 0 and cd0 > 0 else 0
-        min_sink_fps = v_ld_max_fps / ld_max if ld_max > 0 else 0
-        
-        # Update calculation results for paragliders
-        calc.update({
-            "L/D Max": ld_max,
-            "Min Sink Rate": min_sink_fps * 60,
-            "Trim Speed": trim_speed_fps / self.KNOTS_TO_FPS,
-            "Stall Speed": vs_fps / self.KNOTS_TO_FPS,
-            "Wing Loading": gross_weight / wing_area if wing_area > 0 else 0,
-            "VH": trim_speed_fps * 1.4 / self.KNOTS_TO_FPS, # Top speed estimated from trim speed
-            "Static Margin": "N/A", # Not applicable for paragliders in this context
-            "CG MAC Percent": "N/A" # Not applicable for paragliders in this context
-        })
+        if error is not None:
+            self.status_label.config(text=f"Design cannot be evaluated: {error}")
+        elif self.evaluation_failed:
+            self.status_label.config(text="Ready")
+        self.evaluation_failed = error is not None
 
-    def calculate_rotorcraft(self, is_helicopter):
+    def register_input_traces(self):
         """
-        Performs performance calculations for rotorcraft (gyrocopters and helicopters).
-        Calculates disc loading, power loading, tip speed, and max level speed (VH).
+        Watches every input variable so that edits are recalculated as the
+        user types. The vehicle type is not traced, since switching types
+        goes through `update_ui_for_vehicle_type`; component table edits
+        report themselves through `set_component_field`.
         """
-        calc = self.data['calculations']
-        gross_weight = calc['Gross Weight']
-        rotor_d, blade_c, num_b = self.get_input_value('rotor_diameter', 23), self.get_input_value('rotor_blade_chord', 0.6), self.get_input_value('num_blades', 2)
-        rotor_rpm = self.get_input_value('rotor_rpm', 350)
-        base_cd0, blade_cd = self.get_input_value('cd0', 0.05), self.get_input_value('rotor_blade_cd', 0.012)
-        engine_hp = self.get_input_value('engine_hp', 20)
-        
-        # Fuselage drag calculation
-        cockpit_drag = self.cockpit_drag_map.get(self.data['inputs']['cockpit_style'].get(), 0)
-        fuselage_drag_area = (base_cd0 + cockpit_drag) * 15 # Assumed reference area for fuselage drag
-        
-        rotor_area = math.pi * (rotor_d / 2)**2
-        solidity = (num_b * blade_c) / (math.pi * rotor_d) if rotor_d > 0 else 0
-        tip_speed = (rotor_rpm * 2 * math.pi / 60) * (rotor_d / 2)
-        power_avail = engine_hp * self.get_input_value('prop_efficiency', 0.75) * 550
-        
-        # Profile power for rotor
-        power_profile = (solidity / 8) * self.RHO_SEA_LEVEL_SLUG * rotor_area * (tip_speed**3) * blade_cd
-        
-        min_speed_fps = 15 * self.KNOTS_TO_FPS # Minimum forward speed for rotorcraft
-        vh_fps = 0.0 # Max level speed
-        
-        if is_helicopter:
-            # Helicopter specific calculations (hover and forward flight)
-            power_induced_hover = (gross_weight**1.5) / math.sqrt(2 * self.RHO_SEA_LEVEL_SLUG * rotor_area)
-            power_req_hover = power_induced_hover + power_profile
-            roc_fpm = (power_avail - power_req_hover) / gross_weight * 60 if gross_weight > 0 else 0
-            
-            # Max level speed calculation for helicopter by iterating speeds
-            for v_fps_int in range(1, 250):
-                v_fps = float(v_fps_int)
-                power_parasitic = 0.5 * self.RHO_SEA_LEVEL_SLUG * v_fps**3 * fuselage_drag_area
-                power_induced = (gross_weight**2) / (2 * self.RHO_SEA_LEVEL_SLUG * rotor_area * v_fps) if v_fps > 0 else float('inf')
-                power_req_fwd = power_parasitic + power_profile + power_induced
-                if power_req_fwd > power_avail:
-                    vh_fps = v_fps - 1
-                    break
-        else: # Gyrocopter
-            # Gyrocopter specific calculations
-            roc_fpm = 0.0 # Gyrocopters typically have no significant vertical climb
-            rotor_drag_area = rotor_area * 0.05 # Assumed drag area for rotor system
-            total_drag_area = fuselage_drag_area + rotor_drag_area
-            
-            # Max level speed calculation for gyrocopter by iterating speeds
-            for v_fps_int in range(1, 250):
-                v_fps = float(v_fps_int)
-                thrust_req = 0.5 * self.RHO_SEA_LEVEL_SLUG * v_fps**2 * total_drag_area
-                thrust_avail = power_avail / v_fps if v_fps > 0 else float('inf')
-                if thrust_req > thrust_avail:
-                    vh_fps = v_fps - 1
-                    break
-        
-        # Update calculation results for rotorcraft
-        calc.update({
-            "Disc Loading": gross_weight / rotor_area if rotor_area > 0 else 0,
-            "Power Loading": gross_weight / engine_hp if engine_hp > 0 else 0,
-            "Tip Speed": tip_speed,
-            "Min. Fwd Speed": min_speed_fps / self.KNOTS_TO_FPS,
-            "VH": vh_fps / self.KNOTS_TO_FPS,
-            "ROC": roc_fpm if roc_fpm > 0 else 0,
-            "Static Margin": "N/A", # Not typically calculated for rotorcraft
-            "CG MAC Percent": "N/A" # Not typically calculated for rotorcraft
-        })
+        for key, var in self.data['inputs'].items():
+            if key != 'vehicle_type':
+                var.trace_add('write', lambda *_, key=key: self.on_input_changed(key))
 
-    def calculate_helicopter(self):
+    def on_input_changed(self, key: str):
         """
-        Wrapper function to calculate helicopter performance by calling
-        the rotorcraft calculation with the `is_helicopter` flag set to True.
+        Records an edited input and, with live updates on, (re)starts the
+        short delay after which all edits made so far are applied together.
         """
-        self.calculate_rotorcraft(is_helicopter=True)
+        self.dirty_inputs.add(key)
+        if self.live_update.get():
+            if self.update_job is not None:
+                self.after_cancel(self.update_job)
+            self.update_job = self.after(self.LIVE_UPDATE_DELAY_MS, self.apply_pending_updates)
 
-    def calculate_gyrocopter(self):
+    def on_live_update_toggled(self):
         """
-        Wrapper function to calculate gyrocopter performance by calling
-        the rotorcraft calculation with the `is_helicopter` flag set to False.
+        Applies edits made while live updates were off as soon as they are
+        switched back on.
         """
-        self.calculate_rotorcraft(is_helicopter=False)
+        if self.live_update.get() and self.dirty_inputs:
+            self.apply_pending_updates()
 
-    def calculate_lta(self):
+    def apply_pending_updates(self):
         """
-        Performs calculations specific to Lighter Than Air (LTA) vehicles,
-        determining buoyant lift, net lift, static condition, and max level speed (VH).
+        Recalculates after a batch of edits and redraws only the affected
+        views. The design is re-evaluated (through the result cache) unless
+        every edited input is display-only; the new results are compared
+        with the previous ones, and a view is redrawn if it reads an edited
+        input directly or shows a result that changed.
         """
-        calc = self.data['calculations']
-        gross_weight = calc['Gross Weight']
-        volume, base_cd0 = self.get_input_value('envelope_volume', 8000), self.get_input_value('cd0', 0.025)
-        engine_hp, prop_eff = self.get_input_value('engine_hp', 20), self.get_input_value('prop_efficiency', 0.75)
-        
-        # Buoyant lift calculation (Archimedes' principle)
-        buoyant_lift = (self.RHO_SEA_LEVEL_SLUG - self.HELIUM_DENSITY_SLUG) * 32.174 * volume
-        net_lift = buoyant_lift - gross_weight
-        
-        power_avail = engine_hp * prop_eff * 550
-        
-        # Estimate frontal area for drag calculation (assuming spherical equivalent)
-        frontal_area = math.pi * ((volume * 0.75 / math.pi)**(1/3))**2
-        
-        # Max level speed calculation for LTA
-        vh_fps = (power_avail / (0.5 * self.RHO_SEA_LEVEL_SLUG * frontal_area * base_cd0))**(1/3) if base_cd0 > 0 else 0
-        
-        # Update calculation results for LTA vehicles
-        calc.update({
-            "Buoyant Lift": buoyant_lift,
-            "Net Lift": net_lift,
-            "Static Heaviness": "Heavy" if net_lift < 0 else "Light",
-            "VH": vh_fps / self.KNOTS_TO_FPS,
-            "ROC": "N/A", # Not applicable in the same sense as winged aircraft
-            "Stall Speed": "N/A", # Not applicable for LTA
-            "Static Margin": "N/A", # Not typically calculated for LTA
-            "CG MAC Percent": "N/A" # Not typically calculated for LTA
-        })
+        self.update_job = None
+        dirty, self.dirty_inputs = self.dirty_inputs, set()
+        if not dirty: return
+
+        profiler = alula_profile.PROFILER
+        profiler.begin_frame('live')
+        try:
+            changed_results: set = set()
+            evaluated = True
+            if dirty - alula_engine.DISPLAY_ONLY_INPUTS:
+                previous = self.data['calculations']
+                try:
+                    with alula_profile.stage('evaluate'):
+                        calc = self.evaluate_current_design()
+                except EVALUATION_ERRORS as e:
+                    # Design cannot be evaluated (e.g. unknown vehicle type, or a half-typed
+                    # value such as a zero span or efficiency); keep the last results
+                    self.report_evaluation(e)
+                    evaluated = False
+                else:
+                    self.report_evaluation(None)
+                    changed_results = {key for key in previous.keys() | calc.keys() if previous.get(key) != calc.get(key)}
+                    self.data['calculations'] = calc
+                    self.record_revision(components_changed='component_weights' in dirty)
+
+            if evaluated:
+                for view, (inputs, results) in self.view_dependencies.items():
+                    if inputs & dirty or (changed_results and (results is None or results & changed_results)):
+                        with alula_profile.stage(f'view:{view}'):
+                            self.view_updaters[view]()
+        finally:
+            profiler.end_frame()
+        self.update_diagnostics_tab()
 
     def _set_result_value(self, original_text, new_text, calc_key, unit, compliance_val=None):
         """
@@ -854,6 +1155,8 @@ class AlulaApp(tk.Tk):
                 self._set_result_value("Stall Speed Flaps:", "Stall Speed Flaps:", "Stall Speed Flaps", "knots")
                 self._set_result_value("Max Level Speed (VH):", "Max Level Speed (VH):", "VH", "knots", self.FAR_103_MAX_SPEED_KNOTS)
                 self._set_result_value("Rate of Climb (ROC):", "Rate of Climb (ROC):", "ROC", "fpm")
+                self._set_result_value("Best Climb Speed (Vy):", "Best Climb Speed (Vy):", "Vy", "knots")
+                self._set_result_value("Best Angle Speed (Vx):", "Best Angle Speed (Vx):", "Vx", "knots")
             else: # Glider or Paraglider
                 self._set_result_value("Power Loading:", "L/D Max (Glide Ratio):", "L/D Max", ":1")
                 self._set_result_value("Rate of Climb (ROC):", "Min Sink Rate:", "Min Sink Rate", "fpm")
@@ -876,115 +1179,240 @@ class AlulaApp(tk.Tk):
             self._set_result_value("Span Loading:", "Static Condition:", "Static Heaviness", "")
             self._set_result_value("Max Level Speed (VH):", "Max Level Speed (VH):", "VH", "knots", self.FAR_103_MAX_SPEED_KNOTS)
 
+    def get_canvas_items(self, name: str, canvas: tk.Canvas, build) -> dict | None:
+        """
+        Returns the retained items of one of the drawing canvases. The items
+        are created by `build(canvas, w, h)` the first time and rebuilt from
+        scratch only when the canvas size changes; in between, views update
+        them in place with coords/itemconfig. Returns None while the canvas
+        is too small to draw on.
+        """
+        w, h = canvas.winfo_width(), canvas.winfo_height()
+        if w < 2 or h < 2: return None # Prevent drawing on uninitialized canvas
+        items = self.canvas_items.get(name)
+        if items is None or items['size'] != (w, h):
+            canvas.delete("all")
+            items = build(canvas, w, h)
+            items['size'] = (w, h)
+            self.canvas_items[name] = items
+        return items
+
+    def set_item_visible(self, canvas: tk.Canvas, item, visible: bool):
+        """
+        Shows or hides a canvas item (or every item with a tag).
+        """
+        canvas.itemconfig(item, state='normal' if visible else 'hidden')
+
+    def build_cg_canvas(self, canvas: tk.Canvas, w: int, h: int) -> dict:
+        """
+        Creates the retained items of the CG diagram: the fuselage, its labels,
+        the CG marker and the message shown for paragliders.
+        """
+        margin = 30 # Margin from canvas edges
+        canvas.create_rectangle(w/2 - 20, margin, w/2 + 20, h - margin, fill='#4A90E2', outline='', tags='fuselage')
+        canvas.create_text(w/2, margin - 10, text="Nose", fill="white", tags='fuselage')
+        canvas.create_text(w/2, h - margin + 10, text="Tail", fill="white", tags='fuselage')
+        return {
+            'margin': margin,
+            'marker': [
+                canvas.create_oval(0, 0, 0, 0, outline='white', width=2, tags='fuselage'),
+                canvas.create_line(0, 0, 0, 0, fill='white', width=2, tags='fuselage'),
+                canvas.create_line(0, 0, 0, 0, fill='white', width=2, tags='fuselage'),
+            ],
+            'message': canvas.create_text(w/2, h/2, text="CG is not a fixed design parameter\nfor Paragliders.", fill='white', font=('Helvetica', 10), justify='center', state='hidden'),
+        }
+
     def update_cg_canvas(self):
         """
-        Draws the Center of Gravity (CG) visualization on the canvas,
+        Updates the Center of Gravity (CG) visualization on the canvas,
         indicating the calculated CG location relative to the fuselage length
         and color-coding the marker based on static margin compliance.
         For paragliders, it displays a "not applicable" message.
         """
-        self.cg_canvas.delete("all") # Clear previous drawings
-        w, h = self.cg_canvas.winfo_width(), self.cg_canvas.winfo_height()
-        if w < 2 or h < 2: return # Prevent drawing on uninitialized canvas
+        canvas = self.cg_canvas
+        items = self.get_canvas_items('cg', canvas, self.build_cg_canvas)
+        if items is None: return
         
         v_type = self.data['inputs']['vehicle_type'].get()
-        if v_type == 'Paraglider':
-            self.cg_canvas.create_text(w/2, h/2, text="CG is not a fixed design parameter\nfor Paragliders.", fill='white', font=('Helvetica', 10), justify='center')
+        is_paraglider = v_type == 'Paraglider'
+        self.set_item_visible(canvas, 'fuselage', not is_paraglider)
+        self.set_item_visible(canvas, items['message'], is_paraglider)
+        if is_paraglider:
             self.cg_label.config(text="CG: N/A\nSM: N/A")
             return
         
         calc = self.data['calculations']
         cg_pos, f_len, sm = calc.get("CG Location", 0), self.get_input_value("fuselage_length", 1), calc.get("Static Margin", 0)
         
-        margin = 30 # Margin from canvas edges
+        w, h = items['size']
+        margin = items['margin']
         marker_color = 'white'
         # Color-code CG marker based on static margin (SM)
         if isinstance(sm, (int, float)) and not (5.0 <= sm <= 15.0):
             marker_color = self.style.lookup('Red.TLabel', 'foreground')
         
-        # Draw fuselage representation
-        self.cg_canvas.create_rectangle(w/2 - 20, margin, w/2 + 20, h - margin, fill='#4A90E2', outline='')
-        self.cg_canvas.create_text(w/2, margin - 10, text="Nose", fill="white")
-        self.cg_canvas.create_text(w/2, h - margin + 10, text="Tail", fill="white")
-        
-        # Draw CG marker if fuselage length is valid
+        # Move the CG marker if fuselage length is valid
+        oval, v_line, h_line = items['marker']
         if f_len > 0 and h > 2 * margin:
             y = margin + ((cg_pos / f_len) * (h - 2 * margin))
-            self.cg_canvas.create_oval(w/2 - 10, y - 10, w/2 + 10, y + 10, outline=marker_color, width=2)
-            self.cg_canvas.create_line(w/2, y - 15, w/2, y + 15, fill=marker_color, width=2)
-            self.cg_canvas.create_line(w/2 - 15, y, w/2 + 15, y, fill=marker_color, width=2)
+            canvas.coords(oval, w/2 - 10, y - 10, w/2 + 10, y + 10)
+            canvas.coords(v_line, w/2, y - 15, w/2, y + 15)
+            canvas.coords(h_line, w/2 - 15, y, w/2 + 15, y)
+            canvas.itemconfig(oval, outline=marker_color)
+            canvas.itemconfig(v_line, fill=marker_color)
+            canvas.itemconfig(h_line, fill=marker_color)
+        else:
+            for item in items['marker']: self.set_item_visible(canvas, item, False)
         
         # Update CG and Static Margin text label
         sm_text = f"{sm:.1f}%" if isinstance(sm, (int, float)) else "N/A"
         self.cg_label.config(text=f"CG: {cg_pos:.2f} ft\nSM: {sm_text}")
 
+    def build_pie_chart(self, canvas: tk.Canvas, w: int, h: int) -> dict:
+        """
+        Creates the retained items of the weight fractions pie chart: one arc
+        per fraction and one legend slot per fraction, all hidden until data
+        arrives.
+        """
+        colors = {"E": "#4A90E2", "V": "#7ED321", "S": "#BD10E0", "F": "#F5A623", "P": "#B2DFEE"}
+        
+        # Pie chart parameters
+        radius, cx, cy = min(w, h) / 2 - 25, w / 2, h / 2
+        arcs = {name: canvas.create_arc(cx - radius, cy - radius, cx + radius, cy + radius, start=90, extent=0, fill=color, outline='white', state='hidden', tags='pie')
+                for name, color in colors.items()}
+        
+        # Legend slots, filled in size order by update_pie_chart
+        legend = []
+        legend_x = 20
+        for _ in colors:
+            legend.append((canvas.create_rectangle(legend_x, h - 15, legend_x + 10, h - 5, state='hidden', tags='pie'),
+                           canvas.create_text(legend_x + 20, h - 10, text="", fill="white", anchor="w", state='hidden', tags='pie')))
+            legend_x += 45
+        return {'colors': colors, 'arcs': arcs, 'legend': legend}
+
     def update_pie_chart(self):
         """
-        Draws a pie chart on the canvas representing the weight fractions
-        of the aircraft: Empty Structure (E), Power System (V), Fuel (F),
-        and Pilot (P).
+        Updates the pie chart representing the weight fractions of the
+        aircraft: Empty Structure (E), Power System (V), Systems (S), Fuel
+        and fuel system (F), and Pilot (P). The component weights come from
+        the per-category totals of the calculation.
         """
-        self.pie_canvas.delete("all") # Clear previous drawings
-        w, h = self.pie_canvas.winfo_width(), self.pie_canvas.winfo_height()
-        if w < 2 or h < 2: return # Prevent drawing on uninitialized canvas
+        canvas = self.pie_canvas
+        items = self.get_canvas_items('pie', canvas, self.build_pie_chart)
+        if items is None: return
         
         calc = self.data['calculations']
         gross = calc.get("Gross Weight", 1)
-        if gross <= 0: return # Avoid division by zero
-        
-        empty_weight, pwr_sys_w = calc.get("Empty Weight", 0), calc.get("Power System Weight", 0)
-        struct_w = empty_weight - pwr_sys_w # Calculate structural weight
+        if gross <= 0: # Avoid division by zero
+            self.set_item_visible(canvas, 'pie', False)
+            return
         
         # Calculate fractions of gross weight
         fractions = {
-            "E": struct_w / gross, # Empty Structure
-            "V": pwr_sys_w / gross, # Power System
-            "F": calc.get("Fuel Weight", 0) / gross, # Fuel
+            "E": calc.get("Structure Weight", 0) / gross, # Empty Structure
+            "V": calc.get("Power System Weight", 0) / gross, # Power System
+            "S": calc.get("Systems Weight", 0) / gross, # Systems
+            "F": (calc.get("Fuel Weight", 0) + calc.get("Fuel System Weight", 0)) / gross, # Fuel and fuel system
             "P": calc.get("Pilot Weight", 0) / gross # Pilot
         }
         
-        colors = {"E": "#4A90E2", "V": "#7ED321", "F": "#F5A623", "P": "#B2DFEE"}
-        
         # Sort fractions for consistent drawing order (largest slices first)
         sorted_fractions = sorted(fractions.items(), key=lambda item: item[1], reverse=True)
         
-        # Pie chart parameters
-        radius, cx, cy, start_angle = min(w, h) / 2 - 25, w / 2, h / 2, 90
-        legend_items = []
-        
-        # Draw pie slices
-        for name, frac in sorted_fractions:
+        # Update pie slices and legend slots
+        start_angle = 90
+        for (name, frac), (legend_box, legend_text) in zip(sorted_fractions, items['legend']):
             extent = frac * 360
-            if extent > 0.5: # Only draw if slice is visible
-                self.pie_canvas.create_arc(cx - radius, cy - radius, cx + radius, cy + radius, start=start_angle, extent=extent, fill=colors[name], outline='white')
-            legend_items.append((name, colors[name]))
+            color = items['colors'][name]
+            canvas.itemconfig(items['arcs'][name], start=start_angle, extent=extent, state='normal' if extent > 0.5 else 'hidden') # Only show visible slices
+            canvas.itemconfig(legend_box, fill=color, outline=color, state='normal')
+            canvas.itemconfig(legend_text, text=name, state='normal')
             start_angle += extent
+
+    def build_flight_envelope(self, canvas: tk.Canvas, w: int, h: int) -> dict:
+        """
+        Creates the retained items of the V-g diagram. The load factor axis,
+        axis titles and legend depend only on the canvas size and are final;
+        the airspeed ticks, envelope curves, speed labels and VH marker are
+        created empty and positioned by `update_flight_envelope`. Items are
+        tagged 'axes' or 'envelope' so each group can be shown or hidden at once.
+        """
+        margin_l, margin_r, margin_t, margin_b = 60, 50, 20, 50
+        max_g, min_g = 4.5, -2.5 # Load factor range for chart scaling
+        origin_y = (h - margin_b) - ((0 - min_g) / (max_g - min_g)) * (h - margin_t - margin_b)
         
-        # Draw legend
-        legend_x = 20
-        for letter, color in legend_items:
-            self.pie_canvas.create_rectangle(legend_x, h - 15, legend_x + 10, h - 5, fill=color, outline=color)
-            self.pie_canvas.create_text(legend_x + 20, h - 10, text=letter, fill="white", anchor="w")
-            legend_x += 45
+        # Draw axes
+        canvas.create_line(margin_l, margin_t, margin_l, h - margin_b, fill='grey', tags='axes') # Y-axis (G-load)
+        canvas.create_line(margin_l, origin_y, w - margin_r, origin_y, fill='grey', tags='axes') # X-axis (Airspeed)
+        
+        # Draw G-load ticks and labels
+        for g_val in range(int(min_g)+1, int(max_g)+1):
+            if g_val == 0: continue
+            y_tick = (h - margin_b) - ((g_val - min_g) / (max_g - min_g)) * (h - margin_t - margin_b)
+            canvas.create_line(margin_l - 5, y_tick, margin_l + 5, y_tick, fill='grey', tags='axes')
+            canvas.create_text(margin_l - 15, y_tick, text=f"{g_val}.0", fill="white", anchor="e", tags='axes')
+        canvas.create_text(margin_l - 30, h / 2, text="Load Factor (g)", fill="white", angle=90, tags='axes') # type: ignore
+        canvas.create_text(w - margin_r, h - 15, text="Airspeed (knots CAS)", fill="white", anchor="e", tags='axes')
+        
+        items = {
+            'margins': (margin_l, margin_r, margin_t, margin_b), 'g_range': (min_g, max_g), 'origin_y': origin_y,
+            'airspeed_ticks': [], # Pool of tick marks; grows with the airspeed scale
+            # Operating envelope fill and lines
+            'fill': canvas.create_polygon(0, 0, 0, 0, 0, 0, fill='#4A4A4A', stipple='gray50', outline='', tags='envelope'),
+            'pos_stall': canvas.create_line(0, 0, 0, 0, fill='#E87B33', width=2, tags='envelope'), # Positive stall curve
+            'pos_limit': canvas.create_line(0, 0, 0, 0, fill='#E87B33', width=2, tags='envelope'), # Positive G limit line
+            'neg_limit': canvas.create_line(0, 0, 0, 0, fill='#4A90E2', width=2, tags='envelope'), # Negative stall/G limit line
+            'vne_limit': canvas.create_line(0, 0, 0, 0, fill='#FF00FF', width=2, tags='envelope'), # Vne limit line
+            'flaps_stall': canvas.create_line(0, 0, 0, 0, fill='#87CEEB', width=2, dash=(4, 4), tags='envelope'),
+            # Speed labels on the X-axis: (tick, text) per speed
+            'speed_labels': {name: (canvas.create_line(0, 0, 0, 0, fill='white', tags='envelope'),
+                                    canvas.create_text(0, 0, text="", fill="white", anchor="n", justify='center', tags='envelope'))
+                             for name in ["Vs (flaps)", "Vs (clean)", "Va", "Vne"]},
+            # VH (max level speed) marker
+            'vh_marker': canvas.create_oval(0, 0, 0, 0, fill='yellow', outline='', tags='envelope'),
+            'vh_text': canvas.create_text(0, 0, text="", fill='yellow', anchor='w', tags='envelope'),
+            'va_line': canvas.create_line(0, 0, 0, 0, fill='#E87B33', dash=(2, 2), tags='envelope'),
+        }
+        
+        # Draw legend for envelope lines
+        legend_x, legend_y = w - 190, margin_t + 15
+        legend_items = [
+            ("Clean Stall / Limit", "#E87B33", "solid"),
+            ("Flaps Stall", "#87CEEB", "dashed"),
+            ("Negative Stall / Limit", "#4A90E2", "solid"),
+            ("Vne Limit", "#FF00FF", "solid"),
+            ("Operating Envelope", "#4A4A4A", "fill")
+        ]
+        canvas.create_rectangle(legend_x - 10, legend_y - 10, legend_x + 160, legend_y + 105, fill="#383838", outline="grey", tags='axes')
+        for i, (text, color, style) in enumerate(legend_items):
+            y = legend_y + i * 20
+            if style == "fill": canvas.create_rectangle(legend_x, y, legend_x + 30, y + 10, fill=color, stipple='gray50', outline='grey', tags='axes')
+            elif style == "dashed": canvas.create_line(legend_x, y + 5, legend_x + 30, y + 5, fill=color, width=2, dash=(4,4), tags='axes')
+            else: canvas.create_line(legend_x, y + 5, legend_x + 30, y + 5, fill=color, width=2, tags='axes')
+            canvas.create_text(legend_x + 40, y + 5, text=text, fill="white", anchor="w", tags='axes')
+        
+        items['message'] = canvas.create_text(w/2, h/2, text="", fill='white', font=('Helvetica', 12), state='hidden')
+        return items
 
     def update_flight_envelope(self):
         """
-        Draws a V-g (velocity-G-load) diagram on the canvas, illustrating
+        Updates the V-g (velocity-G-load) diagram on the canvas, illustrating
         the aircraft's safe operating envelope in terms of airspeed and load factor.
         Includes stall speeds, maneuvering speed (Va), and never-exceed speed (Vne).
         Displays a "not applicable" message for LTA vehicles.
         """
         canvas = self.flight_envelope_canvas
-        canvas.delete("all") # Clear previous drawings
+        items = self.get_canvas_items('envelope', canvas, self.build_flight_envelope)
+        if items is None: return
         
         v_type = self.data['inputs']['vehicle_type'].get()
-        if v_type in ['Lighter Than Air']:
-            canvas.create_text(canvas.winfo_width()/2, canvas.winfo_height()/2, text=f"V-g Diagram not applicable for {v_type}.", fill='white', font=('Helvetica', 12))
-            return
-        
-        w, h = canvas.winfo_width(), canvas.winfo_height()
-        if w < 2 or h < 2: return # Prevent drawing on uninitialized canvas
+        not_applicable = v_type in ['Lighter Than Air']
+        self.set_item_visible(canvas, 'axes', not not_applicable)
+        self.set_item_visible(canvas, 'envelope', not not_applicable)
+        canvas.itemconfig(items['message'], text=f"V-g Diagram not applicable for {v_type}.", state='normal' if not_applicable else 'hidden')
+        if not_applicable: return
         
+        w, h = items['size']
         calc = self.data['calculations']
         # Retrieve calculated speeds, defaulting to reasonable values if not found
         vs = calc.get('Stall Speed') or calc.get('Min. Fwd Speed', 25)
@@ -998,8 +1426,9 @@ class AlulaApp(tk.Tk):
         vne = max(vh * 1.1, vh + 10) # Vne is typically 1.1 * VH or VH + 10 knots, whichever is greater
         
         # Canvas margins and scaling factors
-        margin_l, margin_r, margin_t, margin_b = 60, 50, 20, 50
-        max_g, min_g, max_v = 4.5, -2.5, max(100, vne * 1.1) # Max G, Min G, and Max Velocity for chart scaling
+        margin_l, margin_r, margin_t, margin_b = items['margins']
+        min_g, max_g = items['g_range']
+        max_v = max(100, vne * 1.1) # Max Velocity for chart scaling
         
         # Helper function to convert (velocity, G-load) to canvas coordinates
         def to_canvas(v, g):
@@ -1007,88 +1436,232 @@ class AlulaApp(tk.Tk):
             y = (h - margin_b) - ((g - min_g) / (max_g - min_g)) * (h - margin_t - margin_b)
             return x, y
         
-        # Draw axes
-        _, origin_y = to_canvas(0, 0)
-        canvas.create_line(margin_l, margin_t, margin_l, h - margin_b, fill='grey') # Y-axis (G-load)
-        canvas.create_line(margin_l, origin_y, w - margin_r, origin_y, fill='grey') # X-axis (Airspeed)
-        
-        # Draw G-load ticks and labels
-        for g_val in range(int(min_g)+1, int(max_g)+1):
-            if g_val == 0: continue
-            _, y_tick = to_canvas(0, g_val)
-            canvas.create_line(margin_l - 5, y_tick, margin_l + 5, y_tick, fill='grey')
-            canvas.create_text(margin_l - 15, y_tick, text=f"{g_val}.0", fill="white", anchor="e")
-        canvas.create_text(margin_l - 30, h / 2, text="Load Factor (g)", fill="white", angle=90) # type: ignore
-        
-        # Draw Airspeed ticks (every 10 knots)
-        for v_tick in range(0, int(max_v), 10):
-            x, _ = to_canvas(v_tick, 0)
-            canvas.create_line(x, origin_y - 5, x, origin_y + 5, fill='grey')
-        canvas.create_text(w - margin_r, h - 15, text="Airspeed (knots CAS)", fill="white", anchor="e")
+        # Position Airspeed ticks (every 10 knots), growing the pool as the scale widens
+        origin_y = items['origin_y']
+        ticks = items['airspeed_ticks']
+        tick_speeds = range(0, int(max_v), 10)
+        while len(ticks) < len(tick_speeds):
+            tick = canvas.create_line(0, 0, 0, 0, fill='grey', tags='axes')
+            canvas.tag_lower(tick, items['fill']) # Keep ticks beneath the envelope, as the axes are
+            ticks.append(tick)
+        for i, tick in enumerate(ticks):
+            if i < len(tick_speeds):
+                x, _ = to_canvas(tick_speeds[i], 0)
+                canvas.coords(tick, x, origin_y - 5, x, origin_y + 5)
+            else:
+                self.set_item_visible(canvas, tick, False)
         
-        if vs <= 0: return # Cannot draw envelope if stall speed is zero
+        if vs <= 0: # Cannot draw envelope if stall speed is zero
+            self.set_item_visible(canvas, 'envelope', False)
+            return
         
         # Define points for the V-g envelope polygon
-        pos_stall_pts = [to_canvas(v, (v/vs)**2) for v in range(int(vs), int(va) + 1)]
-        neg_stall_pts = [to_canvas(v, neg_g) for v in range(int(va), int(vs), -1)]
+        pos_stall_pts = self.get_stall_curve(vs, va, max_v, items['size'], to_canvas)
+        neg_stall_pts = [to_canvas(va, neg_g), to_canvas(vs, neg_g)]
         p_va_pos, p_vne_pos, p_vne_neg = to_canvas(va, pos_g), to_canvas(vne, pos_g), to_canvas(vne, neg_g)
         
         envelope_poly = pos_stall_pts + [p_vne_pos, p_vne_neg] + neg_stall_pts
         
-        # Draw the operating envelope fill
-        canvas.create_polygon(envelope_poly, fill='#4A4A4A', stipple='gray50', outline='')
-        
-        # Draw envelope lines
-        canvas.create_line(pos_stall_pts, fill='#E87B33', width=2) # Positive stall curve
-        canvas.create_line(p_va_pos, p_vne_pos, fill='#E87B33', width=2) # Positive G limit line
-        canvas.create_line(neg_stall_pts, fill='#4A90E2', width=2) # Negative stall/G limit line
-        canvas.create_line(p_vne_pos, p_vne_neg, fill='#FF00FF', width=2) # Vne limit line
+        # Update the operating envelope fill and lines
+        canvas.coords(items['fill'], envelope_poly)
+        self.set_polyline(canvas, items['pos_stall'], pos_stall_pts)
+        canvas.coords(items['pos_limit'], *p_va_pos, *p_vne_pos)
+        self.set_polyline(canvas, items['neg_limit'], neg_stall_pts)
+        canvas.coords(items['vne_limit'], *p_vne_pos, *p_vne_neg)
         
-        # Draw flaps stall speed curve if applicable
+        # Update flaps stall speed curve if applicable
         vs_flaps = calc.get('Stall Speed Flaps')
-        if vs_flaps and vs_flaps > 0:
-            flaps_stall_pts = [to_canvas(v, (v/vs_flaps)**2) for v in range(int(vs_flaps), int(va)+1)]
-            canvas.create_line(flaps_stall_pts, fill='#87CEEB', width=2, dash=(4, 4))
+        if vs_flaps and 0 < vs_flaps < va:
+            self.set_polyline(canvas, items['flaps_stall'], self.get_stall_curve(vs_flaps, va, max_v, items['size'], to_canvas))
+        else:
+            self.set_item_visible(canvas, items['flaps_stall'], False)
         
-        # Helper function to draw speed labels on the X-axis
+        # Helper function to position speed labels on the X-axis
         label_y = origin_y + 15
-        def draw_speed_label(v, name):
-            if v > 0:
+        def place_speed_label(v, name):
+            tick, text = items['speed_labels'][name]
+            if v and v > 0:
                 x, _ = to_canvas(v, 0)
-                canvas.create_line(x, origin_y - 5, x, origin_y + 5, fill='white')
-                canvas.create_text(x, label_y, text=f"{name}\n{v:.1f}", fill="white", anchor="n", justify='center')
+                canvas.coords(tick, x, origin_y - 5, x, origin_y + 5)
+                canvas.coords(text, x, label_y)
+                canvas.itemconfig(text, text=f"{name}\n{v:.1f}")
+            else:
+                self.set_item_visible(canvas, tick, False)
+                self.set_item_visible(canvas, text, False)
         
-        # Draw key speed labels
-        if vs_flaps: draw_speed_label(vs_flaps, "Vs (flaps)")
-        draw_speed_label(vs, "Vs (clean)")
-        draw_speed_label(va, "Va")
-        draw_speed_label(vne, "Vne")
+        # Update key speed labels
+        place_speed_label(vs_flaps, "Vs (flaps)")
+        place_speed_label(vs, "Vs (clean)")
+        place_speed_label(va, "Va")
+        place_speed_label(vne, "Vne")
         
         # Mark and label VH (max level speed)
         x_vh, y_vh = to_canvas(vh, 1.0) # VH is at 1g
-        canvas.create_oval(x_vh-3, y_vh-3, x_vh+3, y_vh+3, fill='yellow', outline='')
-        canvas.create_text(x_vh + 5, y_vh, text=f"VH {vh:.1f}", fill='yellow', anchor='w')
+        canvas.coords(items['vh_marker'], x_vh-3, y_vh-3, x_vh+3, y_vh+3)
+        canvas.coords(items['vh_text'], x_vh + 5, y_vh)
+        canvas.itemconfig(items['vh_text'], text=f"VH {vh:.1f}")
         
-        # Draw vertical line from Va to positive G limit
+        # Update vertical line from Va to positive G limit
         x_va, y_va_top = to_canvas(va, pos_g)
-        canvas.create_line(x_va, origin_y, x_va, y_va_top, fill='#E87B33', dash=(2, 2))
-        
-        # Draw legend for envelope lines
+        canvas.coords(items['va_line'], x_va, origin_y, x_va, y_va_top)
+
+    def get_stall_curve(self, v_stall: float, va: float, max_v: float, size: Tuple[int, int], to_canvas) -> List[Tuple[float, float]]:
+        """
+        Returns the canvas polyline of the stall curve g = (v / v_stall)^2 from
+        v_stall to va, tessellated adaptively. Polylines are cached per stall
+        speed, Va, canvas size and airspeed scale (which together fix the
+        mapping), so redraws of an unchanged envelope reuse them.
+        """
+        key = (v_stall, va, max_v, size)
+        points = self.curve_cache.get(key)
+        if points is None:
+            points = tessellate_curve(lambda v: (v / v_stall) ** 2, v_stall, va, to_canvas)
+            self.curve_cache[key] = points
+            if len(self.curve_cache) > self.CURVE_CACHE_SIZE:
+                self.curve_cache.popitem(last=False)
+        else:
+            self.curve_cache.move_to_end(key)
+        return points
+
+    def set_polyline(self, canvas: tk.Canvas, item, points: List[Tuple[float, float]]):
+        """
+        Moves a line item to the given points, hiding it when there are too
+        few points to draw a line.
+        """
+        if len(points) < 2:
+            self.set_item_visible(canvas, item, False)
+            return
+        canvas.coords(item, [c for p in points for c in p])
+
+    def build_power_chart(self, canvas: tk.Canvas, w: int, h: int) -> dict:
+        """
+        Creates the retained items of the power curves chart: axes, titles and
+        legend are final; the tick labels, curves and speed markers are
+        created empty and positioned by `update_power_chart`. Items are tagged
+        'axes' or 'curves' so each group can be shown or hidden at once.
+        """
+        margin_l, margin_r, margin_t, margin_b = 60, 30, 20, 50
+        canvas.create_line(margin_l, margin_t, margin_l, h - margin_b, fill='grey', tags='axes') # Y-axis (power)
+        canvas.create_line(margin_l, h - margin_b, w - margin_r, h - margin_b, fill='grey', tags='axes') # X-axis (airspeed)
+        canvas.create_text(margin_l - 40, h / 2, text="Power (HP)", fill="white", angle=90, tags='axes') # type: ignore
+        canvas.create_text(w - margin_r, h - 15, text="Airspeed (knots TAS, sea level)", fill="white", anchor="e", tags='axes')
+
+        # Tick labels at fixed fractions of each axis; their values follow the scale
+        ticks = [i / 4 for i in range(5)]
+        x_ticks = [(f, canvas.create_text(margin_l + f * (w - margin_l - margin_r), h - margin_b + 8, text="", fill="white", anchor="n", tags='axes')) for f in ticks]
+        y_ticks = [(f, canvas.create_text(margin_l - 8, (h - margin_b) - f * (h - margin_t - margin_b), text="", fill="white", anchor="e", tags='axes')) for f in ticks]
+        for f in ticks[1:]:
+            x = margin_l + f * (w - margin_l - margin_r)
+            y = (h - margin_b) - f * (h - margin_t - margin_b)
+            canvas.create_line(x, h - margin_b - 5, x, h - margin_b + 5, fill='grey', tags='axes')
+            canvas.create_line(margin_l - 5, y, margin_l + 5, y, fill='grey', tags='axes')
+
+        items = {
+            'margins': (margin_l, margin_r, margin_t, margin_b), 'x_ticks': x_ticks, 'y_ticks': y_ticks,
+            'p_req': canvas.create_line(0, 0, 0, 0, fill='#E87B33', width=2, tags='curves'),
+            'p_avail': canvas.create_line(0, 0, 0, 0, fill='#7ED321', width=2, tags='curves'),
+            # Minimum power / Vy and VH markers on the power required curve
+            'vy_marker': canvas.create_oval(0, 0, 0, 0, fill='#87CEEB', outline='', tags='curves'),
+            'vy_text': canvas.create_text(0, 0, text="", fill='#87CEEB', anchor='n', tags='curves'),
+            'vh_marker': canvas.create_oval(0, 0, 0, 0, fill='yellow', outline='', tags='curves'),
+            'vh_text': canvas.create_text(0, 0, text="", fill='yellow', anchor='sw', tags='curves'),
+        }
+
+        # Legend
         legend_x, legend_y = w - 190, margin_t + 15
-        legend_items = [
-            ("Clean Stall / Limit", "#E87B33", "solid"),
-            ("Flaps Stall", "#87CEEB", "dashed"),
-            ("Negative Stall / Limit", "#4A90E2", "solid"),
-            ("Vne Limit", "#FF00FF", "solid"),
-            ("Operating Envelope", "#4A4A4A", "fill")
-        ]
-        canvas.create_rectangle(legend_x - 10, legend_y - 10, legend_x + 160, legend_y + 105, fill="#383838", outline="grey")
-        for i, (text, color, style) in enumerate(legend_items):
+        canvas.create_rectangle(legend_x - 10, legend_y - 10, legend_x + 160, legend_y + 30, fill="#383838", outline="grey", tags='axes')
+        for i, (text, color) in enumerate([("Power Required", "#E87B33"), ("Power Available", "#7ED321")]):
             y = legend_y + i * 20
-            if style == "fill": canvas.create_rectangle(legend_x, y, legend_x + 30, y + 10, fill=color, stipple='gray50', outline='grey')
-            elif style == "dashed": canvas.create_line(legend_x, y + 5, legend_x + 30, y + 5, fill=color, width=2, dash=(4,4))
-            else: canvas.create_line(legend_x, y + 5, legend_x + 30, y + 5, fill=color, width=2)
-            canvas.create_text(legend_x + 40, y + 5, text=text, fill="white", anchor="w")
+            canvas.create_line(legend_x, y + 5, legend_x + 30, y + 5, fill=color, width=2, tags='axes')
+            canvas.create_text(legend_x + 40, y + 5, text=text, fill="white", anchor="w", tags='axes')
+
+        items['message'] = canvas.create_text(w/2, h/2, text="", fill='white', font=('Helvetica', 12), state='hidden')
+        return items
+
+    def update_power_chart(self):
+        """
+        Updates the 'Power Curves' chart: power required and power available
+        (HP) against airspeed at sea level, with the minimum-power speed (Vy
+        for fixed wings) and VH marked. The curve is the design's cached
+        power curve from the engine, the same one the results are derived
+        from. Displays a message for unpowered vehicle types.
+        """
+        if "Power Curves" not in self.built_tabs: return # Drawn when the tab is built
+        canvas = self.power_canvas
+        items = self.get_canvas_items('power', canvas, self.build_power_chart)
+        if items is None: return
+
+        v_type = self.data['inputs']['vehicle_type'].get()
+        calc = self.data['calculations']
+        curve = None
+        if "Gross Weight" in calc:
+            inputs = alula_engine.normalize_inputs({key: var.get() for key, var in self.data['inputs'].items()})
+            curve = alula_engine.design_power_curve(inputs, calc["Gross Weight"])
+        available = curve is not None and len(curve.speeds) > 1
+        self.set_item_visible(canvas, 'axes', available)
+        self.set_item_visible(canvas, 'curves', available)
+        message = f"Power curves not applicable for {v_type}." if curve is None else "No power curve: the design has no drag."
+        canvas.itemconfig(items['message'], text=message, state='hidden' if available else 'normal')
+        if not available: return
+
+        w, h = items['size']
+        margin_l, margin_r, margin_t, margin_b = items['margins']
+        speeds = [v / self.KNOTS_TO_FPS for v in curve.speeds]
+        power_req = [p / 550 for p in curve.power_required]
+        power_avail = curve.power_avail / 550
+        min_power = curve.model.power_required(curve.min_power_fps) / 550 if curve.min_power_fps > 0 else power_req[0]
+        max_v = speeds[-1]
+        max_p = max(power_avail, min_power, 1.0) * 1.6 # Power scale; the steep ends of the curve are cut off
+
+        # Helper function to convert (airspeed, power) to canvas coordinates
+        def to_canvas(v, p):
+            x = margin_l + (v / max_v) * (w - margin_l - margin_r)
+            y = (h - margin_b) - (p / max_p) * (h - margin_t - margin_b)
+            return x, y
+
+        for f, text in items['x_ticks']:
+            canvas.itemconfig(text, text=f"{f * max_v:.0f}")
+        for f, text in items['y_ticks']:
+            canvas.itemconfig(text, text=f"{f * max_p:.0f}")
+
+        self.set_polyline(canvas, items['p_req'], [to_canvas(v, p) for v, p in zip(speeds, power_req) if p <= max_p])
+        canvas.coords(items['p_avail'], *to_canvas(0, power_avail), *to_canvas(max_v, power_avail))
+
+        # Mark the minimum-power speed (Vy for fixed wings, which is limited to above the stall) and VH
+        vy = calc.get("Vy", 0) if v_type == 'Fixed Wing' else curve.min_power_fps / self.KNOTS_TO_FPS
+        vy_label = "Vy" if v_type == 'Fixed Wing' else "Min Power"
+        for marker, text, v, label in [('vy_marker', 'vy_text', vy, vy_label), ('vh_marker', 'vh_text', curve.vh_fps / self.KNOTS_TO_FPS, "VH")]:
+            visible = 0 < v <= max_v
+            self.set_item_visible(canvas, items[marker], visible)
+            self.set_item_visible(canvas, items[text], visible)
+            if not visible: continue
+            x, y = to_canvas(v, curve.model.power_required(v * self.KNOTS_TO_FPS) / 550)
+            canvas.coords(items[marker], x-4, y-4, x+4, y+4)
+            canvas.coords(items[text], x + (0 if marker == 'vy_marker' else 6), y + (8 if marker == 'vy_marker' else -6))
+            canvas.itemconfig(items[text], text=f"{label} {v:.1f}")
+
+    def update_comparison_table(self):
+        """
+        Updates the 'Comparison' table: the current inputs are evaluated as
+        every vehicle type, each with that type's component table (through
+        the result cache, so only types whose design changed are re-solved),
+        and each column shows the type's Part 103 status and main results.
+        """
+        if "Comparison" not in self.built_tabs: return # Filled in when the tab is built
+        import alula_compare
+        inputs = {key: var.get() for key, var in self.data['inputs'].items()}
+        entries = []
+        for v_type in alula_engine.VEHICLE_TYPES:
+            try:
+                calc = self.result_cache.evaluate_totals(dict(inputs, vehicle_type=v_type), self.component_table(v_type).totals())
+            except EVALUATION_ERRORS as e:
+                entries.append({'vehicle_type': v_type, 'error': str(e)})
+            else:
+                entries.append(alula_compare.comparison_entry(v_type, calc))
+        for label, cells in alula_compare.comparison_rows(entries):
+            self.comparison_tree.item(label, values=cells)
+        for v_type in alula_engine.VEHICLE_TYPES:
+            self.comparison_tree.heading(v_type, text=f"{v_type} *" if v_type == inputs['vehicle_type'] else v_type)
 
     def update_feedback_tab(self):
         """
@@ -1096,70 +1669,37 @@ class AlulaApp(tk.Tk):
         including compliance warnings against FAR Part 103 regulations (weight, speed)
         and insights on stability and handling characteristics.
         """
+        if "Issues & Feedback" not in self.built_tabs: return # Filled in when the tab is built
         self.feedback_text.config(state='normal') # Enable editing
         self.feedback_text.delete('1.0', tk.END) # Clear existing text
         
-        calc = self.data['calculations']
-        v_type = self.data['inputs']['vehicle_type'].get()
-        feedback = []
-        
-        # Aerodynamics summary
-        if calc.get('Total Cd0'):
-            feedback.append(f"ℹ️ Aerodynamics: Base Cd0 ({calc.get('Base Cd0', 0):.3f}) + Cockpit ({calc.get('Cockpit Drag', 0):.4f}) + Tail ({calc.get('Tail Drag', 0):.4f}) = Total Cd0 ({calc.get('Total Cd0', 0):.3f}).")
-        
-        # Pitch Stability Feedback
-        sm = calc.get("Static Margin")
-        if isinstance(sm, (int, float)):
-            if 5 <= sm <= 15:
-                feedback.append("✔️ Pitch Stability: Good. Static margin is in the ideal 5-15% range.")
-            else:
-                feedback.append("❌ Pitch Stability: Poor. Static margin is outside the ideal range. Check CG and Neutral Point.")
-        
-        # FAR Part 103 Compliance: Empty Weight
-        weight_limit = self.FAR_103_GLIDER_EMPTY_WEIGHT_LBS if v_type in ['Glider', 'Paraglider'] else self.FAR_103_EMPTY_WEIGHT_LBS
-        if calc.get("Empty Weight", 0) > weight_limit:
-            feedback.append(f"❌ Compliance: Empty weight exceeds Part 103 limit for this aircraft type ({weight_limit} lbs).")
-        else:
-            feedback.append(f"✔️ Compliance: Empty weight is within Part 103 limit for this aircraft type ({weight_limit} lbs).")
-        
-        # FAR Part 103 Compliance: Stall Speed
-        v_stall = calc.get("Stall Speed") or calc.get("Min. Fwd Speed")
-        if isinstance(v_stall, (int, float)) and v_stall > self.FAR_103_STALL_SPEED_KNOTS:
-            feedback.append(f"❌ Compliance: Speed ({v_stall:.1f} knots) exceeds FAR 103 stall speed limit.")
-        
-        # FAR Part 103 Compliance: Max Level Speed (VH)
-        vh = calc.get("VH")
-        if isinstance(vh, (int, float)) and vh > self.FAR_103_MAX_SPEED_KNOTS:
-            feedback.append(f"❌ Compliance: Max speed ({vh:.1f} knots) exceeds FAR 103 limit.")
-        
-        # Handling Characteristics (based on wing/disc loading)
-        wl = calc.get("Wing Loading") or calc.get("Disc Loading")
-        if isinstance(wl, (int, float)):
-            if wl < 2.5:
-                feedback.append("ℹ️ Handling: Very low loading suggests high sensitivity to turbulence.")
-            elif wl > 5.0:
-                feedback.append("ℹ️ Handling: High loading suggests higher landing speeds.")
-        
+        feedback = alula_engine.design_feedback(self.data['inputs']['vehicle_type'].get(), self.data['calculations'])
         self.feedback_text.insert('1.0', "\n\n".join(feedback)) # Insert feedback messages
         self.feedback_text.config(state='disabled') # Disable editing
 
     def save_design(self):
         """
         Opens a file dialog to save the current design's input parameters
-        (main inputs and component weights) to a JSON file.
+        (main inputs and component weights) to a JSON file, along with the
+        component tables edited for other vehicle types. The revision
+        history is written next to it, and later revisions appended there.
         """
+        from tkinter import filedialog, messagebox
+        import alula_compare
         filepath = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON Files", "*.json"), ("All Files", "*.*")], title="Save Design As...")
         if not filepath: return # User cancelled
         
         # Prepare data for saving
-        data_to_save = {
-            'main_inputs': {key: var.get() for key, var in self.data['inputs'].items()},
-            'component_weights': [{'name': e['name'].get(), 'weight': e['weight'].get(), 'arm': e['arm'].get()} for e in self.component_entries]
-        }
+        data_to_save = self.get_design_record()
+        other_tables = {v_type: table.to_records() for v_type, table in self.component_sets.items()
+                        if v_type != self.components_type and not table.matches(alula_engine.default_components(v_type))}
+        if other_tables:
+            data_to_save[alula_compare.VEHICLE_COMPONENTS_KEY] = other_tables
         
         try:
             with open(filepath, 'w', encoding="utf-8") as f:
                 json.dump(data_to_save, f, indent=4) # Save as pretty-printed JSON
+            self.history.save(alula_history.sidecar_path(filepath))
         except (IOError, TypeError) as e:
             messagebox.showerror("Save Error", f"Failed to save file:\n{e}")
 
@@ -1167,13 +1707,18 @@ class AlulaApp(tk.Tk):
         """
         Opens a file dialog to load design parameters from a JSON file.
         Updates the input fields with the loaded data and triggers a UI refresh.
+        The design's revision history is read from its sidecar file, if any.
         """
+        from tkinter import filedialog, messagebox
+        import alula_compare
         filepath = filedialog.askopenfilename(filetypes=[("JSON Files", "*.json"), ("All Files", "*.*")], title="Load Design")
         if not filepath: return # User cancelled
         
         try:
             with open(filepath, 'r', encoding="utf-8") as f:
                 loaded_data = json.load(f)
+            other_tables = alula_compare.vehicle_components(loaded_data)
+            history = alula_history.open_history(filepath)
             
             # Load main inputs
             if 'main_inputs' in loaded_data:
@@ -1181,19 +1726,267 @@ class AlulaApp(tk.Tk):
                     if key in self.data['inputs']:
                         self.data['inputs'][key].set(value)
             
-            # Load component weights
+            # The other vehicle types' component tables (their defaults unless saved with the design)
+            self.components_type = self.data['inputs']['vehicle_type'].get()
+            self.component_sets = {v_type: alula_components.ComponentTable(rows) for v_type, rows in other_tables.items()}
+            self.component_sets[self.components_type] = self.components
+            
+            # Load component weights (every row, however many)
             if 'component_weights' in loaded_data:
-                # Iterate and update existing component entries
-                for i, loaded_comp in enumerate(loaded_data['component_weights']):
-                    if i < len(self.component_entries):
-                        self.component_entries[i]['name'].set(loaded_comp.get('name', ''))
-                        self.component_entries[i]['weight'].set(loaded_comp.get('weight', '0'))
-                        self.component_entries[i]['arm'].set(loaded_comp.get('arm', '0'))
+                self.components.load(loaded_data['component_weights'])
+                self.component_view_first = 0
+                self.refresh_component_view()
             
+            self.history = history # The loaded state is recorded in the design's own history
             self.update_ui_for_vehicle_type() # Refresh UI based on new loaded data
-        except (IOError, json.JSONDecodeError, KeyError) as e:
+        except (IOError, ValueError, KeyError, AttributeError) as e:
             messagebox.showerror("Load Error", f"Failed to load or parse file:\n{e}")
 
+    def record_revision(self, components_changed: bool = True):
+        """
+        Records the state just calculated in the revision history (nothing is
+        recorded if it is the current revision's, e.g. after an undo). The
+        component table is compared only if it may have changed.
+        """
+        inputs = {key: var.get() for key, var in self.data['inputs'].items()}
+        try:
+            self.history.record(inputs, self.components.rows() if components_changed else None)
+        except OSError as e:
+            self.history.path = None # Keep recording in memory only
+            self.status_label.config(text=f"Revision history no longer saved: {e}")
+
+    def apply_design_state(self, state: alula_history.DesignState):
+        """
+        Restores the inputs and component table of a revision and
+        recalculates. The table replaces the revision's vehicle type's own.
+        """
+        self.finish_component_edit(commit=False)
+        for key, value in state.inputs.items():
+            if key in self.data['inputs']:
+                self.data['inputs'][key].set(value)
+        v_type = self.data['inputs']['vehicle_type'].get()
+        if v_type != self.components_type and v_type in alula_engine.VEHICLE_TYPES:
+            self.components = self.component_table(v_type)
+            self.components_type = v_type
+        self.components.load(dict(zip(alula_components.FIELDS, row)) for row in state.components)
+        self.component_view_first = 0
+        self.refresh_component_view()
+        self.update_ui_for_vehicle_type()
+
+    def undo_revision(self):
+        """Steps back to the previous revision of the design."""
+        state = self.history.undo()
+        if state is None:
+            self.status_label.config(text="Nothing to undo.")
+            return
+        self.apply_design_state(state)
+        self.status_label.config(text=f"Undo: revision {self.history.current} of {len(self.history)}")
+
+    def redo_revision(self):
+        """Steps forward again to the revision most recently undone."""
+        state = self.history.redo()
+        if state is None:
+            self.status_label.config(text="Nothing to redo.")
+            return
+        self.apply_design_state(state)
+        self.status_label.config(text=f"Redo: revision {self.history.current} of {len(self.history)}")
+
+    def compare_revisions(self):
+        """
+        Asks for two revisions (by default the previous and the current one)
+        and shows how their inputs, component tables and results differ.
+        """
+        from tkinter import messagebox, simpledialog
+        history = self.history
+        if len(history) < 2:
+            messagebox.showinfo("Compare Revisions", "The design has no earlier revision yet.")
+            return
+        previous = max(history.revisions[history.current].parent, 0)
+        spec = simpledialog.askstring("Compare Revisions", f"Two revisions to compare (0-{len(history) - 1}):",
+                                      initialvalue=f"{previous} {history.current}", parent=self)
+        if not spec: return # User cancelled
+        try:
+            a, b = (int(number) for number in spec.split())
+            if not (0 <= a < len(history) and 0 <= b < len(history)):
+                raise ValueError(f"Revisions are numbered 0 to {len(history) - 1}")
+        except ValueError as e:
+            messagebox.showerror("Compare Revisions", str(e) if "numbered" in str(e) else "Enter two revision numbers, e.g. '3 7'.")
+            return
+        lines = alula_history.format_diff(history.diff(a, b, evaluate=self.result_cache.evaluate))
+        if len(lines) > 40:
+            lines = lines[:40] + [f"... and {len(lines) - 40} more lines"]
+        messagebox.showinfo("Compare Revisions", "\n".join(lines))
+
+    def export_result_trends(self):
+        """
+        Replays the whole revision history in the background, regenerating
+        the main results of every revision, and writes them to a CSV file.
+        """
+        from tkinter import filedialog
+        filepath = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV Files", "*.csv"), ("All Files", "*.*")], title="Export Result Trends As...")
+        if not filepath: return # User cancelled
+        
+        def trends_job(ctx, history, count):
+            trend = history.trend(stop=count, progress=lambda done, total: ctx.report(done, total, f"{done:,} of {total:,} revisions"))
+            with open(filepath, 'w', encoding='utf-8', newline='') as f:
+                alula_history.write_trend(trend, f)
+            return count
+        
+        self.start_job("Result Trends", trends_job, lambda count: self.status_label.config(text=f"Result Trends: {count:,} revisions written to {os.path.basename(filepath)}"),
+                       self.history, len(self.history))
+
+    def start_job(self, name: str, fn: Callable, on_done: Callable, *args):
+        """
+        Runs `fn(ctx, *args)` on the background job runner and shows its
+        progress in the status bar. `on_done` is called on the main thread
+        with the job's result when it finishes.
+        """
+        job = self.job_runner.submit(name, fn, *args)
+        self.job_callbacks[job.job_id] = on_done
+        self.status_label.config(text=f"{name}: starting...")
+        self.progress_bar.config(value=0, maximum=1)
+        self.cancel_button.config(state='normal')
+        if not self.job_poll_scheduled:
+            self.job_poll_scheduled = True
+            self.after(self.JOB_POLL_MS, self.poll_jobs)
+
+    def poll_jobs(self):
+        """
+        Applies the progress and completion events posted by background jobs
+        since the last poll, and keeps polling while any job is active.
+        """
+        from tkinter import messagebox
+        for event in self.job_runner.poll():
+            if event.kind == 'progress':
+                self.progress_bar.config(maximum=max(event.total, 1), value=event.done)
+                self.status_label.config(text=f"{event.name}: {event.message or f'{event.done} of {event.total}'}")
+                continue
+            on_done = self.job_callbacks.pop(event.job_id, None)
+            if event.kind == 'done':
+                self.progress_bar.config(value=self.progress_bar['maximum'])
+                self.status_label.config(text=f"{event.name}: finished")
+                if on_done: on_done(event.result)
+            elif event.kind == 'cancelled':
+                self.status_label.config(text=f"{event.name}: cancelled")
+            else:
+                self.status_label.config(text=f"{event.name}: failed")
+                messagebox.showerror(f"{event.name} Failed", event.message or event.result)
+        
+        if self.job_runner.active_jobs:
+            self.after(self.JOB_POLL_MS, self.poll_jobs)
+        else:
+            self.job_poll_scheduled = False
+            self.cancel_button.config(state='disabled')
+
+    def cancel_jobs(self):
+        """
+        Requests cancellation of all background jobs; each stops the next
+        time it reports progress.
+        """
+        self.job_runner.cancel()
+        self.status_label.config(text="Cancelling...")
+
+    def on_close(self):
+        """
+        Cancels any background jobs and closes the application.
+        """
+        self.job_runner.shutdown(cancel=True)
+        self.destroy()
+
+    def run_parametric_sweep(self):
+        """
+        Asks for input ranges and an output file, then evaluates every
+        combination of the ranges on top of the current design in the
+        background, writing one row per design as CSV or JSON lines.
+        """
+        from tkinter import filedialog, messagebox, simpledialog
+        import alula_sweep
+        specs = simpledialog.askstring("Parametric Sweep", "Input ranges, separated by spaces\n(KEY=START:STOP:STEP or KEY=V1,V2,...):",
+                                       initialvalue="wing_area=150:300:10 engine_hp=10:40:2", parent=self)
+        if not specs: return # User cancelled
+        record = self.get_design_record()
+        try:
+            ranges = [alula_sweep.parse_range(spec) for spec in specs.split()]
+            probe = alula_engine.copy_design_record(record)
+            for key, values in ranges:
+                alula_engine.set_design_parameter(probe, key, values[0])
+        except (ValueError, KeyError) as e:
+            messagebox.showerror("Parametric Sweep", e.args[0] if isinstance(e, KeyError) else str(e))
+            return
+        
+        filepath = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV Files", "*.csv"), ("JSON Lines", "*.jsonl"), ("All Files", "*.*")], title="Save Sweep Results As...")
+        if not filepath: return # User cancelled
+        fmt = 'jsonl' if filepath.endswith(('.jsonl', '.ndjson')) else 'csv'
+        total = math.prod(len(values) for _, values in ranges)
+        columns = alula_sweep.output_columns(record, ranges)
+        
+        def sweep_job(ctx, record, ranges):
+            rows = alula_sweep.iter_sweep(record, ranges, workers=os.cpu_count() or 1)
+            def tracked_rows():
+                for i, row in enumerate(rows, 1):
+                    yield row
+                    ctx.report(i, total, f"{i:,} of {total:,} designs")
+            try:
+                with open(filepath, 'w', encoding='utf-8', newline='') as f:
+                    return alula_sweep.write_sweep(tracked_rows(), columns, f, fmt)
+            finally:
+                rows.close() # Stop the worker processes if the sweep was cancelled
+        
+        self.start_job("Sweep", sweep_job, lambda count: self.status_label.config(text=f"Sweep: {count:,} designs written to {os.path.basename(filepath)}"), record, ranges)
+
+    def run_monte_carlo_analysis(self):
+        """
+        Asks for the uncertain inputs, then runs a Monte Carlo analysis of the
+        current design in the background and shows the probability of
+        meeting each Part 103 limit.
+        """
+        from tkinter import messagebox, simpledialog
+        import alula_montecarlo # Loads NumPy, so only imported when needed
+        if alula_montecarlo.np is None:
+            messagebox.showerror("Monte Carlo Analysis", "Monte Carlo analysis requires NumPy.\nInstall it with 'pip install numpy'.")
+            return
+        specs = simpledialog.askstring("Monte Carlo Analysis", "Uncertain inputs, separated by spaces\n(KEY=pct:P, KEY=uniform:LO:HI or KEY=normal:SD):",
+                                       initialvalue="weight:*=pct:10", parent=self)
+        if not specs: return # User cancelled
+        record = self.get_design_record()
+        try:
+            distributions = [alula_montecarlo.parse_distribution(spec) for spec in specs.split()]
+            alula_montecarlo.build_model(record, distributions)
+        except (ValueError, KeyError) as e:
+            messagebox.showerror("Monte Carlo Analysis", e.args[0] if isinstance(e, KeyError) else str(e))
+            return
+        
+        def monte_carlo_job(ctx, record, distributions):
+            return alula_montecarlo.run_monte_carlo(record, distributions, samples=self.MONTE_CARLO_SAMPLES,
+                                                    progress=lambda done, total: ctx.report(done, total, f"{done:,} of {total:,} samples"))
+        
+        def show_summary(summary):
+            header = f"{summary['vehicle_type']}, {summary['samples']:,} samples"
+            messagebox.showinfo("Monte Carlo Analysis", "\n".join([header, ""] + alula_montecarlo.format_summary(summary)))
+        
+        self.start_job("Monte Carlo", monte_carlo_job, show_summary, record, distributions)
+
+    def show_altitude_performance(self):
+        """
+        Evaluates the current design from sea level up in the standard
+        atmosphere (with the design's temperature offset) and shows its
+        ceilings and a table of VH, rate of climb and stall speed (TAS).
+        """
+        from tkinter import messagebox
+        import alula_altitude # Loads NumPy, so only imported when needed
+        if alula_altitude.np is None:
+            messagebox.showerror("Altitude Performance", "Altitude performance requires NumPy.\nInstall it with 'pip install numpy'.")
+            return
+        try:
+            performance = alula_altitude.altitude_performance(self.get_design_record())
+        except (KeyError,) + EVALUATION_ERRORS as e:
+            messagebox.showerror("Altitude Performance", str(e))
+            return
+        lines = alula_altitude.format_performance(performance, every_ft=5000)
+        field = performance['field_elevation_ft']
+        lines.insert(1, f"  Field elevation {field:,.0f} ft, density altitude {self.data['calculations'].get('Density Altitude', field):,.0f} ft")
+        messagebox.showinfo("Altitude Performance", "\n".join(lines))
+
     def show_about_dialog(self):
         """
         Displays an 'About ALULA' information dialog with application version
@@ -1250,9 +2043,10 @@ class AlulaApp(tk.Tk):
 
 # Main execution block
 if __name__ == "__main__":
+    # Batch commands were dispatched at the top of this file, before tkinter was imported.
     # Creates an instance of the application and starts the Tkinter event loop.
     try:
-        app = AlulaApp()
+        app = AlulaApp(startup_timing=STARTUP_TIMING_FLAG in sys.argv[1:])
         app.mainloop()
     except tk.TclError as ex:
         print(f"Skipping GUI execution in headless environment: {ex}")
@@ -0,0 +1,583 @@
+# -*- coding: utf-8 -*-
+"""
+ALULA airfoil polar library.
+
+Section lift, drag and pitching moment coefficients (Cl, Cd, Cm) against
+angle of attack and Reynolds number for hundreds of airfoils, kept in one
+compact binary file. The file is memory-mapped, not read: opening it costs
+a header parse, and looking up a section touches only its own rows. Each
+section also has a precomputed summary per Reynolds number (maximum lift,
+minimum drag, zero-lift angle, ...), so the values a design needs are two
+table rows and one interpolation away:
+
+    library = alula_airfoils.get_library()
+    section = library.summary("NACA 2412", 1.5e6)
+    print(section.cl_max, section.cd_min)
+
+The library is generated rather than shipped: the first time it is needed,
+the NACA 4-digit family is computed (zero-lift angle and pitching moment of
+the mean line from thin-airfoil theory; lift slope, maximum lift and
+profile drag from empirical thickness and Reynolds number corrections) and
+written to DEFAULT_LIBRARY_PATH (or $ALULA_AIRFOILS). Measured or computed
+polars, such as XFOIL polar files, can be added with
+`python ALULA.py airfoils --import`; they replace generated sections of the
+same name.
+
+File layout (little-endian):
+
+    header      magic, format version, section count, Reynolds number count, angle count
+    grids       Reynolds numbers, angles of attack in degrees (float64)
+    index       section names, sorted, NAME_BYTES each (ASCII, NUL padded)
+    summaries   SUMMARY_FIELDS per section and Reynolds number (float32)
+    polars      Cl, Cd, Cm per section, Reynolds number and angle (float32)
+"""
+
+import bisect
+import glob
+import math
+import mmap
+import os
+import re
+import struct
+import sys
+import tempfile
+import threading
+from array import array
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+MAGIC = b"ALULAPOL"
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<8sIIII')
+NAME_BYTES = 24
+REYNOLDS_GRID: Tuple[float, ...] = (5e4, 1e5, 2e5, 3.5e5, 5e5, 7.5e5, 1e6, 1.5e6, 2e6, 3e6, 5e6, 1e7)
+ALPHA_GRID: Tuple[float, ...] = tuple(-10 + 0.5 * i for i in range(61)) # Degrees
+SUMMARY_FIELDS: Tuple[str, ...] = ('cl_max', 'alpha_cl_max', 'cd_min', 'cl_cd_min', 'cl_alpha', 'alpha_zero_lift', 'cm0')
+DEFAULT_LIBRARY_PATH = os.environ.get('ALULA_AIRFOILS') or os.path.join(os.path.expanduser('~'), '.alula', 'airfoils.pol')
+
+# Generated NACA 4-digit family: maximum camber (% chord), its position
+# (tenths of chord) and thickness (% chord); symmetric sections have no position
+NACA_CAMBERS: Tuple[int, ...] = (1, 2, 3, 4, 5, 6)
+NACA_POSITIONS: Tuple[int, ...] = (2, 3, 4, 5, 6)
+NACA_THICKNESSES: Tuple[int, ...] = (6, 8, 9, 10, 12, 14, 15, 16, 18, 21)
+
+
+class SectionSummary(NamedTuple):
+    """
+    Characteristic values of a section's polar at one Reynolds number.
+    Angles are in degrees and the lift slope is per degree.
+    """
+    cl_max: float
+    alpha_cl_max: float
+    cd_min: float
+    cl_cd_min: float # Lift coefficient at minimum drag
+    cl_alpha: float
+    alpha_zero_lift: float
+    cm0: float # Quarter-chord pitching moment at zero lift
+
+
+class Polar(NamedTuple):
+    """A section's Cl, Cd and Cm at each angle of attack (degrees) of the library grid."""
+    alpha: List[float]
+    cl: List[float]
+    cd: List[float]
+    cm: List[float]
+
+
+class Section(NamedTuple):
+    """
+    A section as stored in a library: its name and its (Cl, Cd, Cm) rows,
+    Reynolds number major then angle of attack, on REYNOLDS_GRID x ALPHA_GRID.
+    """
+    name: str
+    polars: array
+
+
+def normalize_name(name: str) -> str:
+    """Returns the lookup key of a section name (case and spacing do not matter)."""
+    return "".join(str(name).upper().split())
+
+
+def _float_view(buffer, offset: int, count: int):
+    """Returns `count` little-endian float32 values of a buffer, without copying where possible."""
+    data = memoryview(buffer)[offset:offset + 4 * count]
+    if sys.byteorder == 'little':
+        return data.cast('f')
+    values = array('f', data.tobytes())
+    values.byteswap()
+    return values
+
+
+def _interpolate(x: float, xs: Sequence[float], ys: Sequence[float]) -> float:
+    """Linear interpolation in a table with ascending `xs`, clamped to its ends."""
+    if x <= xs[0]: return ys[0]
+    if x >= xs[-1]: return ys[-1]
+    i = bisect.bisect_right(xs, x) - 1
+    return ys[i] + (ys[i + 1] - ys[i]) * (x - xs[i]) / (xs[i + 1] - xs[i])
+
+
+class AirfoilLibrary:
+    """
+    A polar library opened over a buffer (a memory-mapped file, or bytes).
+    Section names are resolved through an index built on first lookup;
+    values between the Reynolds numbers of the grid are interpolated
+    linearly in log(Re), and clamped to the ends of the grid.
+    """
+
+    def __init__(self, buffer, path: Optional[str] = None):
+        self.path = path
+        self._buffer = buffer
+        magic, version, count, n_re, n_alpha = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError("Not an ALULA airfoil library")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Airfoil library format {version} is not supported (expected {FORMAT_VERSION})")
+        offset = HEADER.size
+        self.reynolds: Tuple[float, ...] = struct.unpack_from(f'<{n_re}d', buffer, offset)
+        offset += 8 * n_re
+        self.alphas: Tuple[float, ...] = struct.unpack_from(f'<{n_alpha}d', buffer, offset)
+        offset += 8 * n_alpha
+        self._names_offset = offset
+        offset += NAME_BYTES * count
+        summary_count = count * n_re * len(SUMMARY_FIELDS)
+        polar_count = count * n_re * n_alpha * 3
+        if len(buffer) < offset + 4 * (summary_count + polar_count):
+            raise ValueError("Airfoil library is truncated")
+        self._summaries = _float_view(buffer, offset, summary_count)
+        self._polars = _float_view(buffer, offset + 4 * summary_count, polar_count)
+        self._count = count
+        self._log_reynolds = [math.log(r) for r in self.reynolds]
+        self._names: Optional[List[str]] = None
+        self._index: Optional[Dict[str, int]] = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, name: str) -> bool:
+        return normalize_name(name) in self._lookup()
+
+    @property
+    def names(self) -> List[str]:
+        """The section names, sorted."""
+        if self._names is None:
+            raw = bytes(memoryview(self._buffer)[self._names_offset:self._names_offset + NAME_BYTES * self._count])
+            self._names = [raw[i:i + NAME_BYTES].rstrip(b'\0').decode('ascii') for i in range(0, len(raw), NAME_BYTES)]
+        return self._names
+
+    def _lookup(self) -> Dict[str, int]:
+        """The index from section name, as stored and normalized, to section number."""
+        if self._index is None:
+            self._index = {normalize_name(name): i for i, name in enumerate(self.names)}
+            self._index.update((name, i) for i, name in enumerate(self.names))
+        return self._index
+
+    def find(self, name: str) -> int:
+        """Returns the number of a section, raising ValueError for an unknown name."""
+        index = self._lookup()
+        number = index.get(name)
+        if number is None:
+            number = index.get(normalize_name(name))
+            if number is None:
+                raise ValueError(f"Unknown airfoil {name!r}")
+        return number
+
+    def _reynolds_position(self, reynolds: float) -> Tuple[int, float]:
+        """Returns the grid row below `reynolds` and the fraction of the way to the next one (in log Re)."""
+        log_re = math.log(reynolds) if reynolds > 0 else self._log_reynolds[0]
+        i = min(max(bisect.bisect_right(self._log_reynolds, log_re) - 1, 0), len(self.reynolds) - 2)
+        fraction = (log_re - self._log_reynolds[i]) / (self._log_reynolds[i + 1] - self._log_reynolds[i])
+        return i, min(max(fraction, 0.0), 1.0)
+
+    def summary(self, name: str, reynolds: float) -> SectionSummary:
+        """Returns a section's summary at a Reynolds number."""
+        fields = len(SUMMARY_FIELDS)
+        i, fraction = self._reynolds_position(reynolds)
+        base = (self.find(name) * len(self.reynolds) + i) * fields
+        rows = self._summaries
+        return SectionSummary(*[rows[base + f] + (rows[base + fields + f] - rows[base + f]) * fraction for f in range(fields)])
+
+    def summary_table(self, name: str) -> Dict[str, List[float]]:
+        """
+        Returns a section's summary at every Reynolds number of the grid,
+        plus the grid itself as 'log_reynolds', for vectorized interpolation.
+        """
+        fields, n_re = len(SUMMARY_FIELDS), len(self.reynolds)
+        base = self.find(name) * n_re * fields
+        table = {field: [self._summaries[base + r * fields + f] for r in range(n_re)] for f, field in enumerate(SUMMARY_FIELDS)}
+        table['log_reynolds'] = list(self._log_reynolds)
+        return table
+
+    def polar(self, name: str, reynolds: float) -> Polar:
+        """Returns a section's polar at a Reynolds number."""
+        n_alpha = len(self.alphas)
+        i, fraction = self._reynolds_position(reynolds)
+        lo = (self.find(name) * len(self.reynolds) + i) * n_alpha * 3
+        hi = lo + n_alpha * 3
+        rows = self._polars
+        values = [rows[lo + j] + (rows[hi + j] - rows[lo + j]) * fraction for j in range(n_alpha * 3)]
+        return Polar(list(self.alphas), values[0::3], values[1::3], values[2::3])
+
+    def section(self, name: str) -> Section:
+        """Returns a copy of a section's rows, e.g. to write it into a new library."""
+        size = len(self.reynolds) * len(self.alphas) * 3
+        start = self.find(name) * size
+        return Section(self.names[self.find(name)], array('f', self._polars[start:start + size]))
+
+    def close(self):
+        """Releases the memory map (the library cannot be used afterwards)."""
+        self._summaries = self._polars = None
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+
+# --- Building libraries ---
+
+def summarize_polar(alphas: Sequence[float], cl: Sequence[float], cd: Sequence[float], cm: Sequence[float]) -> SectionSummary:
+    """
+    Derives the summary of one polar: maximum lift (refined with a parabola
+    through the highest point and its neighbours), minimum drag, and the
+    zero-lift angle, lift slope and pitching moment from the linear range.
+    """
+    n = len(alphas)
+    top = max(range(n), key=lambda i: cl[i])
+    cl_max, alpha_cl_max = cl[top], alphas[top]
+    if 0 < top < n - 1:
+        curvature = cl[top - 1] - 2 * cl[top] + cl[top + 1]
+        if curvature < 0:
+            shift = 0.5 * (cl[top - 1] - cl[top + 1]) / curvature
+            cl_max = cl[top] - 0.25 * (cl[top - 1] - cl[top + 1]) * shift
+            alpha_cl_max = alphas[top] + shift * (alphas[top + 1] - alphas[top])
+    bottom = min(range(n), key=lambda i: cd[i])
+
+    # Zero-lift angle: the last upward crossing of Cl = 0 below the stall
+    crossing = None
+    for i in range(top):
+        if cl[i] <= 0 < cl[i + 1]:
+            crossing = i
+    if crossing is None: # Entirely positive (or negative) lift: extrapolate from the first points
+        crossing = 0
+    i = crossing
+    slope = (cl[i + 1] - cl[i]) / (alphas[i + 1] - alphas[i]) if n > 1 else 0.0
+    alpha_zero_lift = alphas[i] - cl[i] / slope if slope else alphas[i]
+    fraction = (alpha_zero_lift - alphas[i]) / (alphas[i + 1] - alphas[i]) if n > 1 else 0.0
+    cm0 = cm[i] + (cm[i + 1] - cm[i]) * min(max(fraction, 0.0), 1.0)
+
+    # Lift slope: least squares over the 4 degrees above the zero-lift angle
+    points = [(a, c) for a, c in zip(alphas, cl) if alpha_zero_lift - 1 <= a <= alpha_zero_lift + 4 and a <= alpha_cl_max]
+    if len(points) >= 2:
+        mean_a = sum(a for a, _ in points) / len(points)
+        mean_c = sum(c for _, c in points) / len(points)
+        spread = sum((a - mean_a) ** 2 for a, _ in points)
+        slope = sum((a - mean_a) * (c - mean_c) for a, c in points) / spread if spread > 0 else slope
+    return SectionSummary(cl_max, alpha_cl_max, cd[bottom], cl[bottom], slope, alpha_zero_lift, cm0)
+
+
+def pack_library(sections: Iterable[Section]) -> bytes:
+    """
+    Packs sections (on REYNOLDS_GRID x ALPHA_GRID) into the library file
+    format, sorted by name; a later section replaces an earlier one of the
+    same name. Raises ValueError for names that do not fit the index and
+    for rows of the wrong size.
+    """
+    by_name: Dict[str, Section] = {}
+    size = len(REYNOLDS_GRID) * len(ALPHA_GRID) * 3
+    for section in sections:
+        encoded = section.name.encode('ascii', 'replace')
+        if not encoded or len(encoded) > NAME_BYTES:
+            raise ValueError(f"Airfoil name {section.name!r} must be 1 to {NAME_BYTES} characters")
+        if len(section.polars) != size:
+            raise ValueError(f"Airfoil {section.name!r} has {len(section.polars)} values, expected {size}")
+        by_name[normalize_name(section.name)] = section
+    ordered = [by_name[key] for key in sorted(by_name)]
+
+    names = b"".join(s.name.encode('ascii', 'replace').ljust(NAME_BYTES, b'\0') for s in ordered)
+    summaries, polars = array('f'), array('f')
+    n_alpha = len(ALPHA_GRID)
+    for section in ordered:
+        for r in range(len(REYNOLDS_GRID)):
+            rows = section.polars[r * n_alpha * 3:(r + 1) * n_alpha * 3]
+            summaries.extend(summarize_polar(ALPHA_GRID, rows[0::3], rows[1::3], rows[2::3]))
+        polars.extend(section.polars)
+    if sys.byteorder != 'little':
+        summaries.byteswap()
+        polars.byteswap()
+    return b"".join([
+        HEADER.pack(MAGIC, FORMAT_VERSION, len(ordered), len(REYNOLDS_GRID), n_alpha),
+        struct.pack(f'<{len(REYNOLDS_GRID)}d', *REYNOLDS_GRID),
+        struct.pack(f'<{n_alpha}d', *ALPHA_GRID),
+        names, summaries.tobytes(), polars.tobytes(),
+    ])
+
+
+def write_library(path: str, sections: Iterable[Section]):
+    """Writes a library file atomically (readers never see a partial file)."""
+    data = pack_library(sections)
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try: os.remove(tmp_path)
+        except OSError: pass
+        raise
+
+
+def naca4_thin_airfoil(camber: float, position: float, points: int = 400) -> Tuple[float, float]:
+    """
+    Returns the zero-lift angle (radians) and quarter-chord pitching moment
+    of a NACA 4-digit mean line (camber and position as fractions of the
+    chord) from thin-airfoil theory, integrating the Glauert coefficients
+    numerically.
+    """
+    if camber <= 0 or not 0 < position < 1:
+        return 0.0, 0.0
+    alpha_zero_lift = a1 = a2 = 0.0
+    step = math.pi / points
+    for k in range(points):
+        theta = (k + 0.5) * step
+        x = (1 - math.cos(theta)) / 2
+        slope = 2 * camber * (position - x) / (position ** 2 if x < position else (1 - position) ** 2)
+        alpha_zero_lift -= slope * (math.cos(theta) - 1) * step / math.pi
+        a1 += 2 / math.pi * slope * math.cos(theta) * step
+        a2 += 2 / math.pi * slope * math.cos(2 * theta) * step
+    return alpha_zero_lift, math.pi / 4 * (a2 - a1)
+
+
+def _stall(linear_cl: float, limit: float) -> Tuple[float, float]:
+    """
+    Rounds a linear lift coefficient (of the sign of `limit`) off into
+    stall: linear up to 70% of the limit, then a parabola that reaches the
+    limit with zero slope, then a fall-off. Returns the lift coefficient
+    and how far past the stall the linear lift is (0 before the stall).
+    """
+    sign = 1.0 if limit > 0 else -1.0
+    x, limit = linear_cl * sign, limit * sign
+    knee = 0.7 * limit
+    if x <= knee:
+        return x * sign, 0.0
+    end = knee + 2 * (limit - knee)
+    if x <= end:
+        return (x - (x - knee) ** 2 / (4 * (limit - knee))) * sign, 0.0
+    beyond = x - end
+    return max(limit - 0.5 * beyond, 0.6 * limit) * sign, beyond
+
+
+def naca4_section(camber_pct: int, position_tenths: int, thickness_pct: int) -> Section:
+    """
+    Generates the polars of a NACA 4-digit section on the library grid.
+    Thin-airfoil theory gives the zero-lift angle and pitching moment; the
+    lift slope grows with thickness, maximum lift follows an empirical
+    thickness and camber fit scaled by (Re / 6e6)^0.1, and profile drag is
+    a mixed laminar/turbulent skin friction with a thickness form factor,
+    plus a drag bucket and separation drag near and past the stall.
+    """
+    m, p, t = camber_pct / 100, position_tenths / 10, thickness_pct / 100
+    name = f"NACA {camber_pct}{position_tenths}{thickness_pct:02d}" if camber_pct else f"NACA 00{thickness_pct:02d}"
+    alpha_zero_lift, cm_ac = naca4_thin_airfoil(m, p)
+    lift_slope = 2 * math.pi * (1 + 0.77 * t) * 0.93 # Per radian, with a viscous reduction
+    base_cl_max = 1.6 - 60 * (t - 0.14) ** 2
+    form_factor = 1 + 2 * t + 60 * t ** 4
+    cl_ideal = -0.5 * lift_slope * alpha_zero_lift
+    polars = array('f')
+    for reynolds in REYNOLDS_GRID:
+        re_factor = (reynolds / 6e6) ** 0.1
+        cl_max = (base_cl_max + 8 * m) * re_factor
+        cl_min = -(base_cl_max - 4 * m) * 0.9 * re_factor
+        skin_friction = 0.0095 / reynolds ** 0.1 + 25 / reynolds ** 0.8
+        cd_min = 2 * skin_friction * form_factor * (1 + 2 * m)
+        for alpha in ALPHA_GRID:
+            linear_cl = lift_slope * (math.radians(alpha) - alpha_zero_lift)
+            cl, beyond = _stall(linear_cl, cl_max if linear_cl >= 0 else cl_min)
+            limit = abs(cl_max if linear_cl >= 0 else cl_min)
+            onset = max(abs(linear_cl) - 0.7 * limit, 0.0) / (0.6 * limit) # 0 to 1 across the rounding
+            cd = cd_min + 0.0075 * (cl - cl_ideal) ** 2 + 0.01 * min(onset, 1.0) ** 2 + 0.15 * beyond
+            cm = cm_ac - 0.1 * beyond * (1 if linear_cl >= 0 else -1)
+            polars.extend((cl, cd, cm))
+    return Section(name, polars)
+
+
+def generate_naca4_sections() -> List[Section]:
+    """Generates the NACA 4-digit family of the default library."""
+    sections = [naca4_section(0, 0, t) for t in NACA_THICKNESSES]
+    sections.extend(naca4_section(m, p, t) for m in NACA_CAMBERS for p in NACA_POSITIONS for t in NACA_THICKNESSES)
+    return sections
+
+
+# --- XFOIL polar import ---
+
+_XFOIL_NAME = re.compile(r'Calculated polar for:\s*(.+?)\s*$', re.MULTILINE)
+_XFOIL_REYNOLDS = re.compile(r'Re\s*=\s*([\d.]+)\s*e\s*([+-]?\d+)')
+
+
+def read_xfoil_polar(path: str) -> Tuple[str, float, List[Tuple[float, float, float, float]]]:
+    """
+    Reads an XFOIL polar file ("PACC" output). Returns the airfoil name,
+    the Reynolds number and the (alpha, Cl, Cd, Cm) rows in order of
+    angle. Raises ValueError if the file is not an XFOIL polar.
+    """
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        text = f.read()
+    name, reynolds = _XFOIL_NAME.search(text), _XFOIL_REYNOLDS.search(text)
+    if not name or not reynolds:
+        raise ValueError(f"{path}: not an XFOIL polar file (no airfoil name or Reynolds number)")
+    lines = text.splitlines()
+    header = next((i for i, line in enumerate(lines) if line.split()[:2] == ['alpha', 'CL']), None)
+    if header is None:
+        raise ValueError(f"{path}: no 'alpha CL CD ... CM' table")
+    columns = lines[header].split()
+    try:
+        cl_col, cd_col, cm_col = columns.index('CL'), columns.index('CD'), columns.index('CM')
+    except ValueError:
+        raise ValueError(f"{path}: the polar table has no CL, CD or CM column") from None
+    rows = []
+    for line in lines[header + 1:]:
+        values = line.split()
+        try:
+            rows.append((float(values[0]), float(values[cl_col]), float(values[cd_col]), float(values[cm_col])))
+        except (ValueError, IndexError):
+            continue # Separator line
+    if len(rows) < 2:
+        raise ValueError(f"{path}: fewer than two polar points")
+    rows.sort()
+    return name.group(1), float(reynolds.group(1)) * 10 ** int(reynolds.group(2)), rows
+
+
+def sections_from_polars(polars: Iterable[Tuple[str, float, List[Tuple[float, float, float, float]]]]) -> List[Section]:
+    """
+    Resamples polars (as returned by read_xfoil_polar, any number per
+    airfoil) onto the library grid: linearly in angle and in log(Re)
+    between the measured Reynolds numbers. Outside the measured ranges the
+    nearest measured values are used.
+    """
+    by_name: Dict[str, Tuple[str, Dict[float, list]]] = {}
+    for name, reynolds, rows in polars:
+        by_name.setdefault(normalize_name(name), (name, {}))[1][reynolds] = rows
+    sections = []
+    for name, measured in by_name.values():
+        measured_re = sorted(measured)
+        log_re = [math.log(r) for r in measured_re]
+        # Every measured polar resampled at the grid angles: (Cl, Cd, Cm) lists
+        resampled = []
+        for r in measured_re:
+            rows = measured[r]
+            alphas = [row[0] for row in rows]
+            resampled.append([[_interpolate(a, alphas, [row[c] for row in rows]) for a in ALPHA_GRID] for c in (1, 2, 3)])
+        polars_out = array('f')
+        for reynolds in REYNOLDS_GRID:
+            for j in range(len(ALPHA_GRID)):
+                for c in range(3):
+                    polars_out.append(_interpolate(math.log(reynolds), log_re, [polar[c][j] for polar in resampled]))
+        sections.append(Section(name, polars_out))
+    return sections
+
+
+# --- The shared library ---
+
+_library: Optional[AirfoilLibrary] = None
+_library_lock = threading.Lock()
+
+
+def open_library(path: str) -> AirfoilLibrary:
+    """Memory-maps a library file. Raises OSError and ValueError for unreadable files."""
+    with open(path, 'rb') as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        return AirfoilLibrary(buffer, path)
+    except (ValueError, struct.error):
+        buffer.close()
+        raise
+
+
+def get_library(path: Optional[str] = None) -> AirfoilLibrary:
+    """
+    Returns the shared library, opening it on first use. A missing or
+    outdated library file is (re)generated first; if it cannot be written,
+    the generated library is kept in memory for this process.
+    """
+    global _library
+    path = path or DEFAULT_LIBRARY_PATH
+    with _library_lock:
+        if _library is not None and _library.path == path:
+            return _library
+        try:
+            library = open_library(path)
+        except (OSError, ValueError, struct.error):
+            sections = generate_naca4_sections()
+            try:
+                write_library(path, sections)
+                library = open_library(path)
+            except OSError:
+                library = AirfoilLibrary(pack_library(sections), path)
+        if _library is not None:
+            _library.close()
+        _library = library
+        return library
+
+
+def reset_library():
+    """Closes the shared library, so the next get_library() opens the file again (e.g. after an import)."""
+    global _library
+    with _library_lock:
+        if _library is not None:
+            _library.close()
+        _library = None
+
+
+def library_stamp(path: Optional[str] = None) -> str:
+    """Identifies the current contents of a library file by size and modification time ('' if missing)."""
+    try:
+        info = os.stat(path or DEFAULT_LIBRARY_PATH)
+    except OSError:
+        return ''
+    return f"{info.st_size}:{info.st_mtime_ns}"
+
+
+def add_parser(subparsers):
+    """Registers the 'airfoils' command with the ALULA command line parser."""
+    parser = subparsers.add_parser('airfoils', help="List, show or extend the airfoil polar library",
+                                   description="Lists the sections of the airfoil polar library, shows one section's summary "
+                                               "and polar at a Reynolds number, or adds XFOIL polar files to the library.")
+    parser.add_argument('airfoil', nargs='?', help="Section to show, e.g. 'NACA 2412' (default: list all sections)")
+    parser.add_argument('--re', type=float, default=1e6, help="Reynolds number of the section shown (default: 1e6)")
+    parser.add_argument('--import', dest='imports', nargs='+', metavar='POLAR',
+                        help="XFOIL polar files (or glob patterns) to add to the library, one airfoil and Reynolds number each")
+    parser.add_argument('--rebuild', action='store_true', help="Regenerate the library (drops imported sections)")
+    parser.add_argument('--library', default=DEFAULT_LIBRARY_PATH, help=f"Library file (default: {DEFAULT_LIBRARY_PATH})")
+    parser.set_defaults(func=run_command)
+
+
+def run_command(args) -> int:
+    """Runs the 'airfoils' command from parsed command line arguments."""
+    try:
+        if args.rebuild:
+            reset_library()
+            write_library(args.library, generate_naca4_sections())
+        if args.imports:
+            files = [path for pattern in args.imports for path in (sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern])]
+            imported = sections_from_polars(read_xfoil_polar(path) for path in files)
+            library = get_library(args.library)
+            sections = [library.section(name) for name in library.names] + imported
+            reset_library()
+            write_library(args.library, sections)
+            print(f"Added {len(imported)} airfoils from {len(files)} polar files to {args.library}")
+        library = get_library(args.library)
+        if not args.airfoil:
+            if not args.imports:
+                print("\n".join(library.names))
+                print(f"{len(library)} airfoils in {args.library}")
+            return 0
+        summary = library.summary(args.airfoil, args.re)
+        polar = library.polar(args.airfoil, args.re)
+    except (OSError, ValueError) as e:
+        print(f"airfoils: {e}", file=sys.stderr)
+        return 2
+
+    print(f"{library.names[library.find(args.airfoil)]} at Re {args.re:,.0f}")
+    print(f"  Cl_max {summary.cl_max:.3f} at {summary.alpha_cl_max:.1f} deg, Cd_min {summary.cd_min:.5f} at Cl {summary.cl_cd_min:.2f}")
+    print(f"  Lift slope {summary.cl_alpha:.4f} /deg, zero-lift angle {summary.alpha_zero_lift:.2f} deg, Cm0 {summary.cm0:.4f}")
+    print(f"{'alpha':>8}{'Cl':>9}{'Cd':>10}{'Cm':>9}")
+    for row in zip(*polar):
+        print(f"{row[0]:8.1f}{row[1]:9.4f}{row[2]:10.5f}{row[3]:9.4f}")
+    return 0
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""
+ALULA altitude performance.
+
+Evaluates a design across a whole altitude vector in one pass: the
+densities of every altitude come from the standard atmosphere table
+(`alula_atmosphere`, with the design's ISA temperature offset) and go
+through the batch kernels in `alula_vector` as one array, giving VH, rate
+of climb and stall speed (true airspeed) curves. Ceilings are then found
+on those curves: the grid interval where the climb rate (or, for Lighter
+Than Air, the net lift) crosses its threshold is refined by root-solving
+the kernel at single altitudes, instead of re-running the full calculation
+per altitude.
+
+    Fixed Wing         service ceiling (100 fpm) and absolute ceiling (0 fpm)
+    Helicopter         hover ceiling (out of ground effect)
+    Lighter Than Air   static ceiling (net lift 0)
+
+Requires NumPy. Command line usage (see `python ALULA.py altitude --help`):
+
+    python ALULA.py altitude design.json --temp-offset 20 --top 18000
+"""
+
+import csv
+import json
+import sys
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import alula_atmosphere
+import alula_engine
+import alula_vector
+from alula_vector import np
+
+DEFAULT_TOP_FT = 30000.0
+GRID_STEP_FT = 250.0
+SERVICE_CEILING_FPM = 100.0
+CEILING_TOL_FT = 1.0
+# Curves of the result, in column order
+CURVE_KEYS = ("Altitude", "Density Altitude", "Density Ratio", "Stall Speed (TAS)", "VH", "ROC", "Net Lift")
+
+
+def altitude_grid(top_ft: float = DEFAULT_TOP_FT, step_ft: float = GRID_STEP_FT, bottom_ft: float = 0.0) -> "np.ndarray":
+    """Returns the altitudes from `bottom_ft` to `top_ft` (both included) in steps of `step_ft`."""
+    if step_ft <= 0 or top_ft <= bottom_ft:
+        raise ValueError("The altitude step must be positive and the top above the bottom")
+    count = int(np.floor((top_ft - bottom_ft) / step_ft + 1e-9)) + 1
+    grid = bottom_ft + step_ft * np.arange(count)
+    return grid if grid[-1] >= top_ft else np.append(grid, top_ft)
+
+
+def _climb_rate(result: Dict[str, "np.ndarray"], gross_weight: float) -> Optional["np.ndarray"]:
+    """Signed rate of climb (fpm) from a kernel's excess power, or None if it has none."""
+    if "Excess Power" not in result or gross_weight <= 0:
+        return None
+    return np.nan_to_num(result["Excess Power"] * 550 / gross_weight * 60, nan=-np.inf)
+
+
+def find_ceiling(altitudes: "np.ndarray", values: "np.ndarray", threshold: float,
+                 evaluate: Callable[[float], float], tol: float = CEILING_TOL_FT) -> Optional[float]:
+    """
+    Returns the lowest altitude where a curve (e.g. the climb rate) falls to
+    `threshold`: the first grid interval where it crosses is located on the
+    sampled curve and the crossing refined with the engine's root solver
+    applied to `evaluate(altitude)`. Returns None if the curve is below the
+    threshold already at the first altitude, or never reaches it.
+    """
+    below = np.nonzero(values < threshold)[0]
+    if len(below) == 0 or below[0] == 0:
+        return None
+    i = int(below[0])
+    if values[i - 1] == threshold:
+        return float(altitudes[i - 1])
+    result = alula_engine.solve_root(lambda h: evaluate(h) - threshold, float(altitudes[i - 1]), float(altitudes[i]), tol)
+    return result.root
+
+
+def altitude_performance(record: Dict[str, Any], altitudes: Optional[Sequence[float]] = None,
+                         temp_offset_c: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Evaluates a design record over an altitude vector (default: sea level
+    to DEFAULT_TOP_FT every GRID_STEP_FT) on a day `temp_offset_c` degrees
+    off ISA (default: the design's 'isa_temp_offset_c'). Returns a dictionary
+    with the vehicle type, the temperature offset, the field elevation, the
+    curves named in CURVE_KEYS that apply to the vehicle type (lists, one
+    value per altitude; climb rates may be negative) and a 'ceilings'
+    dictionary (altitude in ft, or None if not reached in the range).
+    """
+    alula_vector._require_numpy()
+    inputs = alula_engine.normalize_inputs(record.get('main_inputs'))
+    v_type = inputs['vehicle_type']
+    if temp_offset_c is None:
+        temp_offset_c = alula_engine.get_input_value(inputs, 'isa_temp_offset_c')
+    altitudes = altitude_grid() if altitudes is None else np.asarray(altitudes, dtype=np.float64)
+    calc = alula_engine.evaluate_design(record) # Weights and CG (standard sea level run)
+    gross_weight = calc["Gross Weight"]
+
+    def kernel(alts) -> Dict[str, "np.ndarray"]:
+        sigma = np.asarray(alula_atmosphere.density_ratios(alts, temp_offset_c))
+        result = alula_vector.evaluate_batch(inputs, {}, calc["Empty Weight"], calc["CG Location"],
+                                             rho=alula_engine.RHO_SEA_LEVEL_SLUG * sigma)
+        result["Density Ratio"] = sigma
+        return result
+
+    # One vectorized pass over every altitude
+    result = kernel(altitudes)
+    sigma = result["Density Ratio"]
+    curves: Dict[str, "np.ndarray"] = {
+        "Altitude": altitudes,
+        "Density Altitude": np.array([alula_atmosphere.density_altitude(s) for s in sigma]),
+        "Density Ratio": sigma,
+        "VH": result["VH"],
+    }
+    if "Stall Speed" in result:
+        curves["Stall Speed (TAS)"] = result["Stall Speed"]
+    climb = _climb_rate(result, gross_weight)
+    if climb is not None:
+        curves["ROC"] = climb
+    if "Net Lift" in result:
+        curves["Net Lift"] = result["Net Lift"]
+
+    # Ceilings from the curves, refined with the kernel at single altitudes
+    ceilings: Dict[str, Optional[float]] = {}
+    if climb is not None:
+        climb_at = lambda h: float(_climb_rate(kernel(np.array([h])), gross_weight)[0])
+        if v_type == 'Helicopter':
+            ceilings["Hover Ceiling"] = find_ceiling(altitudes, climb, 0.0, climb_at)
+        else:
+            ceilings["Service Ceiling"] = find_ceiling(altitudes, climb, SERVICE_CEILING_FPM, climb_at)
+            ceilings["Absolute Ceiling"] = find_ceiling(altitudes, climb, 0.0, climb_at)
+    if "Net Lift" in curves:
+        ceilings["Static Ceiling"] = find_ceiling(altitudes, curves["Net Lift"], 0.0,
+                                                  lambda h: float(kernel(np.array([h]))["Net Lift"][0]))
+
+    return {
+        'vehicle_type': v_type,
+        'temp_offset_c': temp_offset_c,
+        'field_elevation_ft': alula_engine.get_input_value(inputs, 'field_elevation_ft'),
+        'curves': {key: [float(v) for v in curves[key]] for key in CURVE_KEYS if key in curves},
+        'ceilings': ceilings,
+    }
+
+
+def format_performance(performance: Dict[str, Any], every_ft: float = 2000.0) -> List[str]:
+    """
+    Formats altitude performance as report lines for the console or the GUI:
+    the ceilings, then a table of the curves every `every_ft` feet.
+    """
+    lines = [f"{performance['vehicle_type']}, ISA {performance['temp_offset_c']:+g} °C"]
+    for name, altitude in performance['ceilings'].items():
+        lines.append(f"  {name}: " + (f"{altitude:,.0f} ft" if altitude is not None else "outside the altitude range"))
+    curves = performance['curves']
+    keys = [key for key in CURVE_KEYS if key in curves and key != "Density Ratio"]
+    lines.append("  ".join(f"{key:>17}" for key in keys))
+    next_altitude = None
+    for i, altitude in enumerate(curves["Altitude"]):
+        if next_altitude is not None and altitude < next_altitude and i < len(curves["Altitude"]) - 1:
+            continue
+        lines.append("  ".join(f"{curves[key][i]:>17,.1f}" for key in keys))
+        next_altitude = altitude + every_ft
+    return lines
+
+
+def write_curves(performance: Dict[str, Any], output, fmt: str):
+    """Writes altitude performance to an open text file as JSON, or the curves as a CSV table."""
+    if fmt == 'json':
+        json.dump(performance, output, indent=2, ensure_ascii=False)
+        output.write("\n")
+        return
+    curves = performance['curves']
+    writer = csv.writer(output)
+    writer.writerow(list(curves))
+    writer.writerows(zip(*curves.values()))
+
+
+def add_parser(subparsers):
+    """Registers the 'altitude' command with the ALULA command line parser."""
+    parser = subparsers.add_parser('altitude', help="Altitude performance curves and ceilings of a design",
+                                   description="Evaluates a design over an altitude range in the standard atmosphere (with a "
+                                               "temperature offset) and reports VH, rate of climb and stall speed (TAS) curves "
+                                               "and the service, absolute, hover or static ceiling. Requires NumPy.")
+    parser.add_argument('design', help="Design JSON file (as written by 'Save Design...')")
+    parser.add_argument('--temp-offset', type=float, help="Temperature offset from ISA in °C (default: the design's)")
+    parser.add_argument('--top', type=float, default=DEFAULT_TOP_FT, help=f"Highest altitude in ft (default: {DEFAULT_TOP_FT:g})")
+    parser.add_argument('--step', type=float, default=GRID_STEP_FT, help=f"Altitude step of the curves in ft (default: {GRID_STEP_FT:g})")
+    parser.add_argument('--every', type=float, default=2000.0, help="Altitude step of the printed table in ft (default: 2000)")
+    parser.add_argument('-o', '--output', help="Also write the curves to this file (.csv, otherwise JSON)")
+    parser.set_defaults(func=run_command)
+
+
+def run_command(args) -> int:
+    """Runs the 'altitude' command from parsed command line arguments."""
+    try:
+        alula_vector._require_numpy()
+        design = alula_engine.load_design_file(args.design)
+        performance = altitude_performance(design, altitude_grid(args.top, args.step), args.temp_offset)
+    except (ImportError, IOError, json.JSONDecodeError, ValueError, KeyError, TypeError, ZeroDivisionError, OverflowError) as e:
+        print(f"altitude: {e.args[0] if isinstance(e, KeyError) else e}", file=sys.stderr)
+        return 2
+
+    print("\n".join(format_performance(performance, args.every)))
+    if args.output:
+        with open(args.output, 'w', encoding="utf-8", newline='') as f:
+            write_curves(performance, f, 'csv' if args.output.endswith('.csv') else 'json')
+        print(f"Curves written to {args.output}")
+    return 0
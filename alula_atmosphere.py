@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""
+ALULA standard atmosphere.
+
+International Standard Atmosphere (ISA) in English units, with an optional
+temperature offset from standard (e.g. +20 °C for a hot day). Pressure
+depends only on altitude; the temperature offset changes the density.
+
+The pressure ratio, the costly part, is precomputed once at import on a
+fixed altitude grid; lookups interpolate its logarithm linearly, which is
+exact in the isothermal stratosphere and within a few parts per million
+elsewhere. The temperature is piecewise linear and computed directly.
+`density_ratios` looks up a whole altitude vector at once with NumPy when
+it is installed:
+
+    sigma = alula_atmosphere.density_ratio(5000, temp_offset_c=15)
+    rho = alula_engine.RHO_SEA_LEVEL_SLUG * sigma
+    alula_atmosphere.density_altitude(sigma) # about 6,700 ft
+"""
+
+import bisect
+import math
+from typing import List, Sequence, Tuple
+
+T0_RANKINE = 518.67 # Sea level standard temperature (°R, i.e. 15 °C)
+LAPSE_RATE_R_PER_FT = 0.00356616 # Troposphere temperature lapse rate (°R/ft)
+TROPOPAUSE_FT = 36089.24 # Altitude above which the temperature is constant
+PRESSURE_EXPONENT = 5.25588 # g / (R * lapse rate) for dry air
+STRATOSPHERE_SCALE_FT = 20805.8 # R * T / g in the isothermal stratosphere (ft)
+
+# Altitude grid of the precomputed table (ft); the field elevation and
+# altitude sweeps are clamped to this range
+TABLE_MIN_FT = -2000.0
+TABLE_MAX_FT = 60000.0
+TABLE_STEP_FT = 250.0
+
+
+def standard_temperature_ratio(altitude_ft: float) -> float:
+    """Returns the ISA temperature ratio T/T0 at a pressure altitude (exact, no table)."""
+    h = min(altitude_ft, TROPOPAUSE_FT)
+    return (T0_RANKINE - LAPSE_RATE_R_PER_FT * h) / T0_RANKINE
+
+
+def standard_pressure_ratio(altitude_ft: float) -> float:
+    """Returns the ISA pressure ratio p/p0 at a pressure altitude (exact, no table)."""
+    delta = standard_temperature_ratio(min(altitude_ft, TROPOPAUSE_FT)) ** PRESSURE_EXPONENT
+    if altitude_ft > TROPOPAUSE_FT:
+        delta *= math.exp(-(altitude_ft - TROPOPAUSE_FT) / STRATOSPHERE_SCALE_FT)
+    return delta
+
+
+def _build_table() -> Tuple[List[float], List[float], List[float]]:
+    """
+    Tabulates altitude and ln(pressure ratio) on the grid, plus the
+    standard-day density ratio used to invert densities.
+    """
+    count = int(round((TABLE_MAX_FT - TABLE_MIN_FT) / TABLE_STEP_FT)) + 1
+    altitudes = [TABLE_MIN_FT + i * TABLE_STEP_FT for i in range(count)]
+    log_delta = [math.log(standard_pressure_ratio(h)) for h in altitudes]
+    sigma = [math.exp(ld) / standard_temperature_ratio(h) for h, ld in zip(altitudes, log_delta)]
+    return altitudes, log_delta, sigma
+
+
+_ALTITUDES, _LOG_DELTA, _SIGMA = _build_table()
+# Standard-day density ratio (and its logarithm) in ascending order, for density_altitude
+_SIGMA_ASCENDING = _SIGMA[::-1]
+_LOG_SIGMA_ASCENDING = [math.log(sigma) for sigma in _SIGMA_ASCENDING]
+
+
+def _clamp(altitude_ft: float) -> float:
+    """Limits an altitude to the range of the table."""
+    return min(max(altitude_ft, TABLE_MIN_FT), TABLE_MAX_FT)
+
+
+def _log_pressure_ratio(altitude_ft: float) -> float:
+    """Interpolates ln(pressure ratio) in the table."""
+    position = (altitude_ft - TABLE_MIN_FT) / TABLE_STEP_FT
+    i = min(int(position), len(_ALTITUDES) - 2)
+    return _LOG_DELTA[i] + (_LOG_DELTA[i + 1] - _LOG_DELTA[i]) * (position - i)
+
+
+def temperature_offset_ratio(temp_offset_c: float) -> float:
+    """Converts a temperature offset from ISA (°C) into a change of the temperature ratio."""
+    return temp_offset_c * 1.8 / T0_RANKINE
+
+
+def density_ratio(altitude_ft: float, temp_offset_c: float = 0.0) -> float:
+    """
+    Returns the density ratio sigma = rho/rho0 at a pressure altitude on a
+    day `temp_offset_c` degrees warmer (or, if negative, colder) than ISA.
+    Exactly 1.0 at sea level on a standard day.
+    """
+    h = _clamp(altitude_ft)
+    return math.exp(_log_pressure_ratio(h)) / (standard_temperature_ratio(h) + temperature_offset_ratio(temp_offset_c))
+
+
+def density_ratios(altitudes_ft: Sequence[float], temp_offset_c: float = 0.0):
+    """
+    Returns the density ratio at every altitude of a vector: a NumPy array
+    if NumPy is installed (one interpolation pass over the table), else a list.
+    NumPy is imported here rather than with the module, since the scalar
+    engine imports this module and should not pay for loading NumPy.
+    """
+    try:
+        import numpy as np
+    except ImportError: # NumPy is optional; fall back to scalar lookups
+        return [density_ratio(h, temp_offset_c) for h in altitudes_ft]
+    h = np.clip(np.asarray(altitudes_ft, dtype=np.float64), TABLE_MIN_FT, TABLE_MAX_FT)
+    theta = (T0_RANKINE - LAPSE_RATE_R_PER_FT * np.minimum(h, TROPOPAUSE_FT)) / T0_RANKINE
+    return np.exp(np.interp(h, _ALTITUDES, _LOG_DELTA)) / (theta + temperature_offset_ratio(temp_offset_c))
+
+
+def density_altitude(sigma: float) -> float:
+    """
+    Returns the density altitude (ft): the standard-day altitude with the
+    given density ratio, interpolated in the table (in the logarithm of the
+    density ratio) and clamped to its range.
+    """
+    i = bisect.bisect_left(_SIGMA_ASCENDING, sigma)
+    if i <= 0:
+        return TABLE_MAX_FT
+    if i >= len(_SIGMA_ASCENDING):
+        return TABLE_MIN_FT
+    lo, hi = _LOG_SIGMA_ASCENDING[i - 1], _LOG_SIGMA_ASCENDING[i]
+    j = len(_ALTITUDES) - 1 - i # Table index of `hi`
+    return _ALTITUDES[j] + (hi - math.log(sigma)) / (hi - lo) * TABLE_STEP_FT
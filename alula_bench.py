@@ -0,0 +1,373 @@
+# -*- coding: utf-8 -*-
+"""
+ALULA benchmark suite.
+
+Times the vehicle calculation functions over a fixed, seeded corpus of
+designs, and the canvas redraw functions against a virtual canvas that
+records items instead of drawing them (so no display is needed). Results
+are JSON with per-case medians and percentiles; a stored result can be
+used as a baseline to flag regressions.
+
+Command line usage (see `python ALULA.py bench --help`):
+
+    python ALULA.py bench -o baseline.json
+    python ALULA.py bench --baseline baseline.json   # exits with 1 on a regression
+"""
+
+import fnmatch
+import gc
+import json
+import math
+import platform
+import random
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import alula_cache
+import alula_engine
+
+BENCH_FORMAT_VERSION = 1
+CORPUS_SEED = 103
+DEFAULT_ROUNDS = 30
+DEFAULT_PER_TYPE = 25
+DEFAULT_THRESHOLD_PCT = 10.0
+PERCENTILES = (10, 50, 90, 99)
+
+# Calculation functions benchmarked, with the vehicle type whose designs they run on
+CALC_CASES: List[Tuple[str, str]] = [
+    ('calculate_fixed_wing', 'Fixed Wing'),
+    ('calculate_glider', 'Glider'),
+    ('calculate_paraglider', 'Paraglider'),
+    ('calculate_helicopter', 'Helicopter'),
+    ('calculate_gyrocopter', 'Gyrocopter'),
+    ('calculate_lta', 'Lighter Than Air'),
+]
+# Canvas sizes used for the redraw cases, close to the GUI's default window layout
+VIRTUAL_CANVAS_SIZES = {'cg': (180, 560), 'pie': (280, 150), 'envelope': (660, 350)}
+
+
+def benchmark_corpus(per_type: int = DEFAULT_PER_TYPE, seed: int = CORPUS_SEED) -> List[Dict[str, Any]]:
+    """
+    Builds the fixed benchmark corpus: `per_type` designs per vehicle type,
+    each the default design with every numeric input and component weight
+    scaled by a seeded random factor between 0.7 and 1.3.
+    """
+    rng = random.Random(seed)
+    corpus = []
+    for v_type in alula_engine.VEHICLE_TYPES:
+        for _ in range(per_type):
+            inputs = dict(alula_engine.DEFAULT_INPUTS, vehicle_type=v_type)
+            for key, value in inputs.items():
+                if isinstance(value, str):
+                    try:
+                        inputs[key] = f"{float(value) * rng.uniform(0.7, 1.3):.4g}"
+                    except ValueError:
+                        pass # Choice inputs keep their defaults
+            components = alula_engine.default_components(v_type)
+            for comp in components:
+                if comp['weight']:
+                    comp['weight'] = f"{float(comp['weight']) * rng.uniform(0.7, 1.3):.4g}"
+            corpus.append(alula_engine.design_record(inputs, components))
+    return corpus
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Linearly interpolated percentile of an already sorted, non-empty sequence."""
+    position = (len(sorted_values) - 1) * pct / 100
+    lower = math.floor(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def summarize(samples_us: List[float], calls_per_sample: int) -> Dict[str, Any]:
+    """Reduces per-call timings (microseconds) to the statistics stored for a case."""
+    ordered = sorted(samples_us)
+    stats: Dict[str, Any] = {'unit': 'us', 'samples': len(ordered), 'calls_per_sample': calls_per_sample,
+                             'mean': sum(ordered) / len(ordered), 'min': ordered[0], 'max': ordered[-1]}
+    for pct in PERCENTILES:
+        stats['median' if pct == 50 else f'p{pct}'] = percentile(ordered, pct)
+    return stats
+
+
+def time_case(run_round: Callable[[], int], rounds: int) -> Dict[str, Any]:
+    """
+    Times `rounds` calls of `run_round`, which performs a batch of calls and
+    returns how many it made. Each round gives one sample: the mean time per
+    call in microseconds. One untimed round warms up caches first, and the
+    garbage collector is paused while timing, as in `timeit`.
+    """
+    calls = run_round() # Warm-up
+    samples = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(rounds):
+            start = time.perf_counter_ns()
+            calls = run_round()
+            samples.append((time.perf_counter_ns() - start) / 1000 / max(calls, 1))
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return summarize(samples, calls)
+
+
+def calc_cases(corpus: List[Dict[str, Any]]) -> Dict[str, Callable[[], int]]:
+    """
+    Returns the calculation benchmark cases: one per vehicle calculation
+    function over the corpus designs of its type (with weight & balance
+    already summed, as `evaluate_inputs` does), plus the full
+    `evaluate_design` pipeline over the whole corpus.
+    """
+    cases: Dict[str, Callable[[], int]] = {}
+    for func_name, v_type in CALC_CASES:
+        calc_function = getattr(alula_engine, func_name)
+        prepared = []
+        for record in corpus:
+            inputs = alula_engine.normalize_inputs(record['main_inputs'])
+            if inputs['vehicle_type'] != v_type:
+                continue
+            base = alula_engine.evaluate_inputs(inputs, record['component_weights'])
+            base = {key: base[key] for key in ("Empty Weight", "Gross Weight", "Fuel Weight", "Power System Weight", "CG Location", "Pilot Weight")}
+            prepared.append((inputs, base))
+
+        def run_round(calc_function=calc_function, prepared=prepared) -> int:
+            for inputs, base in prepared:
+                calc_function(inputs, dict(base))
+            return len(prepared)
+        cases[f"calc.{func_name}"] = run_round
+
+    def run_pipeline() -> int:
+        for record in corpus:
+            alula_engine.evaluate_design(record)
+        return len(corpus)
+    cases["calc.evaluate_design"] = run_pipeline
+    return cases
+
+
+class VirtualCanvas:
+    """
+    Stand-in for tk.Canvas that keeps items in a dictionary instead of
+    drawing them. Supports the calls the ALULA views make, so redraw code
+    can be timed without a display. Rendering cost inside Tk itself is not
+    included.
+    """
+
+    def __init__(self, width: int, height: int):
+        self.width, self.height = width, height
+        self.items: Dict[int, list] = {}
+        self._next_id = 1
+
+    def winfo_width(self) -> int: return self.width
+    def winfo_height(self) -> int: return self.height
+
+    def _create(self, kind: str, *coords, **options) -> int:
+        item = self._next_id
+        self._next_id += 1
+        self.items[item] = [kind, coords, options]
+        return item
+
+    def __getattr__(self, name: str):
+        if name.startswith('create_'):
+            return lambda *coords, **options: self._create(name[len('create_'):], *coords, **options)
+        raise AttributeError(name)
+
+    def _find(self, tag_or_id) -> List[int]:
+        if isinstance(tag_or_id, int):
+            return [tag_or_id] if tag_or_id in self.items else []
+        if tag_or_id == 'all':
+            return list(self.items)
+        def tags(options):
+            value = options.get('tags', ())
+            return value.split() if isinstance(value, str) else value
+        return [item for item, (_, _, options) in self.items.items() if tag_or_id in tags(options)]
+
+    def delete(self, *tags):
+        for tag in tags:
+            for item in self._find(tag):
+                del self.items[item]
+
+    def coords(self, item, *coords):
+        self.items[item][1] = coords
+
+    def itemconfig(self, tag_or_id, **options):
+        for item in self._find(tag_or_id):
+            self.items[item][2].update(options)
+
+    def tag_lower(self, item, below=None):
+        pass # Stacking order does not affect timing
+
+
+class _VirtualVar:
+    """Minimal tk variable holding a value."""
+    def __init__(self, value=None): self.value = value
+    def get(self): return self.value
+    def set(self, value): self.value = value
+
+
+class _VirtualWidget:
+    """Accepts (and ignores) widget configuration calls."""
+    def config(self, **options): pass
+    configure = config
+
+
+class _VirtualStyle:
+    """Answers the style lookups made by the views."""
+    def lookup(self, style, option): return '#FF5757'
+
+
+def virtual_view_host():
+    """
+    Builds an ALULA window object without a Tk root: only the state read by
+    the canvas views is set up, with virtual canvases in place of Tk ones.
+    Returns None if tkinter is not available in this Python.
+    """
+    try:
+        import ALULA
+    except ImportError:
+        return None
+    app = ALULA.AlulaApp.__new__(ALULA.AlulaApp)
+    app.data = {'inputs': {key: _VirtualVar(value) for key, value in alula_engine.DEFAULT_INPUTS.items()}, 'calculations': {}}
+    app.canvas_items = {}
+    app.curve_cache = OrderedDict()
+    app.CURVE_CACHE_SIZE = 32
+    app.cg_canvas = VirtualCanvas(*VIRTUAL_CANVAS_SIZES['cg'])
+    app.pie_canvas = VirtualCanvas(*VIRTUAL_CANVAS_SIZES['pie'])
+    app.flight_envelope_canvas = VirtualCanvas(*VIRTUAL_CANVAS_SIZES['envelope'])
+    app.cg_label = _VirtualWidget()
+    app.style = _VirtualStyle()
+    return app
+
+
+def redraw_cases(corpus: List[Dict[str, Any]]) -> Dict[str, Callable[[], int]]:
+    """
+    Returns the redraw benchmark cases. Each round loads every corpus design
+    into the virtual view host and redraws one view. The plain cases update
+    the retained items; the '.rebuild' cases drop them first, which is what
+    a resize costs.
+    """
+    app = virtual_view_host()
+    if app is None:
+        return {}
+    designs = [(record['main_inputs'], alula_engine.evaluate_design(record)) for record in corpus]
+    views = {'cg_canvas': app.update_cg_canvas, 'pie_chart': app.update_pie_chart, 'flight_envelope': app.update_flight_envelope}
+
+    cases: Dict[str, Callable[[], int]] = {}
+    for name, update_view in views.items():
+        for rebuild in (False, True):
+            def run_round(update_view=update_view, rebuild=rebuild) -> int:
+                for inputs, calc in designs:
+                    app.data['inputs']['vehicle_type'].set(inputs['vehicle_type'])
+                    app.data['inputs']['fuselage_length'].set(inputs['fuselage_length'])
+                    app.data['calculations'] = calc
+                    if rebuild:
+                        app.canvas_items.clear()
+                        app.curve_cache.clear()
+                    update_view()
+                return len(designs)
+            cases[f"redraw.{name}{'.rebuild' if rebuild else ''}"] = run_round
+    return cases
+
+
+def run_benchmarks(rounds: int = DEFAULT_ROUNDS, per_type: int = DEFAULT_PER_TYPE, only: Optional[Sequence[str]] = None,
+                   progress: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+    """
+    Runs the benchmark cases (optionally only those matching the glob
+    patterns in `only`) and returns the JSON-ready results.
+    """
+    corpus = benchmark_corpus(per_type)
+    cases = {**calc_cases(corpus), **redraw_cases(corpus)}
+    if only:
+        cases = {name: case for name, case in cases.items() if any(fnmatch.fnmatch(name, pattern) for pattern in only)}
+    results: Dict[str, Any] = {}
+    for name, case in cases.items():
+        if progress is not None:
+            progress(name)
+        results[name] = time_case(case, rounds)
+    return {
+        'format': BENCH_FORMAT_VERSION,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'engine': alula_cache.engine_fingerprint(),
+        'corpus': {'seed': CORPUS_SEED, 'per_type': per_type, 'designs': len(corpus)},
+        'rounds': rounds,
+        'cases': results,
+    }
+
+
+def compare_results(results: Dict[str, Any], baseline: Dict[str, Any], threshold_pct: float = DEFAULT_THRESHOLD_PCT) -> Dict[str, Dict[str, Any]]:
+    """
+    Compares the medians of each case present in both results. A case is a
+    regression if its median is more than `threshold_pct` percent slower
+    than the baseline's, and an improvement if it is as much faster.
+    """
+    comparison = {}
+    for name, stats in results['cases'].items():
+        base = baseline.get('cases', {}).get(name)
+        if not base or base.get('median', 0) <= 0:
+            continue
+        change_pct = (stats['median'] / base['median'] - 1) * 100
+        status = 'regression' if change_pct > threshold_pct else 'improvement' if change_pct < -threshold_pct else 'ok'
+        comparison[name] = {'baseline': base['median'], 'current': stats['median'], 'change_pct': change_pct, 'status': status}
+    return comparison
+
+
+def add_parser(subparsers):
+    """Registers the 'bench' command with the ALULA command line parser."""
+    parser = subparsers.add_parser('bench', help="Time the calculations and redraws on a fixed design corpus",
+                                   description="Times each vehicle calculation function and the canvas redraws (against a virtual "
+                                               "canvas) over a fixed corpus of designs and reports per-case medians and "
+                                               "percentiles as JSON. With --baseline, flags cases that got slower.")
+    parser.add_argument('-o', '--output', help="Write the results JSON to this file (default: stdout)")
+    parser.add_argument('--baseline', help="Results JSON of an earlier run to compare against")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD_PCT,
+                        help=f"Slowdown of the median, in percent, that counts as a regression (default: {DEFAULT_THRESHOLD_PCT:g})")
+    parser.add_argument('--rounds', type=int, default=DEFAULT_ROUNDS, help=f"Timed rounds per case (default: {DEFAULT_ROUNDS})")
+    parser.add_argument('--per-type', type=int, default=DEFAULT_PER_TYPE, help=f"Corpus designs per vehicle type (default: {DEFAULT_PER_TYPE})")
+    parser.add_argument('--only', action='append', metavar='PATTERN', help="Run only cases matching this glob, e.g. 'calc.*'. Repeatable.")
+    parser.set_defaults(func=run_command)
+
+
+def run_command(args) -> int:
+    """Runs the 'bench' command from parsed command line arguments."""
+    baseline = None
+    try:
+        if args.rounds < 1 or args.per_type < 1:
+            raise ValueError("--rounds and --per-type must be positive")
+        if args.baseline:
+            with open(args.baseline, 'r', encoding="utf-8") as f:
+                baseline = json.load(f)
+    except (IOError, json.JSONDecodeError, ValueError) as e:
+        print(f"bench: {e}", file=sys.stderr)
+        return 2
+
+    results = run_benchmarks(args.rounds, args.per_type, args.only, progress=lambda name: print(f"  {name}...", file=sys.stderr))
+    if not results['cases']:
+        print("bench: no benchmark cases selected", file=sys.stderr)
+        return 2
+    comparison = compare_results(results, baseline, args.threshold) if baseline else {}
+    if comparison:
+        results['comparison'] = {'baseline_created': baseline.get('created'), 'threshold_pct': args.threshold, 'cases': comparison}
+
+    print(f"{'Case':<34}{'median us':>12}{'p90 us':>12}" + (f"{'baseline':>12}{'change':>10}" if comparison else ""), file=sys.stderr)
+    for name, stats in results['cases'].items():
+        line = f"{name:<34}{stats['median']:>12.2f}{stats['p90']:>12.2f}"
+        if name in comparison:
+            entry = comparison[name]
+            flag = "  REGRESSION" if entry['status'] == 'regression' else ""
+            line += f"{entry['baseline']:>12.2f}{entry['change_pct']:>+9.1f}%{flag}"
+        print(line, file=sys.stderr)
+
+    text = json.dumps(results, indent=4)
+    if args.output:
+        with open(args.output, 'w', encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    regressions = [name for name, entry in comparison.items() if entry['status'] == 'regression']
+    if regressions:
+        print(f"{len(regressions)} case(s) slower than the baseline by more than {args.threshold:g}%: {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
@@ -0,0 +1,277 @@
+# -*- coding: utf-8 -*-
+"""
+ALULA result cache.
+
+Caches calculation results keyed by a canonical hash of a design's parsed
+inputs and component table, so that flipping between vehicle types,
+reloading a design or re-running a sweep never pays for the same solve
+twice. There are two tiers:
+
+  * an in-memory LRU tier, bounded by number of entries (used by the GUI), and
+  * an optional on-disk content-addressed tier, bounded by total size, that
+    batch commands running in separate processes can share across runs.
+
+Keys include a fingerprint of the engine source (and of the airfoil polar
+library), so results computed by an older version of the calculations are
+never reused.
+
+    cache = alula_cache.ResultCache(directory=".alula_cache")
+    calc = cache.evaluate(alula_engine.load_design_file("my_design.json"))
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import alula_airfoils
+import alula_atmosphere
+import alula_engine
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_DISK_BYTES = 64 * 1024 * 1024
+
+_engine_fingerprint: Optional[str] = None
+
+
+def engine_fingerprint() -> str:
+    """
+    Returns a hash of the calculation engine's source (and of the standard
+    atmosphere and airfoil library it uses), computed once per process.
+    Cache keys include it so that results from an older engine, or from a
+    since rebuilt polar library, are not served after the calculations change.
+    """
+    global _engine_fingerprint
+    if _engine_fingerprint is None:
+        try:
+            digest = hashlib.sha256()
+            for module in (alula_engine, alula_atmosphere, alula_airfoils):
+                with open(module.__file__, 'rb') as f:
+                    digest.update(f.read())
+            digest.update(alula_airfoils.library_stamp().encode())
+            _engine_fingerprint = digest.hexdigest()[:16]
+        except (OSError, TypeError):
+            _engine_fingerprint = 'unknown'
+    return _engine_fingerprint
+
+
+def _canonical_value(value: Any) -> Any:
+    """Parses numeric strings to floats so that '150', '150.0' and 150 hash alike."""
+    if isinstance(value, bool):
+        return value
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return str(value).strip()
+
+
+def canonical_inputs(main_inputs: Dict[str, Any] | None) -> Dict[str, Any]:
+    """Returns every design input (defaults filled in) parsed the way the engine reads it."""
+    inputs = alula_engine.normalize_inputs(main_inputs)
+    canonical = {}
+    for key, default in alula_engine.DEFAULT_INPUTS.items():
+        if isinstance(default, bool):
+            canonical[key] = alula_engine.get_input_flag(inputs, key)
+        else:
+            canonical[key] = _canonical_value(inputs[key])
+    return canonical
+
+
+def canonical_design(record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Returns the canonical form of a design record used for cache keys: every
+    input parsed the way the engine reads it, and the component table as
+    ordered [name, weight, arm, category] rows.
+    """
+    inputs = canonical_inputs(record.get('main_inputs'))
+    components = record.get('component_weights')
+    if components is None:
+        components = alula_engine.default_components(inputs['vehicle_type'])
+    rows: List[List[Any]] = [[str(c.get('name', '')), _canonical_value(c.get('weight')), _canonical_value(c.get('arm')),
+                              alula_engine.component_category(c)] for c in components]
+    return {'main_inputs': inputs, 'component_weights': rows}
+
+
+def design_key(record: Dict[str, Any], tol: float = alula_engine.VH_TOLERANCE_FPS) -> str:
+    """
+    Returns the content address of a design: a SHA-256 hash of its canonical
+    form, the solver tolerance and the engine fingerprint.
+    """
+    payload = json.dumps([engine_fingerprint(), tol, canonical_design(record)], sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def totals_key(main_inputs: Dict[str, Any], totals: Dict[str, Tuple[float, float]], tol: float = alula_engine.VH_TOLERANCE_FPS) -> str:
+    """
+    Returns the content address of a design given by its inputs and the
+    (weight, moment) totals of each component category instead of its
+    component table. Cheaper to compute than design_key for long tables.
+    """
+    payload = json.dumps([engine_fingerprint(), tol, canonical_inputs(main_inputs), 'totals', totals],
+                         sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ResultCache:
+    """
+    Two-tier cache of calculations dictionaries. The memory tier keeps the
+    `max_entries` most recently used results; when `directory` is given,
+    results are also stored there as one JSON file per key and the least
+    recently used files are removed once the tier exceeds `max_disk_bytes`.
+    Cached results are copied on the way in and out, so callers may modify
+    what they get back.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, directory: Optional[str] = None,
+                 max_disk_bytes: int = DEFAULT_MAX_DISK_BYTES):
+        self.max_entries = max(0, max_entries)
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._disk_bytes: Optional[int] = None # Computed on first write
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_evictions = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the hit/miss/eviction counters and the current memory tier size."""
+        return {
+            'hits': self.hits, 'disk_hits': self.disk_hits, 'misses': self.misses,
+            'evictions': self.evictions, 'disk_evictions': self.disk_evictions, 'entries': len(self._memory),
+        }
+
+    def clear(self):
+        """Empties the memory tier (the disk tier is left for other processes)."""
+        self._memory.clear()
+
+    def _path(self, key: str) -> str:
+        """Location of a key in the disk tier, fanned out by its first two hex digits."""
+        return os.path.join(self.directory, key[:2], key + '.json')
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Looks a key up in the memory tier, then the disk tier, promoting disk
+        hits into memory. Returns a copy of the result or None on a miss.
+        """
+        calc = self._memory.get(key)
+        if calc is not None:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return dict(calc)
+        if self.directory:
+            path = self._path(key)
+            try:
+                with open(path, 'r', encoding="utf-8") as f:
+                    calc = json.load(f)
+                os.utime(path) # Mark as recently used for eviction
+            except (OSError, ValueError):
+                calc = None
+            if isinstance(calc, dict):
+                self.disk_hits += 1
+                self._remember(key, calc)
+                return dict(calc)
+        self.misses += 1
+        return None
+
+    def put(self, key: str, calc: Dict[str, Any]):
+        """Stores a result in the memory tier and, if configured, the disk tier."""
+        self._remember(key, dict(calc))
+        if self.directory:
+            self._write_disk(key, calc)
+
+    def evaluate(self, record: Dict[str, Any], tol: float = alula_engine.VH_TOLERANCE_FPS) -> Dict[str, Any]:
+        """
+        Drop-in replacement for `alula_engine.evaluate_design` that returns
+        the cached result when the same design has been evaluated before.
+        """
+        key = design_key(record, tol)
+        calc = self.get(key)
+        if calc is None:
+            calc = alula_engine.evaluate_design(record, tol)
+            self.put(key, calc)
+        return calc
+
+    def evaluate_totals(self, main_inputs: Dict[str, Any], totals: Dict[str, Tuple[float, float]],
+                        tol: float = alula_engine.VH_TOLERANCE_FPS) -> Dict[str, Any]:
+        """
+        Cached version of `alula_engine.evaluate_weights` for a design given
+        by its inputs and the (weight, moment) totals of each component
+        category.
+        """
+        key = totals_key(main_inputs, totals, tol)
+        calc = self.get(key)
+        if calc is None:
+            calc = alula_engine.evaluate_weights(alula_engine.normalize_inputs(main_inputs), totals, tol=tol)
+            self.put(key, calc)
+        return calc
+
+    def _remember(self, key: str, calc: Dict[str, Any]):
+        """Adds an entry to the memory tier, evicting the least recently used ones."""
+        if self.max_entries == 0:
+            return
+        self._memory[key] = calc
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def _write_disk(self, key: str, calc: Dict[str, Any]):
+        """
+        Writes an entry to the disk tier atomically (temporary file plus
+        rename), so concurrent readers never see a partial file.
+        """
+        path = self._path(key)
+        if os.path.exists(path):
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding="utf-8") as f:
+                json.dump(calc, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            try: os.remove(tmp_path)
+            except OSError: pass
+            return
+        if self._disk_bytes is None:
+            self._disk_bytes = sum(size for _, size, _ in self._disk_entries())
+        else:
+            self._disk_bytes += os.path.getsize(path)
+        if self._disk_bytes > self.max_disk_bytes:
+            self._evict_disk()
+
+    def _disk_entries(self) -> List[tuple]:
+        """Lists (path, size, last use time) for every file in the disk tier."""
+        entries = []
+        for dirpath, _, filenames in os.walk(self.directory):
+            for name in filenames:
+                if name.endswith('.json'):
+                    path = os.path.join(dirpath, name)
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue # Removed by another process
+                    entries.append((path, st.st_size, st.st_mtime))
+        return entries
+
+    def _evict_disk(self):
+        """Removes the least recently used files until the disk tier is at 3/4 of its budget."""
+        entries = sorted(self._disk_entries(), key=lambda e: e[2])
+        total = sum(size for _, size, _ in entries)
+        target = self.max_disk_bytes * 3 // 4
+        for path, size, _ in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                self.disk_evictions += 1
+            except OSError:
+                pass
+            total -= size
+        self._disk_bytes = total
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+ALULA command line interface.
+
+Dispatches the batch commands available as `python ALULA.py <command> ...`.
+Running ALULA.py without a command starts the GUI instead. Each command lives
+in its own module, which registers its arguments through `add_parser`.
+"""
+
+import argparse
+import importlib
+import sys
+from typing import List, Optional, Sequence
+
+# Command name -> module providing it; each exposes add_parser(subparsers).
+# Only the module of the command being run is imported, so quick commands do
+# not pay for the imports of the others (e.g. NumPy for 'montecarlo').
+COMMANDS = {
+    'sweep': 'alula_sweep',
+    'optimize': 'alula_optimize',
+    'montecarlo': 'alula_montecarlo',
+    'bench': 'alula_bench',
+    'report': 'alula_report',
+    'stream': 'alula_stream',
+    'altitude': 'alula_altitude',
+    'airfoils': 'alula_airfoils',
+    'compare': 'alula_compare',
+    'history': 'alula_history',
+}
+
+
+def build_parser(commands: Optional[Sequence[str]] = None) -> argparse.ArgumentParser:
+    """
+    Creates the argument parser with a sub-command for each of `commands`
+    (default: every batch command), importing their modules.
+    """
+    parser = argparse.ArgumentParser(prog="ALULA.py", description="ALULA - Accessible Learning Ultralight Layout Assistant (batch commands). "
+                                                                  "Run without arguments to start the GUI.")
+    subparsers = parser.add_subparsers(dest='command', metavar='command')
+    subparsers.required = True
+    for name in commands or COMMANDS:
+        importlib.import_module(COMMANDS[name]).add_parser(subparsers)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Parses the command line and runs the selected command, returning its exit code."""
+    argv = sys.argv[1:] if argv is None else list(argv)
+    command = argv[0] if argv and argv[0] in COMMANDS else None # Anything else (e.g. --help) needs every command
+    args = build_parser([command] if command else None).parse_args(argv)
+    return args.func(args)
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""
+ALULA vehicle type comparison.
+
+Evaluates one mission (the pilot, the field and every other shared input
+of a design) in each vehicle type, so that the types can be compared side
+by side for the same pilot weight. Each type is evaluated with its own
+component table: the design's table for its own type, the table saved for
+that type under VEHICLE_COMPONENTS_KEY ("Save Design..." writes the tables
+of the other types the user has edited), or else the type's default table.
+With several workers the types are evaluated concurrently in a process pool.
+
+    entries = alula_compare.compare_design(alula_engine.load_design_file("my_design.json"), workers=6)
+    print("\\n".join(alula_compare.format_comparison(entries)))
+
+Command line usage (see `python ALULA.py compare --help`):
+
+    python ALULA.py compare my_design.json -o comparison.csv
+"""
+
+import csv
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import alula_engine
+import alula_report
+
+# Key of a saved design holding the component tables of its other vehicle types
+VEHICLE_COMPONENTS_KEY = 'vehicle_components'
+
+# Rows of the comparison table: label, result keys (the first one present is shown) and unit
+COMPARISON_ROWS: Tuple[Tuple[str, Tuple[str, ...], str], ...] = (
+    ("Empty Weight", ("Empty Weight",), "lbs"),
+    ("Gross Weight", ("Gross Weight",), "lbs"),
+    ("Stall / Min. Speed", ("Stall Speed", "Min. Fwd Speed"), "knots"),
+    ("Max Level Speed (VH)", ("VH",), "knots"),
+    ("Rate of Climb", ("ROC",), "fpm"),
+    ("L/D Max", ("L/D Max",), ":1"),
+    ("Min Sink Rate", ("Min Sink Rate",), "fpm"),
+    ("Wing / Disc Loading", ("Wing Loading", "Disc Loading"), "lbs/sqft"),
+    ("Power Loading", ("Power Loading",), "lbs/HP"),
+    ("Net Lift", ("Net Lift",), "lbs"),
+)
+PART_103_ROW = "Part 103"
+
+
+def vehicle_components(record: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Returns the component tables a design record holds for other vehicle
+    types, keyed by type. Raises ValueError if they are malformed.
+    """
+    tables = record.get(VEHICLE_COMPONENTS_KEY) or {}
+    if not isinstance(tables, dict) or not all(
+            isinstance(rows, list) and all(isinstance(row, dict) for row in rows) for rows in tables.values()):
+        raise ValueError(f"'{VEHICLE_COMPONENTS_KEY}' must map vehicle types to lists of JSON objects")
+    return tables
+
+
+def mission_record(record: Dict[str, Any], vehicle_type: str) -> Dict[str, Any]:
+    """
+    Returns a design record flying the mission of `record` as `vehicle_type`:
+    the same inputs with the vehicle type replaced, and that type's component
+    table (see the module documentation).
+    """
+    main_inputs = alula_engine.normalize_inputs(record.get('main_inputs'))
+    if vehicle_type == main_inputs['vehicle_type'] and record.get('component_weights') is not None:
+        components = record['component_weights']
+    else:
+        components = vehicle_components(record).get(vehicle_type) or alula_engine.default_components(vehicle_type)
+    main_inputs['vehicle_type'] = vehicle_type
+    return alula_engine.design_record(main_inputs, components)
+
+
+def compare_design(record: Dict[str, Any], vehicle_types: Sequence[str] = alula_engine.VEHICLE_TYPES,
+                   workers: int = 1) -> List[Dict[str, Any]]:
+    """
+    Evaluates a design's mission in each of `vehicle_types` and returns one
+    report entry per type, in order (see alula_report.evaluate_record): its
+    Part 103 compliance per limit, feedback and calculations, or an 'error'.
+    With more than one worker the types are evaluated in a process pool.
+    """
+    records = [mission_record(record, vehicle_type) for vehicle_type in vehicle_types]
+    if workers <= 1 or len(records) <= 1:
+        return [alula_report.evaluate_record(mission) for mission in records]
+    with ProcessPoolExecutor(max_workers=min(workers, len(records))) as pool:
+        return list(pool.map(alula_report.evaluate_record, records))
+
+
+def comparison_entry(vehicle_type: str, calc: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Builds the comparison entry of one vehicle type from results evaluated
+    elsewhere (e.g. through the GUI's result cache), as compare_design does.
+    """
+    compliance = alula_engine.part103_compliance(vehicle_type, calc)
+    return {'vehicle_type': vehicle_type, 'compliant': all(check['passed'] for check in compliance.values()),
+            'compliance': compliance, 'calculations': calc}
+
+
+def result_value(calc: Dict[str, Any], keys: Sequence[str]) -> Optional[float]:
+    """Returns the first of `keys` found among the results as a number, or None."""
+    for key in keys:
+        value = calc.get(key)
+        if isinstance(value, (int, float)):
+            return value
+    return None
+
+
+def part103_status(entry: Dict[str, Any]) -> str:
+    """Summarizes a comparison entry's Part 103 status in a few words."""
+    if 'error' in entry:
+        return "Error"
+    failed = [name for name, check in entry['compliance'].items() if not check['passed']]
+    return "Compliant" if not failed else "Exceeds " + ", ".join(failed)
+
+
+def comparison_rows(entries: Sequence[Dict[str, Any]]) -> List[Tuple[str, List[str]]]:
+    """
+    Returns the comparison table as (row label, one cell per entry) pairs:
+    the Part 103 status first, then COMPARISON_ROWS (blank where a result
+    does not apply to a vehicle type).
+    """
+    rows = [(PART_103_ROW, [part103_status(entry) for entry in entries])]
+    for label, keys, unit in COMPARISON_ROWS:
+        cells = []
+        for entry in entries:
+            value = result_value(entry.get('calculations') or {}, keys)
+            cells.append("" if value is None else f"{value:,.1f} {unit}".rstrip())
+        rows.append((label, cells))
+    return rows
+
+
+def format_comparison(entries: Sequence[Dict[str, Any]]) -> List[str]:
+    """Formats the comparison table as report lines for the console, one column per vehicle type."""
+    rows = comparison_rows(entries)
+    label_width = max(len(label) for label, _ in rows)
+    widths = [max(len(entry['vehicle_type']), *(len(cells[i]) for _, cells in rows)) for i, entry in enumerate(entries)]
+    lines = [" " * label_width + "".join(f"  {entry['vehicle_type']:>{width}}" for entry, width in zip(entries, widths))]
+    for label, cells in rows:
+        lines.append(f"{label:<{label_width}}" + "".join(f"  {cell:>{width}}" for cell, width in zip(cells, widths)))
+    for entry in entries:
+        if 'error' in entry:
+            lines.append(f"{entry['vehicle_type']}: {entry['error']}")
+    return lines
+
+
+def write_comparison(entries: Sequence[Dict[str, Any]], output, fmt: str):
+    """Writes comparison entries to an open text file as JSON, or the comparison table as CSV."""
+    if fmt == 'json':
+        json.dump(list(entries), output, indent=2, ensure_ascii=False)
+        output.write("\n")
+        return
+    writer = csv.writer(output)
+    writer.writerow([""] + [entry['vehicle_type'] for entry in entries])
+    writer.writerows([label] + cells for label, cells in comparison_rows(entries))
+
+
+def add_parser(subparsers):
+    """Registers the 'compare' command with the ALULA command line parser."""
+    parser = subparsers.add_parser('compare', help="Compare a design's mission across vehicle types",
+                                   description="Evaluates the mission of a design (pilot, field and shared inputs) in every "
+                                               "vehicle type, each with its own component table, and prints a comparison "
+                                               "table with the Part 103 status of each type.")
+    parser.add_argument('design', help="Design JSON file (as written by 'Save Design...')")
+    parser.add_argument('--types', nargs='+', choices=alula_engine.VEHICLE_TYPES, metavar='TYPE',
+                        help="Vehicle types to compare (default: all)")
+    parser.add_argument('-j', '--workers', type=int, default=1,
+                        help="Worker processes (default: 1, evaluate in the calling process; starting a pool "
+                             "costs more than it saves for the few types of one design)")
+    parser.add_argument('-o', '--output', help="Also write the comparison to this file (.csv, otherwise JSON)")
+    parser.set_defaults(func=run_command)
+
+
+def run_command(args) -> int:
+    """Runs the 'compare' command from parsed command line arguments."""
+    try:
+        design = alula_engine.load_design_file(args.design)
+        if not isinstance(design, dict):
+            raise ValueError("Not a design record (expected a JSON object)")
+        entries = compare_design(design, args.types or alula_engine.VEHICLE_TYPES, args.workers)
+    except (IOError, json.JSONDecodeError, ValueError) as e:
+        print(f"compare: {e}", file=sys.stderr)
+        return 2
+
+    print("\n".join(format_comparison(entries)))
+    if args.output:
+        with open(args.output, 'w', encoding="utf-8", newline='') as f:
+            write_comparison(entries, f, 'csv' if args.output.endswith('.csv') else 'json')
+        print(f"Comparison written to {args.output}")
+    return 0
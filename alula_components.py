@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+"""
+ALULA component table.
+
+Holds the weight & balance component list of a design in compact parallel
+arrays (names, weights, arms, categories) instead of one set of Tk
+variables per row, so tables of hundreds of parts cost little memory and
+can be shown in a virtualized view. A per-category index of weight and
+moment totals (structure, power, fuel, systems) is kept up to date
+incrementally as rows are edited, added or removed, so a recalculation
+never has to re-sum the table:
+
+    table = alula_components.ComponentTable(record['component_weights'])
+    table.set_field(3, 'weight', '48')
+    calc = alula_engine.evaluate_weights(inputs, table.totals())
+
+Bills of materials with thousands of parts can be imported from CSV or JSON
+files with `read_bom`.
+"""
+
+import csv
+import json
+import math
+import os
+from array import array
+from fractions import Fraction
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import alula_engine
+
+FIELDS = ('name', 'weight', 'arm', 'category')
+
+# Accepted bill-of-materials column names (lower case) for each field
+BOM_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    'name': ('name', 'component', 'part', 'part name', 'description'),
+    'weight': ('weight', 'weight (lbs)', 'weight_lbs', 'unit weight', 'unit weight (lbs)'),
+    'arm': ('arm', 'arm (ft)', 'arm_ft', 'arm (ft from datum)', 'station'),
+    'category': ('category', 'group'),
+    'quantity': ('quantity', 'qty', 'count'),
+}
+# Accepted spellings of the component categories in a bill of materials
+CATEGORY_ALIASES: Dict[str, str] = {
+    'structural': 'structure', 'airframe': 'structure',
+    'power system': 'power', 'powerplant': 'power', 'propulsion': 'power',
+    'fuel system': 'fuel',
+    'system': 'systems', 'equipment': 'systems',
+}
+
+
+def parse_number(value: Any) -> float:
+    """Parses a weight or arm entry; anything that is not a finite number becomes NaN."""
+    try:
+        number = float(value)
+    except (ValueError, TypeError):
+        return math.nan
+    return number if math.isfinite(number) else math.nan
+
+
+def format_number(value: float) -> str:
+    """Formats a stored weight or arm for display and saving ('' for an invalid entry)."""
+    if math.isnan(value):
+        return ""
+    return str(int(value)) if value.is_integer() and abs(value) < 1e15 else repr(value)
+
+
+class ComponentTable:
+    """
+    A component list of any length stored as parallel arrays. Rows whose
+    weight or arm is not a number are kept (so they can be fixed) but, as in
+    `alula_engine.category_totals`, do not count towards the totals. The
+    running weight and moment of each category are kept as exact fractions,
+    so any sequence of edits yields the same totals as summing the final
+    table from scratch.
+    """
+
+    def __init__(self, components: Optional[Iterable[Dict[str, Any]]] = None):
+        self.names: List[str] = []
+        self.weights = array('d')
+        self.arms = array('d')
+        self.categories = array('B') # Index into alula_engine.COMPONENT_CATEGORIES
+        self._reset_totals()
+        if components is not None:
+            self.load(components)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def load(self, components: Iterable[Dict[str, Any]]):
+        """Replaces the table with rows in the 'component_weights' format."""
+        self.names, self.weights, self.arms, self.categories = [], array('d'), array('d'), array('B')
+        self._reset_totals()
+        for entry in components:
+            self.append(entry.get('name', ''), entry.get('weight'), entry.get('arm'), alula_engine.component_category(entry))
+
+    def _reset_totals(self):
+        """Zeroes the per-category index of weight and moment totals."""
+        self._weights = [Fraction(0)] * len(alula_engine.COMPONENT_CATEGORIES)
+        self._moments = [Fraction(0)] * len(alula_engine.COMPONENT_CATEGORIES)
+
+    def _account(self, index: int, sign: int):
+        """Adds (sign=1) or removes (sign=-1) a row's contribution to its category's totals."""
+        w, a = self.weights[index], self.arms[index]
+        if math.isnan(w) or math.isnan(a):
+            return
+        weight = Fraction(w) * sign
+        category = self.categories[index]
+        self._weights[category] += weight
+        self._moments[category] += weight * Fraction(a)
+
+    def append(self, name: str, weight: Any, arm: Any, category: Optional[str] = None) -> int:
+        """
+        Adds a row at the end and returns its index. Without a category the
+        row is classified by name, as for rows of older saved designs.
+        """
+        if category not in alula_engine.COMPONENT_CATEGORIES:
+            category = alula_engine.component_category({'name': name})
+        self.names.append(str(name))
+        self.weights.append(parse_number(weight))
+        self.arms.append(parse_number(arm))
+        self.categories.append(alula_engine.COMPONENT_CATEGORIES.index(category))
+        self._account(len(self.names) - 1, 1)
+        return len(self.names) - 1
+
+    def delete(self, index: int):
+        """Removes a row."""
+        self._account(index, -1)
+        del self.names[index], self.weights[index], self.arms[index], self.categories[index]
+
+    def set_field(self, index: int, field: str, value: Any):
+        """
+        Changes one field of a row ('name', 'weight', 'arm' or 'category'),
+        updating the totals by the row's old and new contributions only.
+        Raises KeyError for an unknown field and ValueError for an unknown
+        category.
+        """
+        if field not in FIELDS:
+            raise KeyError(f"Unknown component field {field!r}")
+        if field == 'category' and value not in alula_engine.COMPONENT_CATEGORIES:
+            raise ValueError(f"Unknown component category {value!r}")
+        self._account(index, -1)
+        if field == 'name':
+            self.names[index] = str(value)
+        elif field == 'weight':
+            self.weights[index] = parse_number(value)
+        elif field == 'arm':
+            self.arms[index] = parse_number(value)
+        else:
+            self.categories[index] = alula_engine.COMPONENT_CATEGORIES.index(value)
+        self._account(index, 1)
+
+    def row(self, index: int) -> Tuple[str, str, str, str]:
+        """Returns a row as display text: (name, weight, arm, category)."""
+        return (self.names[index], format_number(self.weights[index]), format_number(self.arms[index]),
+                alula_engine.COMPONENT_CATEGORIES[self.categories[index]])
+
+    def rows(self) -> List[Tuple[str, str, str, str]]:
+        """Returns every row as display text, in table order."""
+        return [self.row(i) for i in range(len(self.names))]
+
+    def to_records(self) -> List[Dict[str, str]]:
+        """Returns the table in the 'component_weights' format written by "Save Design..."."""
+        return [dict(zip(FIELDS, row)) for row in self.rows()]
+
+    def matches(self, components: Iterable[Dict[str, Any]]) -> bool:
+        """True if the table holds exactly the given rows (compared as parsed values)."""
+        other = ComponentTable(components)
+        return (self.names == other.names and self.categories == other.categories
+                and [format_number(w) for w in self.weights] == [format_number(w) for w in other.weights]
+                and [format_number(a) for a in self.arms] == [format_number(a) for a in other.arms])
+
+    def totals(self) -> Dict[str, Tuple[float, float]]:
+        """Returns the (weight, moment about the datum) of each category, as alula_engine.category_totals does."""
+        return {category: (float(self._weights[i]), float(self._moments[i]))
+                for i, category in enumerate(alula_engine.COMPONENT_CATEGORIES)}
+
+    def empty_weight(self) -> Tuple[float, float]:
+        """Returns the total (weight, moment about the datum) of all categories."""
+        return float(sum(self._weights)), float(sum(self._moments))
+
+
+def _bom_field(row: Dict[str, Any], field: str) -> Any:
+    """Finds a field in a bill-of-materials row under any of its accepted column names."""
+    for column in BOM_COLUMNS[field]:
+        if column in row and row[column] not in (None, ''):
+            return row[column]
+    return None
+
+
+def parse_bom_rows(rows: Iterable[Dict[str, Any]], first_row: int = 1) -> List[Dict[str, Any]]:
+    """
+    Converts bill-of-materials rows (dictionaries keyed by column name, in
+    any letter case) to 'component_weights' rows. A quantity column
+    multiplies the unit weight; a missing category is inferred from the
+    part name. Blank rows (no name and no weight, such as the empty rows of
+    the Paraglider defaults) are skipped, as the weight & balance ignores
+    them. Raises ValueError naming the row (counting from `first_row`) for a
+    missing or non-numeric weight or arm and for an unknown category.
+    """
+    components: List[Dict[str, Any]] = []
+    for number, raw in enumerate(rows, start=first_row):
+        if not isinstance(raw, dict):
+            raise ValueError(f"Row {number}: expected an object with name, weight, arm and category")
+        row = {str(key).strip().lower(): value for key, value in raw.items() if key is not None}
+        name = str(_bom_field(row, 'name') or '').strip()
+        if not name and _bom_field(row, 'weight') is None:
+            continue
+        values = {}
+        for field in ('weight', 'arm', 'quantity'):
+            value = _bom_field(row, field)
+            if value is None and field == 'quantity':
+                value = 1
+            values[field] = parse_number(value)
+            if math.isnan(values[field]):
+                problem = "is missing" if value is None else f"{value!r} is not a number"
+                raise ValueError(f"Row {number} ({name or 'unnamed'}): {field} {problem}")
+        category = _bom_field(row, 'category')
+        if category is None:
+            category = alula_engine.component_category({'name': name})
+        else:
+            category = str(category).strip().lower()
+            category = CATEGORY_ALIASES.get(category, category)
+            if category not in alula_engine.COMPONENT_CATEGORIES:
+                raise ValueError(f"Row {number} ({name or 'unnamed'}): unknown category {_bom_field(row, 'category')!r}; "
+                                 f"expected one of {', '.join(alula_engine.COMPONENT_CATEGORIES)}")
+        components.append({'name': name, 'weight': format_number(values['weight'] * values['quantity']),
+                           'arm': format_number(values['arm']), 'category': category})
+    return components
+
+
+def read_bom(filepath: str) -> List[Dict[str, Any]]:
+    """
+    Reads a bill of materials and returns it as 'component_weights' rows.
+    CSV files need a header row; JSON files hold a list of part objects, or
+    an object with such a list under 'parts' or 'component_weights' (so a
+    saved design works too). Raises OSError and ValueError (with the row at
+    fault) for unreadable files.
+    """
+    if os.path.splitext(filepath)[1].lower() == '.json':
+        with open(filepath, 'r', encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            data = data.get('parts', data.get('component_weights'))
+        if not isinstance(data, list):
+            raise ValueError("Expected a list of parts, or an object with a 'parts' or 'component_weights' list")
+        return parse_bom_rows(data)
+    with open(filepath, 'r', encoding="utf-8-sig", newline='') as f:
+        return parse_bom_rows(csv.DictReader(f), first_row=2) # Row 1 is the header
@@ -0,0 +1,1099 @@
+# -*- coding: utf-8 -*-
+"""
+ALULA calculation engine.
+
+Headless implementation of the weight & balance and performance calculations
+used by the ALULA GUI. Every function in this module works on plain Python
+values in the same shape as the JSON written by "Save Design..." (a
+'main_inputs' dictionary plus a 'component_weights' list), so a design can be
+evaluated without a Tk root, a display, or any third-party packages.
+
+Typical use from a batch job:
+
+    import alula_engine
+    calc = alula_engine.evaluate_design(alula_engine.load_design_file("my_design.json"))
+    print(calc["VH"], calc["Stall Speed"])
+
+The power-required and power-available curves of a powered design are
+computed once per design and cached (`design_power_curve`); VH, Vy and the
+minimum-power speed are all derived from them.
+
+A fixed wing may name an 'airfoil' of the polar library (`alula_airfoils`);
+its maximum lift and profile drag then come from the section data at the
+wing's Reynolds numbers instead of the typed-in coefficients.
+"""
+
+import bisect
+import functools
+import math
+import json
+from array import array
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import alula_atmosphere
+import alula_profile
+
+# --- Application Constants ---
+# Defines key FAA FAR Part 103 limits and standard atmospheric/physical constants
+# used throughout the calculation modules.
+FAR_103_EMPTY_WEIGHT_LBS = 254
+FAR_103_GLIDER_EMPTY_WEIGHT_LBS = 155
+FAR_103_MAX_FUEL_GAL = 5
+FAR_103_MAX_FUEL_LBS = FAR_103_MAX_FUEL_GAL * 6 # Assuming 6 lbs/gallon for aviation fuel
+FAR_103_MAX_SPEED_KNOTS = 55
+FAR_103_STALL_SPEED_KNOTS = 24
+RHO_SEA_LEVEL_SLUG = 0.002377 # Air density at sea level (slugs/cu ft)
+HELIUM_DENSITY_SLUG = 0.000332 # Helium density (slugs/cu ft)
+KNOTS_TO_FPS = 1.68781 # Conversion factor from knots to feet per second
+VH_TOLERANCE_FPS = 0.01 # Default convergence tolerance for max level speed solvers (ft/s)
+ROTORCRAFT_MIN_SPEED_FPS = 15 * KNOTS_TO_FPS # Minimum forward speed for rotorcraft
+POWER_CURVE_POINTS = 64 # Airspeeds sampled per power curve
+POWER_CURVE_CACHE_SIZE = 256 # Power curves kept by design_power_curve
+AIR_VISCOSITY_SLUG_FT_S = 3.737e-7 # Dynamic viscosity of air at the standard sea level temperature (slug/ft/s)
+AIRFOIL_CL_MAX_FACTOR = 0.9 # Wing maximum lift coefficient as a fraction of its section's (3D losses)
+AIRFOIL_CRUISE_SPEED_KNOTS = FAR_103_MAX_SPEED_KNOTS # Speed of the Reynolds number for the section drag
+AIRFOIL_STALL_ITERATIONS = 3 # Passes of the stall speed / Reynolds number fixed point
+
+# Aerodynamic coefficient maps for various configurations
+COCKPIT_DRAG_MAP: Dict[str, float] = {
+    "Open Frame Fuselage": 0.025, "Cockpit with Windshield": 0.015,
+    "Closed Cockpit": 0.008, "Streamlined Glider Type Cockpit": 0.003
+}
+
+TAIL_DRAG_MAP: Dict[str, float] = {
+    "Tailless": 0.0000, "V-Tail": 0.0010, "Conventional": 0.0015,
+    "Cruciform": 0.0018, "T-Tail": 0.0025, "Twin Tail": 0.0030
+}
+
+PARAGLIDER_CLASS_MAP: Dict[str, Dict[str, float]] = {
+    "EN A (Beginner)": {"cl_trim": 1.2, "cl_max": 2.2, "cd0": 0.08, "oswald": 0.4},
+    "EN B (Intermediate)": {"cl_trim": 1.1, "cl_max": 2.0, "cd0": 0.06, "oswald": 0.5},
+    "EN C (Advanced)": {"cl_trim": 1.0, "cl_max": 1.8, "cd0": 0.04, "oswald": 0.6},
+    "EN D (Expert)": {"cl_trim": 0.9, "cl_max": 1.7, "cd0": 0.03, "oswald": 0.7}
+}
+
+VEHICLE_TYPES: List[str] = ["Fixed Wing", "Gyrocopter", "Helicopter", "Lighter Than Air", "Glider", "Paraglider"]
+
+# Default values for every design input, matching the GUI's startup state.
+DEFAULT_INPUTS: Dict[str, Any] = {
+    'vehicle_type': 'Fixed Wing',
+    'tail_style': 'Conventional',
+    'glider_class': 'EN B (Intermediate)',
+    'flaps': True,
+    'cockpit_style': 'Cockpit with Windshield',
+    'pilot_weight': '180',
+    'wing_area': '250',
+    'wing_span': '35',
+    'aspect_ratio': '5.5',
+    'fuselage_length': '17',
+    'lemac_ft': '4.0',
+    'cl_max': '1.5',
+    'cl_max_flaps': '1.9',
+    'cd0': '0.025',
+    'oswald_efficiency': '0.8',
+    'airfoil': '', # Section from the airfoil polar library; empty for the typed-in coefficients
+    'neutral_point_ft': '5.5',
+    'engine_hp': '20',
+    'prop_efficiency': '0.75',
+    'rotor_diameter': '23',
+    'rotor_blade_chord': '0.6',
+    'rotor_rpm': '350',
+    'num_blades': '2',
+    'rotor_blade_cd': '0.012',
+    'envelope_volume': '8000',
+    'field_elevation_ft': '0',
+    'isa_temp_offset_c': '0',
+}
+
+# Results also evaluated at the field's density altitude, and the names they are stored under
+FIELD_RESULT_KEYS: Dict[str, str] = {
+    "Stall Speed": "Field Stall Speed (TAS)", "VH": "Field VH", "ROC": "Field ROC", "Net Lift": "Field Net Lift"
+}
+
+# Inputs shown in the GUI that no calculation reads (used only for drawing)
+DISPLAY_ONLY_INPUTS = frozenset({'fuselage_length'})
+
+# Default component tables (name, weight lbs, arm ft from datum) for the Weights tab
+STANDARD_COMPONENTS: List[Tuple[str, str, str]] = [("Wing", "60", "4.5"), ("Fuselage", "50", "8.5"), ("Empennage", "15", "16"), ("Engine & Mount", "45", "1.0"), ("Landing Gear", "25", "4.0"), ("Fuel System", "5", "1.5"), ("Misc Systems", "15", "6.0")]
+PARAGLIDER_COMPONENTS: List[Tuple[str, str, str]] = [("Canopy", "15", "0"), ("Harness", "10", "0"), ("Reserve", "5", "0"), ("Container", "2", "0"), ("Misc", "3", "0"), ("", "", ""), ("", "", "")]
+
+
+# Component categories; 'power' components make up the power system weight
+COMPONENT_CATEGORIES: Tuple[str, ...] = ('structure', 'power', 'fuel', 'systems')
+# Calculation result holding the empty weight of each component category
+CATEGORY_WEIGHT_KEYS: Dict[str, str] = {
+    'structure': "Structure Weight", 'power': "Power System Weight", 'fuel': "Fuel System Weight", 'systems': "Systems Weight"
+}
+# Categories of the default components (the others are structure)
+DEFAULT_COMPONENT_CATEGORIES: Dict[str, str] = {
+    "Engine & Mount": 'power', "Fuel System": 'fuel', "Misc Systems": 'systems', "Harness": 'systems', "Reserve": 'systems'
+}
+
+
+def component_category(entry: Dict[str, Any]) -> str:
+    """
+    Returns the category of a component table row: its 'category' entry if it
+    has a known one, otherwise 'power' for rows named like an engine and
+    'structure' for everything else (how rows were classified before
+    components had categories).
+    """
+    category = entry.get('category')
+    if category in COMPONENT_CATEGORIES:
+        return category
+    return 'power' if 'engine' in str(entry.get('name', '')).lower() else 'structure'
+
+
+def default_components(vehicle_type: str) -> List[Dict[str, str]]:
+    """
+    Returns the default component weight table for a vehicle type in the
+    'component_weights' record format used by saved designs.
+    """
+    components = PARAGLIDER_COMPONENTS if vehicle_type == 'Paraglider' else STANDARD_COMPONENTS
+    return [{'name': name, 'weight': weight, 'arm': arm, 'category': DEFAULT_COMPONENT_CATEGORIES.get(name, 'structure')}
+            for name, weight, arm in components]
+
+
+def normalize_inputs(main_inputs: Dict[str, Any] | None) -> Dict[str, Any]:
+    """
+    Merges a (possibly partial) 'main_inputs' dictionary over the defaults,
+    mirroring how loading a design into the GUI only overwrites known keys.
+    """
+    inputs = dict(DEFAULT_INPUTS)
+    if main_inputs:
+        for key, value in main_inputs.items():
+            if key in inputs:
+                inputs[key] = value
+    return inputs
+
+
+def get_input_value(inputs: Dict[str, Any], key: str, default: float = 0.0) -> float:
+    """
+    Safely retrieves a float value from an inputs dictionary.
+    Returns a default value if the key is not found or conversion fails.
+    """
+    try: return float(inputs[key])
+    except (ValueError, TypeError, KeyError): return default
+
+
+def get_input_flag(inputs: Dict[str, Any], key: str) -> bool:
+    """
+    Retrieves a boolean input, accepting both real booleans (as saved from a
+    BooleanVar) and their common string spellings.
+    """
+    value = inputs.get(key, False)
+    if isinstance(value, str):
+        return value.strip().lower() in ('1', 'true', 'yes', 'on')
+    return bool(value)
+
+
+def engine_power_ratio(sigma: float) -> float:
+    """
+    Returns the fraction of its sea level power a normally aspirated piston
+    engine develops at density ratio `sigma` (Gagg-Ferrar: sigma - (1 -
+    sigma) / 7.55), exactly 1 at sea level and never negative.
+    """
+    return max(0.0, sigma - (1 - sigma) / 7.55)
+
+
+def field_density_ratio(inputs: Dict[str, Any]) -> float:
+    """
+    Returns the density ratio at the design's field elevation on a day
+    'isa_temp_offset_c' degrees off standard (1.0 for a standard day at
+    sea level).
+    """
+    return alula_atmosphere.density_ratio(get_input_value(inputs, 'field_elevation_ft'), get_input_value(inputs, 'isa_temp_offset_c'))
+
+
+class RootResult(NamedTuple):
+    """
+    Result of a bracketed root solve: the root, whether the solver met its
+    tolerance, and the number of function evaluations after the brackets.
+    """
+    root: float
+    converged: bool
+    iterations: int
+
+
+def solve_root(f: Callable[[float], float], lo: float, hi: float, tol: float = VH_TOLERANCE_FPS, max_iter: int = 100) -> RootResult:
+    """
+    Finds a root of f on [lo, hi] with Brent's method (inverse quadratic
+    interpolation safeguarded by bisection). f(lo) and f(hi) must have
+    opposite signs; a ValueError is raised otherwise. When profiling is
+    enabled, each solve is recorded with its iteration count.
+    """
+    with alula_profile.stage('solve_root') as timer:
+        result = _brent(f, lo, hi, tol, max_iter)
+        timer.add_items(result.iterations)
+    return result
+
+
+def _brent(f: Callable[[float], float], lo: float, hi: float, tol: float, max_iter: int) -> RootResult:
+    """
+    Brent's method iteration behind solve_root.
+    """
+    a, b = lo, hi
+    fa, fb = f(a), f(b)
+    if fa == 0: return RootResult(a, True, 0)
+    if fb == 0: return RootResult(b, True, 0)
+    if (fa > 0) == (fb > 0):
+        raise ValueError(f"Root is not bracketed by [{lo}, {hi}]")
+    c, fc = b, fb
+    d = e = b - a
+    for iteration in range(1, max_iter + 1):
+        if (fb > 0) == (fc > 0):
+            # Keep the root between b and c
+            c, fc = a, fa
+            d = e = b - a
+        if abs(fc) < abs(fb):
+            a, b, c = b, c, b
+            fa, fb, fc = fb, fc, fb
+        tol1 = 2 * 2.2e-16 * abs(b) + 0.5 * tol
+        xm = 0.5 * (c - b)
+        if abs(xm) <= tol1 or fb == 0:
+            return RootResult(b, True, iteration)
+        if abs(e) >= tol1 and abs(fa) > abs(fb):
+            # Attempt inverse quadratic interpolation (secant if only two points)
+            s = fb / fa
+            if a == c:
+                p, q = 2 * xm * s, 1 - s
+            else:
+                q, r = fa / fc, fb / fc
+                p = s * (2 * xm * q * (q - r) - (b - a) * (r - 1))
+                q = (q - 1) * (r - 1) * (s - 1)
+            if p > 0: q = -q
+            p = abs(p)
+            if 2 * p < min(3 * xm * q - abs(tol1 * q), abs(e * q)):
+                e, d = d, p / q # Accept interpolation
+            else:
+                d = e = xm # Fall back to bisection
+        else:
+            d = e = xm # Bounds decreasing too slowly, use bisection
+        a, fa = b, fb
+        b += d if abs(d) > tol1 else math.copysign(tol1, xm)
+        fb = f(b)
+    return RootResult(b, False, max_iter)
+
+
+def category_totals(components: List[Dict[str, Any]]) -> Dict[str, Tuple[float, float]]:
+    """
+    Sums the component table per category into (weight, moment about the
+    datum) pairs, one for every category in COMPONENT_CATEGORIES. Rows with
+    non-numeric weight or arm are ignored.
+    """
+    weights = dict.fromkeys(COMPONENT_CATEGORIES, 0.0)
+    moments = dict.fromkeys(COMPONENT_CATEGORIES, 0.0)
+    for entry in components:
+        try:
+            w, a = float(entry['weight']), float(entry['arm'])
+        except (ValueError, TypeError, KeyError):
+            # Silently ignore invalid entries for calculation purposes
+            continue
+        category = component_category(entry)
+        weights[category] += w
+        moments[category] += w * a
+    return {category: (weights[category], moments[category]) for category in COMPONENT_CATEGORIES}
+
+
+def calculate_weight_and_balance(components: List[Dict[str, Any]]) -> Tuple[float, float, float]:
+    """
+    Sums the component table into total empty weight, total moment and the
+    power system weight (the 'power' category). Rows with non-numeric weight
+    or arm are ignored.
+    """
+    totals = category_totals(components)
+    return sum(w for w, _ in totals.values()), sum(m for _, m in totals.values()), totals['power'][0]
+
+
+class PowerModel(NamedTuple):
+    """
+    Level-flight power model of a powered design:
+    P_req(v) = parasite_coeff * v^3 + profile_power + induced_coeff / v (ft-lbs/sec).
+    For fixed wings these are the two terms of the parabolic drag polar; for
+    helicopters the rotor adds profile power. Gyrocopters have no
+    shaft-driven rotor and Lighter Than Air vehicles no wing, so only the
+    parasite term applies to them.
+    """
+    parasite_coeff: float
+    profile_power: float
+    induced_coeff: float
+    power_avail: float
+
+    def power_required(self, v_fps: float) -> float:
+        """Returns the power required for level flight at v_fps (ft-lbs/sec)."""
+        induced = self.induced_coeff / v_fps if self.induced_coeff > 0 else 0.0
+        return self.parasite_coeff * v_fps**3 + self.profile_power + induced
+
+    def min_power_speed(self) -> float:
+        """Returns the speed of minimum power required (ft/s), 0 if the curve has no interior minimum."""
+        if self.induced_coeff > 0 and self.parasite_coeff > 0:
+            return (self.induced_coeff / (3 * self.parasite_coeff))**0.25
+        return 0.0
+
+    def solve_vh(self, tol: float = VH_TOLERANCE_FPS, v_floor: float = 0.0,
+                 speeds: Sequence[float] = (), power_required: Sequence[float] = ()) -> Tuple[float, str, int]:
+        """
+        Solves for the upper crossing of power required and power available,
+        no slower than `v_floor` (e.g. the stall speed). The crossing is
+        bracketed between the minimum-power speed and the speed at which
+        parasite power alone uses all of the available power; if a sampled
+        curve is given (ascending `speeds` and their `power_required`), the
+        bracket is first narrowed to the samples around the crossing.
+        Returns (vh_fps, status, iterations), where status is "converged",
+        "max iterations" or "no level flight".
+        """
+        excess_power = self.power_avail - self.profile_power
+        if self.parasite_coeff <= 0 or excess_power <= 0:
+            return 0.0, "no level flight", 0
+        v_hi = (excess_power / self.parasite_coeff)**(1/3)
+        if self.induced_coeff <= 0:
+            return v_hi, "converged", 0 # Pure cubic power curve, solved in closed form
+        v_lo = max(v_floor, self.min_power_speed())
+        if v_hi <= v_lo or self.power_required(v_lo) > self.power_avail:
+            return 0.0, "no level flight", 0
+        if speeds:
+            # Above the minimum-power speed the sampled curve only rises, so the
+            # first sample past the crossing is found by bisection
+            first = bisect.bisect_right(speeds, v_lo)
+            crossing = bisect.bisect_right(power_required, self.power_avail, first)
+            if crossing > first:
+                v_lo = speeds[crossing - 1]
+            if crossing < len(speeds):
+                v_hi = min(v_hi, speeds[crossing])
+        result = solve_root(lambda v: self.power_required(v) - self.power_avail, v_lo, v_hi, tol)
+        return result.root, "converged" if result.converged else "max iterations", result.iterations
+
+
+RotorcraftPowerModel = PowerModel # Former name, from when only rotorcraft used the model
+
+
+class PowerCurve(NamedTuple):
+    """
+    Power-required and power-available curves of a design, sampled once at
+    POWER_CURVE_POINTS airspeeds, with the speeds derived from them: VH
+    (solved on the model within the sampled bracket) and the minimum-power
+    speed (no slower than the curve's floor speed). Curves are shared by
+    the cache of `power_curve`, so the arrays must not be modified.
+    """
+    model: PowerModel
+    speeds: array # Airspeeds (ft/s), ascending
+    power_required: array # Power required at each airspeed (ft-lbs/sec)
+    min_power_fps: float
+    vh_fps: float
+    vh_status: str
+    vh_iterations: int
+
+    @property
+    def power_avail(self) -> float:
+        """Power available (ft-lbs/sec), the same at every airspeed."""
+        return self.model.power_avail
+
+
+@functools.lru_cache(maxsize=POWER_CURVE_CACHE_SIZE)
+def power_curve(model: PowerModel, v_floor: float = 0.0, tol: float = VH_TOLERANCE_FPS) -> PowerCurve:
+    """
+    Samples a power model from `v_floor` (or, without a floor, from a fifth
+    of the minimum-power speed) to just past the speed where parasite power
+    alone uses all of the available power, and derives VH and the
+    minimum-power speed. Results are cached per model, floor and tolerance.
+    An unusable model (no parasite drag) gives empty arrays.
+    """
+    with alula_profile.stage('power curve'):
+        min_power_fps = max(v_floor, model.min_power_speed())
+        excess_power = model.power_avail - model.profile_power
+        v_top = (excess_power / model.parasite_coeff)**(1/3) if model.parasite_coeff > 0 and excess_power > 0 else 0.0
+        v_start = v_floor if v_floor > 0 else 0.2 * min_power_fps
+        v_end = 1.1 * max(v_top, 2 * min_power_fps, 2 * v_start)
+        speeds, power_required = array('d'), array('d')
+        if model.parasite_coeff > 0 and v_end > v_start:
+            step = (v_end - v_start) / (POWER_CURVE_POINTS - 1)
+            speeds = array('d', [v_start + i * step for i in range(POWER_CURVE_POINTS)])
+            # P_req(v) inlined over the whole array (see PowerModel.power_required)
+            a, p0, c = model.parasite_coeff, model.profile_power, model.induced_coeff
+            if c > 0:
+                power_required = array('d', [a * v * v * v + p0 + c / v if v > 0 else math.inf for v in speeds])
+            else:
+                power_required = array('d', [a * v * v * v + p0 for v in speeds])
+        vh_fps, vh_status, vh_iterations = model.solve_vh(tol, v_floor, speeds, power_required)
+    return PowerCurve(model, speeds, power_required, min_power_fps, vh_fps, vh_status, vh_iterations)
+
+
+def stall_speed_fps(gross_weight: float, wing_area: float, cl_max: float, rho: float = RHO_SEA_LEVEL_SLUG) -> float:
+    """Returns the 1 g stall speed (ft/s) of a wing, 0 if it has no area or lift."""
+    return math.sqrt((2 * gross_weight) / (rho * wing_area * cl_max)) if wing_area * cl_max > 0 else 0
+
+
+def reynolds_number(v_fps: float, length_ft: float, rho: float = RHO_SEA_LEVEL_SLUG) -> float:
+    """Returns the Reynolds number of a length (e.g. the wing chord) at an airspeed and air density."""
+    return rho * v_fps * length_ft / AIR_VISCOSITY_SLUG_FT_S
+
+
+class WingAerodynamics(NamedTuple):
+    """
+    Lift and drag coefficients of a fixed wing: its maximum lift
+    coefficients, clean and with flaps, and the profile drag coefficient of
+    its airfoil, which adds to the base Cd0 (0 without an airfoil, when the
+    typed-in Cd0 covers the whole airframe). `results` holds the calculation
+    results describing the airfoil (empty without one).
+    """
+    cl_max: float
+    cl_max_flaps: float
+    profile_cd0: float
+    results: Dict[str, Any]
+
+
+def wing_aerodynamics(inputs: Dict[str, Any], gross_weight: float, rho: float = RHO_SEA_LEVEL_SLUG) -> WingAerodynamics:
+    """
+    Returns the wing's lift and drag coefficients at air density `rho`.
+    Without an 'airfoil' these are the typed-in Cl_max values. With one, the
+    polar library is opened (on first use) and the section's maximum lift
+    at the stall's Reynolds number, reduced by AIRFOIL_CL_MAX_FACTOR, gives
+    the wing Cl_max (the typed-in flap increment is kept), and its minimum
+    drag at the Reynolds number of AIRFOIL_CRUISE_SPEED_KNOTS the profile
+    drag. The chord is the mean chord. Raises ValueError for an airfoil
+    that is not in the library.
+    """
+    cl_max = get_input_value(inputs, 'cl_max', 1.5)
+    cl_max_flaps = get_input_value(inputs, 'cl_max_flaps', 1.9)
+    airfoil = str(inputs.get('airfoil') or '').strip()
+    if not airfoil:
+        return WingAerodynamics(cl_max, cl_max_flaps, 0.0, {})
+
+    import alula_airfoils # Only designs with an airfoil load the polar library
+    library = alula_airfoils.get_library()
+    wing_area, wing_span = get_input_value(inputs, 'wing_area', 1), get_input_value(inputs, 'wing_span', 1)
+    chord = wing_area / wing_span if wing_span > 0 else 0.0
+    # The stall speed depends on the maximum lift, which depends on the stall's Reynolds number
+    stall_re = reynolds_number(stall_speed_fps(gross_weight, wing_area, cl_max, rho), chord, rho)
+    for _ in range(AIRFOIL_STALL_ITERATIONS):
+        stall = library.summary(airfoil, stall_re)
+        stall_re = reynolds_number(stall_speed_fps(gross_weight, wing_area, AIRFOIL_CL_MAX_FACTOR * stall.cl_max, rho), chord, rho)
+    cruise_re = reynolds_number(AIRFOIL_CRUISE_SPEED_KNOTS * KNOTS_TO_FPS, chord, rho)
+    cruise = library.summary(airfoil, cruise_re)
+
+    wing_cl_max = AIRFOIL_CL_MAX_FACTOR * stall.cl_max
+    return WingAerodynamics(wing_cl_max, wing_cl_max + max(0.0, cl_max_flaps - cl_max), cruise.cd_min, {
+        "Airfoil": library.names[library.find(airfoil)],
+        "Airfoil Cl_max": stall.cl_max,
+        "Airfoil Cd_min": cruise.cd_min,
+        "Airfoil Cm0": cruise.cm0,
+        "Wing Profile Cd0": cruise.cd_min,
+        "Stall Reynolds Number": stall_re,
+        "Cruise Reynolds Number": cruise_re,
+    })
+
+
+def fixed_wing_power_model(inputs: Dict[str, Any], gross_weight: float, rho: float = RHO_SEA_LEVEL_SLUG,
+                           aero: Optional[WingAerodynamics] = None) -> PowerModel:
+    """
+    Builds the level-flight power model of a powered fixed-wing design from
+    its parabolic drag polar, at air density `rho` (engine power lapsed to
+    that density). `aero` is the wing's `wing_aerodynamics`, if already known.
+    """
+    if aero is None:
+        aero = wing_aerodynamics(inputs, gross_weight, rho)
+    wing_area, wing_span = get_input_value(inputs, 'wing_area', 1), get_input_value(inputs, 'wing_span', 1)
+    oswald_eff = get_input_value(inputs, 'oswald_efficiency', 0.8)
+    total_cd0 = get_input_value(inputs, 'cd0', 0.025) + aero.profile_cd0 + COCKPIT_DRAG_MAP.get(inputs['cockpit_style'], 0) + TAIL_DRAG_MAP.get(inputs['tail_style'], 0)
+    AR = (wing_span ** 2) / wing_area if wing_area > 0 else 0
+    k = 1 / (math.pi * AR * oswald_eff) if AR * oswald_eff > 0 else float('inf')
+    power_avail = get_input_value(inputs, 'engine_hp', 20) * engine_power_ratio(rho / RHO_SEA_LEVEL_SLUG) * get_input_value(inputs, 'prop_efficiency', 0.75) * 550
+    parasite_coeff = 0.5 * rho * wing_area * total_cd0
+    induced_coeff = (2 * k * gross_weight**2) / (rho * wing_area) if wing_area > 0 and math.isfinite(k) else 0
+    return PowerModel(parasite_coeff, 0.0, induced_coeff, power_avail)
+
+
+def lta_power_model(inputs: Dict[str, Any], rho: float = RHO_SEA_LEVEL_SLUG) -> PowerModel:
+    """
+    Builds the level-flight power model of a Lighter Than Air vehicle: hull
+    drag only, on the frontal area of a sphere of the envelope volume.
+    """
+    volume, base_cd0 = get_input_value(inputs, 'envelope_volume', 8000), get_input_value(inputs, 'cd0', 0.025)
+    power_avail = get_input_value(inputs, 'engine_hp', 20) * engine_power_ratio(rho / RHO_SEA_LEVEL_SLUG) * get_input_value(inputs, 'prop_efficiency', 0.75) * 550
+    frontal_area = math.pi * ((volume * 0.75 / math.pi)**(1/3))**2
+    return PowerModel(0.5 * rho * frontal_area * base_cd0, 0.0, 0.0, power_avail)
+
+
+def fixed_wing_power_curve(inputs: Dict[str, Any], gross_weight: float, rho: float = RHO_SEA_LEVEL_SLUG,
+                           tol: float = VH_TOLERANCE_FPS, aero: Optional[WingAerodynamics] = None) -> Optional[PowerCurve]:
+    """
+    Returns the cached power curve of a powered fixed-wing design, starting
+    at the stall speed, or None if its drag polar is unusable (no wing
+    area, lift, drag or span). `aero` is the wing's `wing_aerodynamics`, if
+    already known.
+    """
+    if aero is None:
+        aero = wing_aerodynamics(inputs, gross_weight, rho)
+    model = fixed_wing_power_model(inputs, gross_weight, rho, aero)
+    vs_fps = stall_speed_fps(gross_weight, get_input_value(inputs, 'wing_area', 1), aero.cl_max, rho)
+    if not (vs_fps > 0 and model.parasite_coeff > 0 and model.induced_coeff > 0):
+        return None
+    return power_curve(model, vs_fps, tol)
+
+
+def design_power_curve(inputs: Dict[str, Any], gross_weight: float, rho: float = RHO_SEA_LEVEL_SLUG,
+                       tol: float = VH_TOLERANCE_FPS) -> Optional[PowerCurve]:
+    """
+    Returns the cached power curve of a design (normalized inputs) at its
+    gross weight and air density `rho`: the same curve the performance
+    calculations derive VH, Vy and the minimum-power speed from. Gyrocopter
+    curves start at the minimum forward speed. Returns None for unpowered
+    vehicle types and for fixed wings whose drag polar is unusable.
+    """
+    v_type = inputs['vehicle_type']
+    if v_type == 'Fixed Wing':
+        return fixed_wing_power_curve(inputs, gross_weight, rho, tol)
+    if v_type in ('Helicopter', 'Gyrocopter'):
+        is_helicopter = v_type == 'Helicopter'
+        model = rotorcraft_power_model(inputs, gross_weight, is_helicopter, rho)
+        return power_curve(model, 0.0 if is_helicopter else ROTORCRAFT_MIN_SPEED_FPS, tol)
+    if v_type == 'Lighter Than Air':
+        return power_curve(lta_power_model(inputs, rho), 0.0, tol)
+    return None
+
+
+def calculate_fixed_wing(inputs: Dict[str, Any], calc: Dict[str, Any], is_glider: bool = False, tol: float = VH_TOLERANCE_FPS,
+                         rho: float = RHO_SEA_LEVEL_SLUG):
+    """
+    Performs aerodynamic and performance calculations specific to
+    fixed-wing aircraft (including gliders, with a flag).
+    Calculates stall speeds, max level speed (VH), rate of climb (ROC),
+    loadings, and static margin. VH is solved to within `tol` ft/s.
+    Speeds are true airspeeds at air density `rho`, with the engine power
+    lapsed to that density.
+    """
+    gross_weight = calc['Gross Weight']
+    wing_area = get_input_value(inputs, 'wing_area', 1)
+    wing_span = get_input_value(inputs, 'wing_span', 1)
+    base_cd0 = get_input_value(inputs, 'cd0', 0.025)
+    oswald_eff = get_input_value(inputs, 'oswald_efficiency', 0.8)
+    engine_hp = 0 if is_glider else get_input_value(inputs, 'engine_hp', 20)
+    lemac_ft, np_ft = get_input_value(inputs, 'lemac_ft', 4.0), get_input_value(inputs, 'neutral_point_ft', 5.5)
+
+    # Lift coefficients for stall speed calculation, and the wing's profile drag
+    # (typed in, or from the airfoil's section data)
+    aero = wing_aerodynamics(inputs, gross_weight, rho)
+    cl_max, cl_max_flaps = aero.cl_max, aero.cl_max_flaps
+    flaps = get_input_flag(inputs, 'flaps')
+
+    # Calculate total zero-lift drag coefficient
+    cockpit_drag = COCKPIT_DRAG_MAP.get(inputs['cockpit_style'], 0)
+    tail_drag = TAIL_DRAG_MAP.get(inputs['tail_style'], 0)
+    total_cd0 = base_cd0 + aero.profile_cd0 + cockpit_drag + tail_drag
+
+    # Stall speed calculations
+    vs_fps = stall_speed_fps(gross_weight, wing_area, cl_max, rho)
+    vs_flaps_fps = stall_speed_fps(gross_weight, wing_area, cl_max_flaps, rho)
+
+    # Aspect Ratio and induced drag factor (k)
+    AR = (wing_span ** 2) / wing_area if wing_area > 0 else 0
+    k = 1 / (math.pi * AR * oswald_eff) if AR * oswald_eff > 0 else float('inf')
+
+    # For gliders, calculate L/D Max and Min Sink Rate
+    ld_max = math.sqrt( (total_cd0 / k) ) / (2*total_cd0) if k > 0 and total_cd0 > 0 else 0
+    v_ld_max_fps = math.sqrt( (2*gross_weight) / (rho * wing_area * math.sqrt(total_cd0/k)) ) if k > 0 and total_cd0 > 0 else 0
+    min_sink_fps = v_ld_max_fps / ld_max if ld_max > 0 else 0
+
+    if not is_glider:
+        # Powered aircraft performance comes from the design's cached power curve
+        # (None if the drag polar is unusable, e.g. no wing area or no drag).
+        # VH is its upper crossing of power required and power available.
+        curve = fixed_wing_power_curve(inputs, gross_weight, rho, tol, aero)
+        vh_fps, vh_status, vh_iterations = (curve.vh_fps, curve.vh_status, curve.vh_iterations) if curve else (0.0, "no level flight", 0)
+
+        # Best rate of climb (Vy) is at the minimum-power speed, where excess power
+        # is largest. Best angle of climb (Vx) maximizes excess thrust P/v - D(v),
+        # i.e. the root of 2*parasite*v^4 + P*v - 2*induced = 0 below the min-drag speed.
+        # Both are limited to the usable range from 1.05 Vs up to 1.05 VH.
+        vy_fps, vx_fps, roc_fpm = 0.0, 0.0, 0.0
+        if curve:
+            model = curve.model
+            climb_v_start = vs_fps * 1.05
+            climb_v_end = max(climb_v_start, vh_fps * 1.05 if vh_fps > vs_fps else vs_fps * 1.5)
+            vy_fps = min(max(curve.min_power_fps, climb_v_start), climb_v_end)
+            v_min_drag = (model.induced_coeff / model.parasite_coeff)**0.25
+            # Without power available there is no excess thrust to maximize (as ROC is
+            # 0); Vx is left at the lower limit
+            vx_root = 0.0
+            if model.power_avail > 0:
+                vx_root = solve_root(lambda v: 2 * model.parasite_coeff * v**4 + model.power_avail * v - 2 * model.induced_coeff, 0.0, v_min_drag, tol).root
+            vx_fps = min(max(vx_root, climb_v_start), vy_fps)
+            if gross_weight > 0:
+                roc_fpm = ((model.power_avail - model.power_required(vy_fps)) / gross_weight) * 60
+
+        # Update calculation results for powered fixed-wing
+        calc.update({
+            "Wing Loading": gross_weight / wing_area if wing_area > 0 else 0,
+            "Power Loading": gross_weight / engine_hp if engine_hp > 0 else 0,
+            "Span Loading": gross_weight / wing_span if wing_span > 0 else 0,
+            "Stall Speed": vs_fps / KNOTS_TO_FPS,
+            "Stall Speed Flaps": vs_flaps_fps / KNOTS_TO_FPS if flaps else vs_fps / KNOTS_TO_FPS,
+            "VH": vh_fps / KNOTS_TO_FPS,
+            "VH Solver Status": vh_status,
+            "VH Solver Iterations": vh_iterations,
+            "ROC": roc_fpm if roc_fpm > 0 else 0,
+            "Vy": vy_fps / KNOTS_TO_FPS,
+            "Vx": vx_fps / KNOTS_TO_FPS
+        })
+    else:
+        # Update calculation results for gliders
+        calc.update({
+            "L/D Max": ld_max,
+            "Min Sink Rate": min_sink_fps * 60,
+            "Speed @ Min Sink": v_ld_max_fps / KNOTS_TO_FPS,
+            "Stall Speed": vs_fps / KNOTS_TO_FPS,
+            "Stall Speed Flaps": vs_flaps_fps / KNOTS_TO_FPS if flaps else vs_fps / KNOTS_TO_FPS,
+            "Wing Loading": gross_weight / wing_area if wing_area > 0 else 0,
+            "VH": v_ld_max_fps / KNOTS_TO_FPS * 1.5 # VH for gliders estimated as 1.5 * speed at min sink
+        })
+
+    # Longitudinal stability calculations (applicable to fixed-wing/gliders)
+    mean_chord = wing_area / wing_span if wing_span > 0 else 1
+    calc.update({
+        "Static Margin": ((np_ft - calc["CG Location"]) / mean_chord) * 100 if mean_chord > 0 else 0,
+        "CG MAC Percent": ((calc["CG Location"] - lemac_ft) / mean_chord) * 100 if mean_chord > 0 else 0,
+        "Total Cd0": total_cd0,
+        "Base Cd0": base_cd0,
+        "Cockpit Drag": cockpit_drag,
+        "Tail Drag": tail_drag
+    })
+    calc.update(aero.results)
+
+
+def calculate_glider(inputs: Dict[str, Any], calc: Dict[str, Any], tol: float = VH_TOLERANCE_FPS, rho: float = RHO_SEA_LEVEL_SLUG):
+    """
+    Wrapper function to calculate glider performance by calling
+    the fixed-wing calculation with the `is_glider` flag set to True.
+    """
+    calculate_fixed_wing(inputs, calc, is_glider=True, tol=tol, rho=rho)
+
+
+def calculate_paraglider(inputs: Dict[str, Any], calc: Dict[str, Any], tol: float = VH_TOLERANCE_FPS, rho: float = RHO_SEA_LEVEL_SLUG):
+    """
+    Performs performance calculations specific to paragliders,
+    using predefined aerodynamic characteristics based on the
+    selected glider class (EN A/B/C/D). Speeds are true airspeeds at
+    air density `rho`.
+    """
+    gross_weight = calc['Gross Weight']
+    wing_area = get_input_value(inputs, 'wing_area', 250)
+    ar = get_input_value(inputs, 'aspect_ratio', 5.5)
+    aero_props: dict[str, Any] | None = PARAGLIDER_CLASS_MAP.get(inputs['glider_class'])
+
+    if aero_props is None:
+        # If no valid glider class found, return to prevent errors
+        calc.update({"L/D Max": 0, "Min Sink Rate": 0, "Trim Speed": 0, "Stall Speed": 0, "Wing Loading": 0, "VH": 0, "Static Margin": "N/A", "CG MAC Percent": "N/A"})
+        return
+
+    cl_trim, cl_max, cd0, oswald_eff = aero_props['cl_trim'], aero_props['cl_max'], aero_props['cd0'], aero_props['oswald']
+
+    # Stall and trim speed calculations
+    vs_fps = math.sqrt((2 * gross_weight) / (rho * wing_area * cl_max)) if wing_area * cl_max > 0 else 0
+    trim_speed_fps = math.sqrt((2 * gross_weight) / (rho * wing_area * cl_trim)) if wing_area * cl_trim > 0 else 0
+
+    # Induced drag factor (k)
+    k = 1 / (math.pi * ar * oswald_eff) if ar * oswald_eff > 0 else float('inf')
+
+    # L/D Max and Min Sink Rate
+    ld_max = math.sqrt( (cd0 / k) ) / (2*cd0) if k > 0 and cd0 > 0 else 0
+    v_ld_max_fps = math.sqrt( (2*gross_weight) / (rho * wing_area * math.sqrt(cd0/k)) ) if k > 0 and cd0 > 0 else 0
+    min_sink_fps = v_ld_max_fps / ld_max if ld_max > 0 else 0
+
+    # Update calculation results for paragliders
+    calc.update({
+        "L/D Max": ld_max,
+        "Min Sink Rate": min_sink_fps * 60,
+        "Trim Speed": trim_speed_fps / KNOTS_TO_FPS,
+        "Stall Speed": vs_fps / KNOTS_TO_FPS,
+        "Wing Loading": gross_weight / wing_area if wing_area > 0 else 0,
+        "VH": trim_speed_fps * 1.4 / KNOTS_TO_FPS, # Top speed estimated from trim speed
+        "Static Margin": "N/A", # Not applicable for paragliders in this context
+        "CG MAC Percent": "N/A" # Not applicable for paragliders in this context
+    })
+
+
+def rotorcraft_power_model(inputs: Dict[str, Any], gross_weight: float, is_helicopter: bool,
+                           rho: float = RHO_SEA_LEVEL_SLUG) -> PowerModel:
+    """
+    Builds the forward-flight power model for a rotorcraft design from its
+    inputs and gross weight, at air density `rho` (engine power lapsed to
+    that density).
+    """
+    rotor_d, blade_c, num_b = get_input_value(inputs, 'rotor_diameter', 23), get_input_value(inputs, 'rotor_blade_chord', 0.6), get_input_value(inputs, 'num_blades', 2)
+    rotor_rpm = get_input_value(inputs, 'rotor_rpm', 350)
+    base_cd0, blade_cd = get_input_value(inputs, 'cd0', 0.05), get_input_value(inputs, 'rotor_blade_cd', 0.012)
+    engine_hp = get_input_value(inputs, 'engine_hp', 20)
+
+    # Fuselage drag calculation
+    cockpit_drag = COCKPIT_DRAG_MAP.get(inputs['cockpit_style'], 0)
+    fuselage_drag_area = (base_cd0 + cockpit_drag) * 15 # Assumed reference area for fuselage drag
+
+    rotor_area = math.pi * (rotor_d / 2)**2
+    solidity = (num_b * blade_c) / (math.pi * rotor_d) if rotor_d > 0 else 0
+    tip_speed = (rotor_rpm * 2 * math.pi / 60) * (rotor_d / 2)
+    power_avail = engine_hp * engine_power_ratio(rho / RHO_SEA_LEVEL_SLUG) * get_input_value(inputs, 'prop_efficiency', 0.75) * 550
+
+    if is_helicopter:
+        # Profile power for rotor plus induced power in forward flight
+        power_profile = (solidity / 8) * rho * rotor_area * (tip_speed**3) * blade_cd
+        induced_coeff = (gross_weight**2) / (2 * rho * rotor_area) if rotor_area > 0 else 0
+        return PowerModel(0.5 * rho * fuselage_drag_area, power_profile, induced_coeff, power_avail)
+
+    rotor_drag_area = rotor_area * 0.05 # Assumed drag area for rotor system
+    total_drag_area = fuselage_drag_area + rotor_drag_area
+    return PowerModel(0.5 * rho * total_drag_area, 0.0, 0.0, power_avail)
+
+
+def rotorcraft_power_margin(inputs: Dict[str, Any], gross_weight: float, is_helicopter: bool, speeds_knots: List[float]) -> List[float]:
+    """
+    Returns the power margin (power available minus power required, in HP)
+    at each of the given airspeeds, i.e. the rotorcraft's power margin curve.
+    Non-positive speeds are reported as -inf.
+    """
+    model = rotorcraft_power_model(inputs, gross_weight, is_helicopter)
+    return [(model.power_avail - model.power_required(v * KNOTS_TO_FPS)) / 550 if v > 0 else float('-inf') for v in speeds_knots]
+
+
+def calculate_rotorcraft(inputs: Dict[str, Any], calc: Dict[str, Any], is_helicopter: bool, tol: float = VH_TOLERANCE_FPS,
+                         rho: float = RHO_SEA_LEVEL_SLUG):
+    """
+    Performs performance calculations for rotorcraft (gyrocopters and helicopters).
+    Calculates disc loading, power loading, tip speed, max level speed (VH)
+    and the minimum-power speed with its power margin, at air density `rho`.
+    """
+    gross_weight = calc['Gross Weight']
+    rotor_d = get_input_value(inputs, 'rotor_diameter', 23)
+    rotor_rpm = get_input_value(inputs, 'rotor_rpm', 350)
+    engine_hp = get_input_value(inputs, 'engine_hp', 20)
+    rotor_area = math.pi * (rotor_d / 2)**2
+    tip_speed = (rotor_rpm * 2 * math.pi / 60) * (rotor_d / 2)
+    model = rotorcraft_power_model(inputs, gross_weight, is_helicopter, rho)
+    curve = power_curve(model, 0.0 if is_helicopter else ROTORCRAFT_MIN_SPEED_FPS, tol)
+
+    min_speed_fps = ROTORCRAFT_MIN_SPEED_FPS
+
+    if is_helicopter:
+        # Helicopter specific calculations (hover and forward flight)
+        power_induced_hover = (gross_weight**1.5) / math.sqrt(2 * rho * rotor_area) if rotor_area > 0 else float('inf')
+        power_req_hover = power_induced_hover + model.profile_power
+        roc_fpm = (model.power_avail - power_req_hover) / gross_weight * 60 if gross_weight > 0 else 0
+    else: # Gyrocopter
+        roc_fpm = 0.0 # Gyrocopters typically have no significant vertical climb
+    # For gyrocopters power required only grows with speed, so the curve's
+    # minimum is at its floor, the slowest flyable speed
+    min_power_fps = curve.min_power_fps
+
+    # Max level speed from the upper crossing of power required and power available
+    vh_fps, vh_status, vh_iterations = curve.vh_fps, curve.vh_status, curve.vh_iterations
+
+    # Update calculation results for rotorcraft
+    calc.update({
+        "Disc Loading": gross_weight / rotor_area if rotor_area > 0 else 0,
+        "Power Loading": gross_weight / engine_hp if engine_hp > 0 else 0,
+        "Tip Speed": tip_speed,
+        "Min. Fwd Speed": min_speed_fps / KNOTS_TO_FPS,
+        "VH": vh_fps / KNOTS_TO_FPS,
+        "VH Solver Status": vh_status,
+        "VH Solver Iterations": vh_iterations,
+        "Min Power Speed": min_power_fps / KNOTS_TO_FPS,
+        "Power Margin @ Min Power": (model.power_avail - model.power_required(min_power_fps)) / 550 if min_power_fps > 0 else 0,
+        "ROC": roc_fpm if roc_fpm > 0 else 0,
+        "Static Margin": "N/A", # Not typically calculated for rotorcraft
+        "CG MAC Percent": "N/A" # Not typically calculated for rotorcraft
+    })
+
+
+def calculate_helicopter(inputs: Dict[str, Any], calc: Dict[str, Any], tol: float = VH_TOLERANCE_FPS, rho: float = RHO_SEA_LEVEL_SLUG):
+    """
+    Wrapper function to calculate helicopter performance by calling
+    the rotorcraft calculation with the `is_helicopter` flag set to True.
+    """
+    calculate_rotorcraft(inputs, calc, is_helicopter=True, tol=tol, rho=rho)
+
+
+def calculate_gyrocopter(inputs: Dict[str, Any], calc: Dict[str, Any], tol: float = VH_TOLERANCE_FPS, rho: float = RHO_SEA_LEVEL_SLUG):
+    """
+    Wrapper function to calculate gyrocopter performance by calling
+    the rotorcraft calculation with the `is_helicopter` flag set to False.
+    """
+    calculate_rotorcraft(inputs, calc, is_helicopter=False, tol=tol, rho=rho)
+
+
+def calculate_lta(inputs: Dict[str, Any], calc: Dict[str, Any], tol: float = VH_TOLERANCE_FPS, rho: float = RHO_SEA_LEVEL_SLUG):
+    """
+    Performs calculations specific to Lighter Than Air (LTA) vehicles,
+    determining buoyant lift, net lift, static condition, and max level speed (VH)
+    at air density `rho`. The helium is taken at the same pressure and
+    temperature as the surrounding air.
+    """
+    gross_weight = calc['Gross Weight']
+    volume = get_input_value(inputs, 'envelope_volume', 8000)
+
+    # Buoyant lift calculation (Archimedes' principle)
+    sigma = rho / RHO_SEA_LEVEL_SLUG
+    buoyant_lift = (RHO_SEA_LEVEL_SLUG - HELIUM_DENSITY_SLUG) * sigma * 32.174 * volume
+    net_lift = buoyant_lift - gross_weight
+
+    # Max level speed, where hull drag power uses all of the available power
+    vh_fps = power_curve(lta_power_model(inputs, rho), 0.0, tol).vh_fps
+
+    # Update calculation results for LTA vehicles
+    calc.update({
+        "Buoyant Lift": buoyant_lift,
+        "Net Lift": net_lift,
+        "Static Heaviness": "Heavy" if net_lift < 0 else "Light",
+        "VH": vh_fps / KNOTS_TO_FPS,
+        "ROC": "N/A", # Not applicable in the same sense as winged aircraft
+        "Stall Speed": "N/A", # Not applicable for LTA
+        "Static Margin": "N/A", # Not typically calculated for LTA
+        "CG MAC Percent": "N/A" # Not typically calculated for LTA
+    })
+
+
+# Map vehicle types to their specific calculation functions
+CALC_MAP: Dict[str, Callable[..., None]] = {
+    'Fixed Wing': calculate_fixed_wing,
+    'Glider': calculate_glider,
+    'Gyrocopter': calculate_gyrocopter,
+    'Helicopter': calculate_helicopter,
+    'Lighter Than Air': calculate_lta,
+    'Paraglider': calculate_paraglider
+}
+
+
+def evaluate_inputs(inputs: Dict[str, Any], components: List[Dict[str, Any]], tol: float = VH_TOLERANCE_FPS) -> Dict[str, Any]:
+    """
+    Runs the full calculation for already-normalized inputs and a component
+    table. It first calculates total weight and CG from the components, then
+    calls the specific calculation function for the vehicle type, and returns
+    the resulting calculations dictionary. `tol` is the speed solver
+    tolerance in ft/s.
+    """
+    if inputs['vehicle_type'] not in CALC_MAP:
+        raise ValueError(f"Unknown vehicle type: {inputs['vehicle_type']!r}")
+
+    # Calculate the weight and moment of each component category
+    with alula_profile.stage('weight_and_balance'):
+        totals = category_totals(components)
+    return evaluate_weights(inputs, totals, tol)
+
+
+def evaluate_weights(inputs: Dict[str, Any], totals: Dict[str, Tuple[float, float]],
+                     tol: float = VH_TOLERANCE_FPS) -> Dict[str, Any]:
+    """
+    Runs the full calculation from already-summed component totals: the
+    (weight, moment about the datum) of each component category, as kept up
+    to date by the GUI's component table. Empty weight and CG are taken from
+    these aggregates, and each category's weight is stored under its
+    CATEGORY_WEIGHT_KEYS name. Otherwise the same as evaluate_inputs.
+
+    The main results are for a standard day at sea level, where true and
+    calibrated airspeed agree (Part 103 limits are calibrated airspeeds).
+    The field's density altitude is added, and the results named in
+    FIELD_RESULT_KEYS are evaluated again at the field's density.
+    """
+    v_type = inputs['vehicle_type']
+    calc_function = CALC_MAP.get(v_type)
+    if calc_function is None:
+        raise ValueError(f"Unknown vehicle type: {v_type!r}")
+
+    total_weight = sum(totals[category][0] for category in COMPONENT_CATEGORIES)
+    total_moment = sum(totals[category][1] for category in COMPONENT_CATEGORIES)
+    cg_location = total_moment / total_weight if total_weight > 0 else 0
+    empty_weight = total_weight
+    pilot_weight = get_input_value(inputs, 'pilot_weight')
+    fuel_weight = 0 if v_type in ['Glider', 'Paraglider'] else FAR_103_MAX_FUEL_LBS
+    gross_weight = empty_weight + pilot_weight + fuel_weight
+
+    # Store basic calculated values
+    calc: Dict[str, Any] = {
+        "Empty Weight": empty_weight,
+        "Gross Weight": gross_weight,
+        "Fuel Weight": fuel_weight,
+        "Power System Weight": totals['power'][0],
+        "CG Location": cg_location,
+        "Pilot Weight": pilot_weight
+    }
+    for category, key in CATEGORY_WEIGHT_KEYS.items():
+        calc[key] = totals[category][0]
+
+    # Execute the relevant calculation function
+    base = dict(calc)
+    with alula_profile.stage(calc_function.__name__):
+        calc_function(inputs, calc, tol=tol)
+
+    # Repeat it at the field's density altitude (unless that is sea level)
+    sigma = field_density_ratio(inputs)
+    field = calc
+    if sigma != 1.0:
+        field = base
+        with alula_profile.stage(f'{calc_function.__name__} (field)'):
+            calc_function(inputs, field, tol=tol, rho=RHO_SEA_LEVEL_SLUG * sigma)
+    calc["Field Density Ratio"] = sigma
+    calc["Density Altitude"] = alula_atmosphere.density_altitude(sigma)
+    for key, field_key in FIELD_RESULT_KEYS.items():
+        if key in field:
+            calc[field_key] = field[key]
+    return calc
+
+
+def evaluate_design(record: Dict[str, Any], tol: float = VH_TOLERANCE_FPS) -> Dict[str, Any]:
+    """
+    Evaluates a design record in the "Save Design..." format and returns the
+    calculations dictionary. Missing inputs fall back to the defaults and a
+    missing component table falls back to the vehicle type's default table.
+    """
+    inputs = normalize_inputs(record.get('main_inputs'))
+    components = record.get('component_weights')
+    if components is None:
+        components = default_components(inputs['vehicle_type'])
+    return evaluate_inputs(inputs, components, tol)
+
+
+def part103_limits(vehicle_type: str) -> Dict[str, float]:
+    """
+    Returns the FAR Part 103 limits that apply to a vehicle type, keyed by
+    limit name ('Empty Weight', 'Stall Speed', 'Max Level Speed').
+    """
+    return {
+        "Empty Weight": FAR_103_GLIDER_EMPTY_WEIGHT_LBS if vehicle_type in ['Glider', 'Paraglider'] else FAR_103_EMPTY_WEIGHT_LBS,
+        "Stall Speed": FAR_103_STALL_SPEED_KNOTS,
+        "Max Level Speed": FAR_103_MAX_SPEED_KNOTS,
+    }
+
+
+def part103_compliance(vehicle_type: str, calc: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """
+    Checks calculated results against the FAR Part 103 limits. Returns a
+    dictionary keyed by limit name ('Empty Weight', 'Stall Speed', 'Max Level
+    Speed') holding the value, the limit and whether it passed. Limits that do
+    not apply to the results (e.g. stall speed for LTA) are left out.
+    """
+    checks: Dict[str, Dict[str, Any]] = {}
+    limits = part103_limits(vehicle_type)
+    candidates = [
+        ("Empty Weight", calc.get("Empty Weight", 0)),
+        ("Stall Speed", calc.get("Stall Speed") or calc.get("Min. Fwd Speed")),
+        ("Max Level Speed", calc.get("VH")),
+    ]
+    for name, value in candidates:
+        limit = limits[name]
+        if isinstance(value, (int, float)):
+            checks[name] = {"value": value, "limit": limit, "passed": value <= limit}
+    return checks
+
+
+def design_feedback(vehicle_type: str, calc: Dict[str, Any]) -> List[str]:
+    """
+    Generates the feedback messages shown in the GUI's 'Issues & Feedback'
+    tab: an aerodynamics summary, pitch stability, FAR Part 103 compliance
+    warnings (weight, speed), solver notes and handling insights.
+    """
+    feedback: List[str] = []
+    limits = part103_limits(vehicle_type)
+
+    # Aerodynamics summary
+    if calc.get('Total Cd0') and 'Airfoil' in calc:
+        feedback.append(f"ℹ️ Aerodynamics: Base Cd0 ({calc.get('Base Cd0', 0):.3f}) + Wing Profile ({calc['Wing Profile Cd0']:.4f}) + Cockpit ({calc.get('Cockpit Drag', 0):.4f}) + Tail ({calc.get('Tail Drag', 0):.4f}) = Total Cd0 ({calc.get('Total Cd0', 0):.3f}).")
+        feedback.append(f"ℹ️ Airfoil: {calc['Airfoil']} section data. Cl_max {calc['Airfoil Cl_max']:.2f} at the stall's Reynolds number "
+                        f"({calc['Stall Reynolds Number'] / 1e6:.2f} million), Cd_min {calc['Airfoil Cd_min']:.4f} and Cm0 {calc['Airfoil Cm0']:.3f} "
+                        f"at {calc['Cruise Reynolds Number'] / 1e6:.2f} million.")
+    elif calc.get('Total Cd0'):
+        feedback.append(f"ℹ️ Aerodynamics: Base Cd0 ({calc.get('Base Cd0', 0):.3f}) + Cockpit ({calc.get('Cockpit Drag', 0):.4f}) + Tail ({calc.get('Tail Drag', 0):.4f}) = Total Cd0 ({calc.get('Total Cd0', 0):.3f}).")
+
+    # Pitch Stability Feedback
+    sm = calc.get("Static Margin")
+    if isinstance(sm, (int, float)):
+        if 5 <= sm <= 15:
+            feedback.append("✔️ Pitch Stability: Good. Static margin is in the ideal 5-15% range.")
+        else:
+            feedback.append("❌ Pitch Stability: Poor. Static margin is outside the ideal range. Check CG and Neutral Point.")
+
+    # FAR Part 103 Compliance: Empty Weight
+    weight_limit = limits["Empty Weight"]
+    if calc.get("Empty Weight", 0) > weight_limit:
+        feedback.append(f"❌ Compliance: Empty weight exceeds Part 103 limit for this aircraft type ({weight_limit} lbs).")
+    else:
+        feedback.append(f"✔️ Compliance: Empty weight is within Part 103 limit for this aircraft type ({weight_limit} lbs).")
+
+    # FAR Part 103 Compliance: Stall Speed
+    v_stall = calc.get("Stall Speed") or calc.get("Min. Fwd Speed")
+    if isinstance(v_stall, (int, float)) and v_stall > limits["Stall Speed"]:
+        feedback.append(f"❌ Compliance: Speed ({v_stall:.1f} knots) exceeds FAR 103 stall speed limit.")
+
+    # FAR Part 103 Compliance: Max Level Speed (VH)
+    vh = calc.get("VH")
+    if isinstance(vh, (int, float)) and vh > limits["Max Level Speed"]:
+        feedback.append(f"❌ Compliance: Max speed ({vh:.1f} knots) exceeds FAR 103 limit.")
+    if calc.get("VH Solver Status") == "no level flight":
+        feedback.append("❌ Performance: Power available is below power required at every flyable speed, so the design cannot hold level flight.")
+    elif calc.get("VH Solver Status") == "max iterations":
+        feedback.append("ℹ️ Performance: The max level speed solver did not converge; the VH shown is approximate.")
+    if isinstance(calc.get("Min Power Speed"), (int, float)) and vehicle_type in ['Gyrocopter', 'Helicopter']:
+        feedback.append(f"ℹ️ Performance: Minimum power required at {calc['Min Power Speed']:.1f} knots, with {calc.get('Power Margin @ Min Power', 0):.1f} HP to spare.")
+
+    # Field density altitude
+    field_roc, density_altitude = calc.get("Field ROC"), calc.get("Density Altitude", 0)
+    if isinstance(field_roc, (int, float)) and isinstance(calc.get("ROC"), (int, float)) and calc["ROC"] > 0 and density_altitude >= 1000:
+        if field_roc < 100:
+            feedback.append(f"❌ Performance: At the field's density altitude ({density_altitude:,.0f} ft) the rate of climb drops to {field_roc:.0f} fpm.")
+        else:
+            feedback.append(f"ℹ️ Performance: At the field's density altitude ({density_altitude:,.0f} ft): ROC {field_roc:.0f} fpm, VH {calc.get('Field VH', 0):.1f} knots TAS.")
+
+    # Handling Characteristics (based on wing/disc loading)
+    wl = calc.get("Wing Loading") or calc.get("Disc Loading")
+    if isinstance(wl, (int, float)):
+        if wl < 2.5:
+            feedback.append("ℹ️ Handling: Very low loading suggests high sensitivity to turbulence.")
+        elif wl > 5.0:
+            feedback.append("ℹ️ Handling: High loading suggests higher landing speeds.")
+    return feedback
+
+
+def design_record(main_inputs: Dict[str, Any], components: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Builds a design record in the same format written by "Save Design...".
+    """
+    return {
+        'main_inputs': dict(main_inputs),
+        'component_weights': [{'name': c.get('name', ''), 'weight': c.get('weight', '0'), 'arm': c.get('arm', '0'), 'category': component_category(c)}
+                              for c in components]
+    }
+
+
+def copy_design_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Returns a copy of a design record that can be modified without touching
+    the original (inputs dictionary and component rows are copied).
+    """
+    main_inputs = normalize_inputs(record.get('main_inputs'))
+    components = record.get('component_weights')
+    if components is None:
+        components = default_components(main_inputs['vehicle_type'])
+    return {'main_inputs': main_inputs, 'component_weights': [dict(c) for c in components]}
+
+
+def set_design_parameter(record: Dict[str, Any], key: str, value: Any):
+    """
+    Sets a single design parameter on a record in place. `key` is either one
+    of the input names in DEFAULT_INPUTS or 'weight:<component name>' /
+    'arm:<component name>' for an entry of the component table. Raises
+    KeyError for unknown inputs or components.
+    """
+    field, sep, name = key.partition(':')
+    if sep and field in ('weight', 'arm'):
+        for comp in record.get('component_weights') or []:
+            if comp.get('name') == name:
+                comp[field] = value
+                return
+        raise KeyError(f"No component named {name!r} in the design")
+    if key not in DEFAULT_INPUTS:
+        raise KeyError(f"Unknown design input {key!r}")
+    record.setdefault('main_inputs', {})[key] = value
+
+
+def load_design_file(filepath: str) -> Dict[str, Any]:
+    """
+    Reads a design record from a JSON file written by "Save Design...".
+    """
+    with open(filepath, 'r', encoding="utf-8") as f:
+        return json.load(f)
@@ -0,0 +1,427 @@
+# -*- coding: utf-8 -*-
+"""
+ALULA design revision history.
+
+Records each calculated state of a design (its inputs and component table)
+as a revision in an append-only store, so that edits can be undone and
+redone, any two revisions compared (inputs, components and the resulting
+outputs) and the whole history replayed to regenerate result trends.
+
+A revision is stored as a delta against its parent: only the inputs that
+changed and the slice of the component table that was replaced. Every
+KEYFRAME_INTERVAL revisions along a line of edits a full snapshot is stored
+instead, so rebuilding any revision applies a bounded number of deltas.
+Outputs are not stored; they are regenerated by evaluating the rebuilt
+state (through a result cache in the GUI), which keeps thousands of
+revisions down to a few hundred bytes each.
+
+Undo moves to the parent revision and redo back along the revisions just
+undone. Recording after an undo starts a new branch; nothing is ever
+deleted. The history of a saved design lives in a sidecar file next to it
+(`sidecar_path`), one JSON line per revision, appended as revisions are
+recorded:
+
+    history = alula_history.open_history("my_design.json")
+    print("\\n".join(alula_history.format_diff(history.diff(0, len(history) - 1))))
+
+Command line usage (see `python ALULA.py history --help`):
+
+    python ALULA.py history my_design.json --trend VH ROC -o trend.csv
+"""
+
+import csv
+import json
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import alula_components
+import alula_engine
+
+FORMAT_VERSION = 1
+SIDECAR_SUFFIX = '.history.jsonl'
+KEYFRAME_INTERVAL = 64 # Most deltas applied to rebuild a revision
+TREND_KEYS: Tuple[str, ...] = ("Empty Weight", "Gross Weight", "Stall Speed", "VH", "ROC")
+
+Row = Tuple[str, str, str, str] # A component table row as displayed: name, weight, arm, category
+# Replaced rows of a component table: rows[start:stop] of the parent's table become `rows`
+TableDelta = Tuple[int, int, Tuple[Row, ...]]
+
+
+class DesignState(NamedTuple):
+    """A design's inputs and component table at one revision."""
+    inputs: Dict[str, Any]
+    components: Tuple[Row, ...]
+
+    def record(self) -> Dict[str, Any]:
+        """Returns the state as a design record (the format written by "Save Design...")."""
+        return alula_engine.design_record(self.inputs, [dict(zip(alula_components.FIELDS, row)) for row in self.components])
+
+
+class Revision(NamedTuple):
+    """
+    One revision of the store. A keyframe (depth 0) holds every input and
+    the whole component table; any other revision holds the inputs whose
+    values differ from its parent's and the replaced slice of the parent's
+    component table (None if the table did not change).
+    """
+    parent: int # -1 for the first revision
+    time: float
+    depth: int # Deltas since the last keyframe along the parent chain
+    inputs: Tuple[Tuple[str, Any], ...]
+    components: Optional[TableDelta]
+
+
+def table_delta(old: Tuple[Row, ...], new: Tuple[Row, ...]) -> Optional[TableDelta]:
+    """
+    Returns the delta turning the component table `old` into `new`: the rows
+    between their common leading and trailing rows. None if they are equal.
+    """
+    if old == new:
+        return None
+    limit = min(len(old), len(new))
+    start = 0
+    while start < limit and old[start] == new[start]:
+        start += 1
+    end = 0
+    while end < limit - start and old[-1 - end] == new[-1 - end]:
+        end += 1
+    return start, len(old) - end, tuple(new[start:len(new) - end])
+
+
+def apply_table_delta(rows: Tuple[Row, ...], delta: Optional[TableDelta]) -> Tuple[Row, ...]:
+    """Applies a table_delta to a component table."""
+    if delta is None:
+        return rows
+    start, stop, replacement = delta
+    return rows[:start] + replacement + rows[stop:]
+
+
+def sidecar_path(design_path: str) -> str:
+    """Returns the path of the revision history kept next to a design file."""
+    return os.path.splitext(design_path)[0] + SIDECAR_SUFFIX
+
+
+class RevisionHistory:
+    """
+    The revisions of one design, in recording order, with a cursor on the
+    current revision. If `path` is set, each recorded revision is appended
+    to that file as well.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.revisions: List[Revision] = []
+        self.current = -1
+        self._state: Optional[DesignState] = None # State of the current revision
+        self._redo: List[int] = [] # Revisions undone since the last one was recorded, most recent last
+
+    def __len__(self) -> int:
+        return len(self.revisions)
+
+    @property
+    def can_undo(self) -> bool:
+        return self.current >= 0 and self.revisions[self.current].parent >= 0
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    @classmethod
+    def open(cls, path: str) -> "RevisionHistory":
+        """
+        Reads a history file and returns the history, positioned on its last
+        revision and appending to the file. A last line cut short (e.g. by a
+        crash while writing it) is ignored; raises OSError and ValueError for
+        unreadable files.
+        """
+        history = cls()
+        with open(path, 'r', encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        if not lines or json.loads(lines[0]).get('alula_history') != FORMAT_VERSION:
+            raise ValueError(f"{path} is not an ALULA revision history (format {FORMAT_VERSION})")
+        for number, line in enumerate(lines[1:], start=2):
+            try:
+                history.revisions.append(_revision_from_json(json.loads(line)))
+            except (ValueError, KeyError, TypeError) as e:
+                if number == len(lines):
+                    break
+                raise ValueError(f"{path}, line {number}: {e}")
+        if history.revisions:
+            history.checkout(len(history.revisions) - 1)
+        history.path = path
+        return history
+
+    def save(self, path: str):
+        """Writes the whole history to a file and appends later revisions to it."""
+        with open(path, 'w', encoding="utf-8", newline='\n') as f:
+            f.write(json.dumps({'alula_history': FORMAT_VERSION}) + "\n")
+            f.writelines(_revision_to_json(revision) + "\n" for revision in self.revisions)
+        self.path = path
+
+    def record(self, inputs: Dict[str, Any], components: Optional[Sequence[Sequence[str]]] = None) -> Optional[int]:
+        """
+        Records a design state as a new revision following the current one
+        and makes it current. `components` are the component table rows as
+        displayed, or None if the table is unchanged since the current
+        revision. Returns the new revision's number, or None (and records
+        nothing) if the state is the current revision's. Raises OSError if
+        the revision could not be appended to the history file; it is kept
+        in memory regardless.
+        """
+        inputs = dict(inputs)
+        parent = self._state
+        if components is not None:
+            rows = tuple(tuple(row) for row in components)
+        else:
+            rows = parent.components if parent is not None else ()
+        if parent is None or self.revisions[self.current].depth + 1 >= KEYFRAME_INTERVAL or parent.inputs.keys() - inputs.keys():
+            revision = Revision(self.current, time.time(), 0, tuple(inputs.items()), (0, 0, rows))
+        else:
+            changed = tuple((key, value) for key, value in inputs.items() if key not in parent.inputs or parent.inputs[key] != value)
+            delta = table_delta(parent.components, rows)
+            if not changed and delta is None:
+                return None
+            revision = Revision(self.current, time.time(), self.revisions[self.current].depth + 1, changed, delta)
+
+        self.revisions.append(revision)
+        self.current = len(self.revisions) - 1
+        self._state = DesignState(inputs, rows)
+        self._redo.clear()
+        if self.path:
+            self._append(revision)
+        return self.current
+
+    def _append(self, revision: Revision):
+        """Appends a revision to the history file, starting the file if it does not exist yet."""
+        new_file = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        with open(self.path, 'a', encoding="utf-8", newline='\n') as f:
+            if new_file:
+                f.write(json.dumps({'alula_history': FORMAT_VERSION}) + "\n")
+                f.writelines(_revision_to_json(r) + "\n" for r in self.revisions[:-1]) # Recorded before the file existed
+            f.write(_revision_to_json(revision) + "\n")
+
+    def state(self, number: int) -> DesignState:
+        """Rebuilds the design state of a revision from its keyframe and the deltas since."""
+        if number == self.current and self._state is not None:
+            return self._state
+        chain = [self.revisions[number]]
+        while chain[-1].depth > 0:
+            chain.append(self.revisions[chain[-1].parent])
+        keyframe = chain.pop()
+        inputs, rows = dict(keyframe.inputs), keyframe.components[2]
+        for revision in reversed(chain):
+            inputs.update(revision.inputs)
+            rows = apply_table_delta(rows, revision.components)
+        return DesignState(inputs, rows)
+
+    def iter_states(self, stop: Optional[int] = None) -> Iterator[Tuple[int, DesignState]]:
+        """
+        Yields (revision number, state) for every revision in recording
+        order, up to `stop` (default: all). Consecutive revisions are rebuilt
+        from the previous state, one delta at a time.
+        """
+        previous: Optional[DesignState] = None
+        for number, revision in enumerate(self.revisions[:stop]):
+            if revision.depth == 0 or previous is None or revision.parent != number - 1:
+                previous = self.state(number)
+            else:
+                inputs = dict(previous.inputs)
+                inputs.update(revision.inputs)
+                previous = DesignState(inputs, apply_table_delta(previous.components, revision.components))
+            yield number, previous
+
+    def checkout(self, number: int) -> DesignState:
+        """Makes a revision current and returns its state."""
+        self._state = None
+        self._state = self.state(number)
+        self.current = number
+        self._redo.clear()
+        return self._state
+
+    def undo(self) -> Optional[DesignState]:
+        """Moves to the current revision's parent and returns its state (None if there is nothing to undo)."""
+        if not self.can_undo:
+            return None
+        undone, parent = self.current, self.revisions[self.current].parent
+        redo = self._redo + [undone]
+        state = self.checkout(parent)
+        self._redo = redo
+        return state
+
+    def redo(self) -> Optional[DesignState]:
+        """Moves back to the revision most recently undone and returns its state (None if there is none)."""
+        if not self._redo:
+            return None
+        redo = self._redo[:-1]
+        state = self.checkout(self._redo[-1])
+        self._redo = redo
+        return state
+
+    def diff(self, a: int, b: int, evaluate: Callable[[Dict[str, Any]], Dict[str, Any]] = alula_engine.evaluate_design) -> Dict[str, Any]:
+        """
+        Compares two revisions. Returns the inputs that differ and the
+        results that differ (both as {key: (value in a, value in b)}; the
+        results are regenerated with `evaluate`), and the component rows
+        changed, as (operation, rows in a, rows in b) with operation
+        'replace', 'delete' or 'insert'.
+        """
+        import difflib
+        old, new = self.state(a), self.state(b)
+        inputs = {key: (old.inputs.get(key), new.inputs.get(key))
+                  for key in dict.fromkeys([*old.inputs, *new.inputs]) if old.inputs.get(key) != new.inputs.get(key)}
+        matcher = difflib.SequenceMatcher(None, old.components, new.components, autojunk=False)
+        components = [(tag, old.components[i1:i2], new.components[j1:j2])
+                      for tag, i1, i2, j1, j2 in matcher.get_opcodes() if tag != 'equal']
+        old_calc, new_calc = _evaluate(evaluate, old), _evaluate(evaluate, new)
+        results = {key: (old_calc.get(key), new_calc.get(key))
+                   for key in dict.fromkeys([*old_calc, *new_calc]) if old_calc.get(key) != new_calc.get(key)}
+        return {'revisions': (a, b), 'inputs': inputs, 'components': components, 'results': results}
+
+    def trend(self, keys: Sequence[str] = TREND_KEYS, evaluate: Callable[[Dict[str, Any]], Dict[str, Any]] = alula_engine.evaluate_design,
+              stop: Optional[int] = None, progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, List[Any]]:
+        """
+        Replays the history (up to `stop`) and returns result trends: one
+        list per key with the value at each revision (None where a result
+        does not apply or the design could not be evaluated), plus the
+        'Revision' numbers and their 'Time'. `progress(done, total)` is
+        called after each revision.
+        """
+        total = len(self.revisions[:stop])
+        trend: Dict[str, List[Any]] = {'Revision': [], 'Time': [], **{key: [] for key in keys}}
+        for number, state in self.iter_states(stop):
+            calc = _evaluate(evaluate, state)
+            trend['Revision'].append(number)
+            trend['Time'].append(self.revisions[number].time)
+            for key in keys:
+                trend[key].append(calc.get(key))
+            if progress is not None:
+                progress(number + 1, total)
+        return trend
+
+
+def _evaluate(evaluate: Callable[[Dict[str, Any]], Dict[str, Any]], state: DesignState) -> Dict[str, Any]:
+    """Evaluates a state's design record; an empty dictionary if it cannot be evaluated."""
+    try:
+        return evaluate(state.record())
+    except (ValueError, KeyError, TypeError, ZeroDivisionError, OverflowError):
+        return {}
+
+
+def _revision_to_json(revision: Revision) -> str:
+    """Encodes a revision as one line of a history file."""
+    entry: Dict[str, Any] = {'parent': revision.parent, 'time': round(revision.time, 3), 'depth': revision.depth,
+                             'inputs': dict(revision.inputs)}
+    if revision.components is not None:
+        start, stop, rows = revision.components
+        entry['components'] = [start, stop, [list(row) for row in rows]]
+    return json.dumps(entry, ensure_ascii=False, separators=(',', ':'))
+
+
+def _revision_from_json(entry: Dict[str, Any]) -> Revision:
+    """Decodes a line of a history file."""
+    components = entry.get('components')
+    if components is not None:
+        start, stop, rows = components
+        components = (int(start), int(stop), tuple(tuple(str(value) for value in row) for row in rows))
+    return Revision(int(entry['parent']), float(entry['time']), int(entry['depth']), tuple(entry['inputs'].items()), components)
+
+
+def open_history(design_path: str) -> RevisionHistory:
+    """
+    Returns the revision history of a design file: read from its sidecar
+    file if there is one, otherwise a new history that will be written
+    there as revisions are recorded.
+    """
+    path = sidecar_path(design_path)
+    return RevisionHistory.open(path) if os.path.exists(path) else RevisionHistory(path)
+
+
+def _format_value(value: Any) -> str:
+    """Formats an input or result value for a diff."""
+    if isinstance(value, float):
+        return f"{value:,.4g}" if abs(value) < 1e4 else f"{value:,.0f}"
+    return "-" if value is None else str(value)
+
+
+def format_diff(diff: Dict[str, Any]) -> List[str]:
+    """Formats a RevisionHistory.diff as report lines for the console or the GUI."""
+    a, b = diff['revisions']
+    lines = [f"Revision {a} -> {b}"]
+    for title, changes in (("Inputs", diff['inputs']), ("Results", diff['results'])):
+        lines.append(f"  {title}:" if changes else f"  {title}: no change")
+        lines.extend(f"    {key}: {_format_value(old)} -> {_format_value(new)}" for key, (old, new) in changes.items())
+    lines.append("  Components:" if diff['components'] else "  Components: no change")
+    for tag, old_rows, new_rows in diff['components']:
+        lines.extend(f"    - {', '.join(row)}" for row in old_rows)
+        lines.extend(f"    + {', '.join(row)}" for row in new_rows)
+    return lines
+
+
+def format_revisions(history: RevisionHistory) -> List[str]:
+    """Lists the revisions of a history, one line each, with what each one changed."""
+    lines = []
+    for number, revision in enumerate(history.revisions):
+        stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(revision.time))
+        if revision.depth == 0 and revision.parent < 0:
+            change = "initial design"
+        elif revision.depth == 0:
+            change = "snapshot"
+        else:
+            change = ", ".join(key for key, _ in revision.inputs)
+            if revision.components is not None:
+                change += ("; " if change else "") + "components"
+        marker = "*" if number == history.current else " "
+        lines.append(f"{marker}{number:>5}  {stamp}  from {revision.parent:>5}  {change}")
+    return lines
+
+
+def write_trend(trend: Dict[str, List[Any]], output):
+    """Writes result trends to an open text file as a CSV table, one row per revision."""
+    writer = csv.writer(output)
+    writer.writerow(list(trend))
+    writer.writerows(["" if value is None else value for value in row] for row in zip(*trend.values()))
+
+
+def add_parser(subparsers):
+    """Registers the 'history' command with the ALULA command line parser."""
+    parser = subparsers.add_parser('history', help="List, compare or replay a design's revision history",
+                                   description="Reads the revision history kept next to a design file and lists its "
+                                               "revisions, compares two of them (inputs, components and results) or "
+                                               "replays them all to regenerate result trends.")
+    parser.add_argument('design', help=f"Design JSON file (its history is the '{SIDECAR_SUFFIX}' file next to it)")
+    parser.add_argument('--diff', nargs=2, type=int, metavar=('A', 'B'), help="Compare revisions A and B")
+    parser.add_argument('--trend', nargs='*', metavar='RESULT',
+                        help=f"Replay the history and print the given results per revision (default: {', '.join(TREND_KEYS)})")
+    parser.add_argument('-o', '--output', help="Write the trends to this CSV file instead of printing them")
+    parser.set_defaults(func=run_command)
+
+
+def run_command(args) -> int:
+    """Runs the 'history' command from parsed command line arguments."""
+    path = sidecar_path(args.design)
+    try:
+        history = RevisionHistory.open(path)
+        if args.diff:
+            for number in args.diff:
+                if not 0 <= number < len(history):
+                    raise ValueError(f"No revision {number} (the history has {len(history)})")
+    except (OSError, ValueError) as e:
+        print(f"history: {e}", file=sys.stderr)
+        return 2
+
+    if args.diff:
+        print("\n".join(format_diff(history.diff(*args.diff))))
+    elif args.trend is not None:
+        trend = history.trend(args.trend or TREND_KEYS)
+        if args.output:
+            with open(args.output, 'w', encoding="utf-8", newline='') as f:
+                write_trend(trend, f)
+            print(f"Trends of {len(history)} revisions written to {args.output}")
+        else:
+            write_trend(trend, sys.stdout)
+    else:
+        print("\n".join(format_revisions(history)))
+        print(f"{len(history)} revisions in {path}")
+    return 0
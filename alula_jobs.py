@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+ALULA background jobs.
+
+Runs long analyses (sweeps, Monte Carlo runs, ...) on worker threads so the
+GUI stays responsive. Jobs never touch Tk themselves: they report progress
+and partial results through a queue, which the GUI drains from its main loop
+with `after()` by calling `JobRunner.poll()`. Jobs can be cancelled; the
+request is noticed the next time the job reports progress.
+
+    runner = alula_jobs.JobRunner()
+    runner.submit("Sweep", my_job, record)  # my_job(ctx, record) calls ctx.report(done, total)
+    for event in runner.poll(): ...         # from the GUI thread, e.g. every 100 ms
+"""
+
+import queue
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+# Minimum time between progress events from one job (seconds)
+PROGRESS_INTERVAL_S = 0.1
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when it reports progress after being cancelled."""
+
+
+class JobEvent(NamedTuple):
+    """
+    A message from a job to the GUI. `kind` is 'progress', 'done', 'failed'
+    or 'cancelled'. For 'done' events `result` holds the job's return value,
+    for 'progress' events any partial result the job posted, and for
+    'failed' events the formatted traceback.
+    """
+    job_id: int
+    name: str
+    kind: str
+    done: int = 0
+    total: int = 0
+    message: str = ""
+    result: Any = None
+
+
+class JobContext:
+    """
+    Handed to every job function as its first argument; lets the job
+    report progress and find out whether it has been cancelled.
+    """
+
+    def __init__(self, job_id: int, name: str, events: "queue.Queue[JobEvent]", cancel_event: threading.Event):
+        self.job_id = job_id
+        self.name = name
+        self._events = events
+        self._cancel_event = cancel_event
+        self._last_report = 0.0
+
+    @property
+    def cancelled(self) -> bool:
+        """True once cancellation of this job has been requested."""
+        return self._cancel_event.is_set()
+
+    def check_cancelled(self):
+        """Raises JobCancelled if cancellation has been requested."""
+        if self._cancel_event.is_set():
+            raise JobCancelled()
+
+    def report(self, done: int, total: int, message: str = "", partial: Any = None):
+        """
+        Posts progress (and optionally a partial result) to the GUI, at most
+        every PROGRESS_INTERVAL_S unless the job is complete, then raises
+        JobCancelled if the job has been cancelled.
+        """
+        now = time.monotonic()
+        if done >= total or now - self._last_report >= PROGRESS_INTERVAL_S:
+            self._last_report = now
+            self._events.put(JobEvent(self.job_id, self.name, 'progress', done, total, message, partial))
+        self.check_cancelled()
+
+
+class Job(NamedTuple):
+    """A submitted job: its id, display name, future and cancel flag."""
+    job_id: int
+    name: str
+    future: Any
+    cancel_event: threading.Event
+
+
+class JobRunner:
+    """
+    Executes job functions `fn(ctx, *args, **kwargs)` on a thread pool and
+    collects their events for the GUI. A job may itself start a process
+    pool (as the sweep does) for CPU-bound work.
+    """
+
+    def __init__(self, max_workers: int = 1):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="alula-job")
+        self._events: "queue.Queue[JobEvent]" = queue.Queue()
+        self._jobs: Dict[int, Job] = {}
+        self._next_id = 1
+
+    def submit(self, name: str, fn: Callable[..., Any], *args, **kwargs) -> Job:
+        """Queues a job and returns its handle."""
+        job_id = self._next_id
+        self._next_id += 1
+        cancel_event = threading.Event()
+        context = JobContext(job_id, name, self._events, cancel_event)
+        future = self._executor.submit(self._run, context, fn, args, kwargs)
+        job = Job(job_id, name, future, cancel_event)
+        self._jobs[job_id] = job
+        return job
+
+    def _run(self, context: JobContext, fn: Callable[..., Any], args, kwargs):
+        """Worker thread body: runs a job and posts its final event."""
+        try:
+            context.check_cancelled() # Cancelled while still queued
+            result = fn(context, *args, **kwargs)
+        except JobCancelled:
+            self._events.put(JobEvent(context.job_id, context.name, 'cancelled', message="Cancelled"))
+        except Exception as e: # Reported to the GUI instead of dying silently on the worker thread
+            self._events.put(JobEvent(context.job_id, context.name, 'failed', message=str(e), result=traceback.format_exc()))
+        else:
+            self._events.put(JobEvent(context.job_id, context.name, 'done', message="Finished", result=result))
+
+    def poll(self) -> List[JobEvent]:
+        """
+        Returns all events posted since the last call without blocking.
+        Must be called from the GUI thread; finished jobs are forgotten once
+        their final event has been returned.
+        """
+        events = []
+        while True:
+            try:
+                event = self._events.get_nowait()
+            except queue.Empty:
+                break
+            if event.kind != 'progress':
+                self._jobs.pop(event.job_id, None)
+            events.append(event)
+        return events
+
+    @property
+    def active_jobs(self) -> List[Job]:
+        """Jobs that are queued or running (or finished but not yet polled)."""
+        return list(self._jobs.values())
+
+    def cancel(self, job_id: Optional[int] = None):
+        """Requests cancellation of one job, or of every active job if no id is given."""
+        for job in self.active_jobs:
+            if job_id is None or job.job_id == job_id:
+                job.cancel_event.set()
+
+    def shutdown(self, cancel: bool = True):
+        """Stops accepting jobs, optionally cancelling the active ones, without waiting for them."""
+        if cancel:
+            self.cancel()
+        self._executor.shutdown(wait=False)
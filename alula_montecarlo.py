@@ -0,0 +1,291 @@
+# -*- coding: utf-8 -*-
+"""
+ALULA Monte Carlo uncertainty analysis.
+
+Component weights and aerodynamic coefficients are estimates. This module
+draws a large number of samples from a distribution per uncertain input
+(e.g. +/-10% on every component weight, a range on cl_max), pushes them
+through the batch kernels in `alula_vector` as arrays and reports the
+probability of meeting each FAR Part 103 limit together with percentile
+bands for VH, stall speed and empty weight.
+
+Requires NumPy. Command line usage (see `python ALULA.py montecarlo --help`):
+
+    python ALULA.py montecarlo base.json -v "weight:*=pct:10" -v cl_max=uniform:1.3:1.6 -n 1000000
+"""
+
+import json
+import sys
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+import alula_engine
+import alula_vector
+from alula_vector import np
+
+DISTRIBUTION_KINDS = ('pct', 'uniform', 'normal')
+DEFAULT_PERCENTILES = (5.0, 50.0, 95.0)
+# Results reported with percentile bands: report name -> calculation keys to try in order
+REPORTED_RESULTS = {
+    "VH": ["VH"],
+    "Stall Speed": ["Stall Speed", "Min. Fwd Speed"],
+    "Empty Weight": ["Empty Weight"],
+}
+# Part 103 limit name -> report name of the result it applies to
+LIMIT_RESULTS = {"Empty Weight": "Empty Weight", "Stall Speed": "Stall Speed", "Max Level Speed": "VH"}
+# Numeric inputs that cannot be negative (weights, geometry, coefficients, power); their
+# samples are clipped at zero. Positions (LEMAC, neutral point, component arms), the
+# field elevation and the ISA temperature offset are signed and sampled unclipped.
+NON_NEGATIVE_INPUTS = frozenset({
+    'pilot_weight', 'wing_area', 'wing_span', 'aspect_ratio', 'fuselage_length', 'cl_max', 'cl_max_flaps',
+    'cd0', 'oswald_efficiency', 'engine_hp', 'prop_efficiency', 'rotor_diameter', 'rotor_blade_chord',
+    'rotor_rpm', 'num_blades', 'rotor_blade_cd', 'envelope_volume',
+})
+
+
+class Distribution(NamedTuple):
+    """
+    Uncertainty on one design parameter. `key` is a design input,
+    'weight:<component>' / 'arm:<component>', or 'weight:*' / 'arm:*' for
+    every component. `kind` is one of DISTRIBUTION_KINDS:
+      pct      uniform within +/- params[0] percent of the design value
+      uniform  uniform between params[0] and params[1]
+      normal   normal around the design value with standard deviation params[0]
+    """
+    key: str
+    kind: str
+    params: tuple
+
+
+def parse_distribution(spec: str) -> Distribution:
+    """
+    Parses a 'key=kind:params' specification, e.g. 'weight:*=pct:10',
+    'cl_max=uniform:1.3:1.6' or 'cd0=normal:0.003'.
+    """
+    key, sep, dist = spec.partition('=')
+    key, dist = key.strip(), dist.strip()
+    kind, _, params_text = dist.partition(':')
+    kind = kind.strip().lower()
+    if not sep or not key or kind not in DISTRIBUTION_KINDS:
+        raise ValueError(f"Invalid distribution {spec!r}; expected KEY=pct:P, KEY=uniform:LO:HI or KEY=normal:SD")
+    try:
+        params = tuple(float(p) for p in params_text.split(':'))
+    except ValueError:
+        raise ValueError(f"Invalid parameters {params_text!r} for {key!r}") from None
+    expected = 2 if kind == 'uniform' else 1
+    if len(params) != expected:
+        raise ValueError(f"Distribution {kind!r} for {key!r} takes {expected} parameter(s)")
+    if kind == 'uniform' and params[1] < params[0]:
+        raise ValueError(f"Uniform range for {key!r} must have HI >= LO")
+    if kind != 'uniform' and params[0] < 0:
+        raise ValueError(f"Spread for {key!r} must not be negative")
+    return Distribution(key, kind, params)
+
+
+def sample_distribution(dist: Distribution, nominal: float, rng, count: int,
+                        non_negative: bool = True) -> "np.ndarray":
+    """
+    Draws `count` samples for a distribution centred on the design's nominal
+    value. With `non_negative` (for weights, geometry and coefficients, see
+    NON_NEGATIVE_INPUTS) samples are clipped at zero; signed quantities such
+    as component arms and the ISA temperature offset are left as drawn.
+    """
+    if dist.kind == 'pct':
+        spread = abs(nominal) * dist.params[0] / 100
+        values = rng.uniform(nominal - spread, nominal + spread, count)
+    elif dist.kind == 'uniform':
+        values = rng.uniform(dist.params[0], dist.params[1], count)
+    else:
+        values = rng.normal(nominal, dist.params[0], count)
+    return np.maximum(values, 0.0) if non_negative else values
+
+
+class MonteCarloModel(NamedTuple):
+    """
+    A base design prepared for sampling: the normalized inputs, the valid
+    component rows as (name, weight, arm) and the distribution assigned to
+    each input and each component weight/arm (None for fixed values).
+    """
+    inputs: Dict[str, Any]
+    components: List[tuple]
+    input_dists: Dict[str, Distribution]
+    weight_dists: List[Optional[Distribution]]
+    arm_dists: List[Optional[Distribution]]
+
+
+def build_model(record: Dict[str, Any], distributions: Sequence[Distribution]) -> MonteCarloModel:
+    """
+    Assigns distributions to the inputs and component rows of a design.
+    Component specific entries take precedence over 'weight:*' / 'arm:*'.
+    Raises KeyError for unknown inputs or components and ValueError for
+    inputs that are not numeric.
+    """
+    record = alula_engine.copy_design_record(record)
+    inputs = record['main_inputs']
+    components = []
+    for entry in record['component_weights']:
+        try:
+            components.append((entry.get('name', ''), float(entry['weight']), float(entry['arm'])))
+        except (ValueError, TypeError, KeyError):
+            continue # Invalid rows are ignored, as in calculate_weight_and_balance
+    names = [name for name, _, _ in components]
+
+    input_dists: Dict[str, Distribution] = {}
+    component_dists: Dict[str, List[Optional[Distribution]]] = {'weight': [None] * len(components), 'arm': [None] * len(components)}
+    # Apply wildcards first so that named components override them
+    for dist in sorted(distributions, key=lambda d: not d.key.endswith(':*')):
+        field, sep, name = dist.key.partition(':')
+        if sep and field in component_dists:
+            if name == '*':
+                component_dists[field] = [dist] * len(components)
+            elif name in names:
+                component_dists[field][names.index(name)] = dist
+            else:
+                raise KeyError(f"No component named {name!r} in the design")
+        elif dist.key not in alula_engine.DEFAULT_INPUTS:
+            raise KeyError(f"Unknown design input {dist.key!r}")
+        elif isinstance(alula_engine.DEFAULT_INPUTS[dist.key], bool) or dist.key in ('vehicle_type', 'cockpit_style', 'tail_style', 'glider_class', 'airfoil'):
+            raise ValueError(f"Design input {dist.key!r} is not numeric")
+        else:
+            input_dists[dist.key] = dist
+    return MonteCarloModel(inputs, components, input_dists, component_dists['weight'], component_dists['arm'])
+
+
+def evaluate_samples(model: MonteCarloModel, rng, count: int) -> Dict[str, "np.ndarray"]:
+    """
+    Draws `count` samples of the model and evaluates them with the batch
+    kernels, returning the result arrays.
+    """
+    columns = {key: sample_distribution(dist, alula_engine.get_input_value(model.inputs, key), rng, count,
+                                        key in NON_NEGATIVE_INPUTS)
+               for key, dist in model.input_dists.items()}
+
+    empty_weight = np.zeros(count)
+    moment = np.zeros(count)
+    for (_, weight, arm), w_dist, a_dist in zip(model.components, model.weight_dists, model.arm_dists):
+        w = sample_distribution(w_dist, weight, rng, count) if w_dist else weight
+        a = sample_distribution(a_dist, arm, rng, count, non_negative=False) if a_dist else arm
+        empty_weight += w
+        moment += w * a
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cg_location = np.where(empty_weight > 0, moment / empty_weight, 0.0)
+    return alula_vector.evaluate_batch(model.inputs, columns, empty_weight, cg_location)
+
+
+def run_monte_carlo(record: Dict[str, Any], distributions: Sequence[Distribution], samples: int = 1_000_000,
+                    seed: Optional[int] = None, chunk_size: int = 250_000,
+                    percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+                    progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, Any]:
+    """
+    Runs a Monte Carlo analysis of a design and returns a summary dictionary
+    holding the probability of meeting each Part 103 limit (and all of them
+    at once) and the requested percentiles of VH, stall speed and empty
+    weight. Samples are evaluated in chunks to bound memory use;
+    `progress(done, samples)` is called after each chunk and may raise to
+    abandon the run.
+    """
+    alula_vector._require_numpy()
+    model = build_model(record, distributions)
+    v_type = model.inputs['vehicle_type']
+    limits = alula_engine.part103_limits(v_type)
+    rng = np.random.default_rng(seed)
+
+    collected: Dict[str, List["np.ndarray"]] = {}
+    passed: Dict[str, int] = {}
+    all_passed = 0
+    done = 0
+    while done < samples:
+        count = min(chunk_size, samples - done)
+        result = evaluate_samples(model, rng, count)
+        chunk_ok = np.ones(count, dtype=bool)
+        for name, keys in REPORTED_RESULTS.items():
+            key = next((k for k in keys if k in result), None)
+            if key is not None:
+                collected.setdefault(name, []).append(np.asarray(result[key], dtype=np.float64))
+        for limit_name, result_name in LIMIT_RESULTS.items():
+            if result_name in collected:
+                ok = collected[result_name][-1] <= limits[limit_name]
+                passed[limit_name] = passed.get(limit_name, 0) + int(ok.sum())
+                chunk_ok &= ok
+        all_passed += int(chunk_ok.sum())
+        done += count
+        if progress is not None:
+            progress(done, samples)
+
+    values = {name: np.concatenate(chunks) for name, chunks in collected.items()}
+    nominal = alula_engine.part103_compliance(v_type, alula_engine.evaluate_design(record))
+    return {
+        'vehicle_type': v_type,
+        'samples': samples,
+        'seed': seed,
+        'distributions': {d.key: ':'.join([d.kind] + [f"{p:g}" for p in d.params]) for d in distributions},
+        'compliance': {
+            **{name: {'limit': limits[name], 'nominal': nominal[name]['value'] if name in nominal else None,
+                      'probability': count / samples} for name, count in passed.items()},
+            'All Limits': {'probability': all_passed / samples},
+        },
+        'percentiles': {
+            name: {f"P{p:g}": float(v) for p, v in zip(percentiles, np.percentile(data, percentiles))}
+            for name, data in values.items()
+        },
+        'mean': {name: float(data.mean()) for name, data in values.items()},
+    }
+
+
+def format_summary(summary: Dict[str, Any]) -> List[str]:
+    """Formats a Monte Carlo summary as report lines for the console or the GUI."""
+    lines = ["Probability of meeting Part 103 limits:"]
+    for name, entry in summary['compliance'].items():
+        limit = f" (limit {entry['limit']})" if 'limit' in entry else ""
+        lines.append(f"  {name}{limit}: {entry['probability'] * 100:.2f}%")
+    lines.append("Percentiles:")
+    for name, bands in summary['percentiles'].items():
+        lines.append(f"  {name}: " + ", ".join(f"{p} {v:.1f}" for p, v in bands.items()))
+    return lines
+
+
+def add_parser(subparsers):
+    """Registers the 'montecarlo' command with the ALULA command line parser."""
+    parser = subparsers.add_parser('montecarlo', help="Estimate Part 103 compliance under input uncertainty",
+                                   description="Samples uncertain inputs and component weights, evaluates every sample with "
+                                               "the vectorized kernels and reports the probability of meeting each Part 103 "
+                                               "limit with percentile bands for VH, stall speed and empty weight. Requires NumPy.")
+    parser.add_argument('base', help="Base design JSON file (as written by 'Save Design...')")
+    parser.add_argument('-v', '--vary', dest='distributions', action='append', required=True, metavar='KEY=DIST',
+                        help="Uncertainty on one input: pct:P (+/-P%% uniform), uniform:LO:HI or normal:SD. Keys are design "
+                             "inputs, weight:<component>/arm:<component> or weight:*/arm:* for all components. Repeat for more inputs.")
+    parser.add_argument('-n', '--samples', type=int, default=1_000_000, help="Number of samples (default: 1000000)")
+    parser.add_argument('--seed', type=int, help="Random seed for reproducible results")
+    parser.add_argument('-p', '--percentile', dest='percentiles', type=float, action='append', metavar='P',
+                        help="Percentile to report (default: 5, 50 and 95). Repeat for more percentiles.")
+    parser.add_argument('--chunk-size', type=int, default=250_000, help="Samples evaluated per batch (default: 250000)")
+    parser.add_argument('-o', '--output', help="Also write the summary to this JSON file")
+    parser.set_defaults(func=run_command)
+
+
+def run_command(args) -> int:
+    """Runs the 'montecarlo' command from parsed command line arguments."""
+    try:
+        alula_vector._require_numpy()
+        base = alula_engine.load_design_file(args.base)
+        distributions = [parse_distribution(spec) for spec in args.distributions]
+        build_model(base, distributions) # Validate keys before sampling
+        percentiles = sorted(set(args.percentiles or DEFAULT_PERCENTILES))
+        if args.samples < 1 or not all(0 <= p <= 100 for p in percentiles):
+            raise ValueError("samples must be positive and percentiles between 0 and 100")
+    except (ImportError, IOError, json.JSONDecodeError, ValueError, KeyError) as e:
+        print(f"montecarlo: {e.args[0] if isinstance(e, KeyError) else e}", file=sys.stderr)
+        return 2
+
+    start = time.perf_counter()
+    summary = run_monte_carlo(base, distributions, samples=args.samples, seed=args.seed,
+                              chunk_size=max(1, args.chunk_size), percentiles=percentiles)
+    elapsed = time.perf_counter() - start
+    print(f"{summary['vehicle_type']}: {args.samples} samples in {elapsed:.2f} s")
+    print("\n".join(format_summary(summary)))
+
+    if args.output:
+        with open(args.output, 'w', encoding="utf-8") as f:
+            json.dump(summary, f, indent=4)
+        print(f"Summary written to {args.output}")
+    return 0
@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+"""
+ALULA design optimizer.
+
+Searches continuous design inputs (e.g. wing_area, wing_span, cd0, engine_hp
+and component weights) within bounds to minimize or maximize one calculated
+output, subject to the FAR Part 103 limits checked by
+`alula_engine.part103_compliance` plus any extra constraints given by the
+user. Each start point runs a bounded Nelder-Mead search in its own worker
+process; the best feasible design is written out as a loadable design JSON.
+
+Command line usage (see `python ALULA.py optimize --help`):
+
+    python ALULA.py optimize base.json --var wing_area=150:300 --var engine_hp=10:40 --maximize ROC -o best.json
+"""
+
+import json
+import math
+import os
+import random
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import alula_engine
+
+# Weight of the constraint penalty relative to the (normalized) objective
+PENALTY_WEIGHT = 1e6
+
+
+class Variable(NamedTuple):
+    """A design parameter searched by the optimizer between two bounds."""
+    key: str
+    lower: float
+    upper: float
+
+
+class Constraint(NamedTuple):
+    """An extra 'calculation key <= or >= bound' requirement."""
+    key: str
+    op: str
+    bound: float
+
+
+class OptimizationProblem(NamedTuple):
+    """Everything a worker needs to evaluate candidate designs."""
+    base_record: Dict[str, Any]
+    variables: List[Variable]
+    objective: str
+    maximize: bool
+    constraints: List[Constraint]
+
+
+class StartResult(NamedTuple):
+    """Best point found from one start of the multi-start search."""
+    values: List[float]
+    objective: float
+    violation: float
+    evaluations: int
+
+
+def parse_variable(spec: str) -> Variable:
+    """Parses a 'key=lower:upper' variable specification."""
+    key, sep, bounds = spec.partition('=')
+    try:
+        lower, upper = (float(v) for v in bounds.split(':'))
+    except ValueError:
+        raise ValueError(f"Invalid variable {spec!r}; expected KEY=LOWER:UPPER") from None
+    if not sep or not key.strip() or upper <= lower:
+        raise ValueError(f"Invalid variable {spec!r}; expected KEY=LOWER:UPPER with UPPER > LOWER")
+    return Variable(key.strip(), lower, upper)
+
+
+def parse_constraint(spec: str) -> Constraint:
+    """Parses an extra constraint such as 'ROC>=500' or 'Static Margin<=15'."""
+    match = re.fullmatch(r"\s*(.+?)\s*(<=|>=)\s*([-+0-9.eE]+)\s*", spec)
+    if not match:
+        raise ValueError(f"Invalid constraint {spec!r}; expected KEY<=VALUE or KEY>=VALUE")
+    return Constraint(match.group(1), match.group(2), float(match.group(3)))
+
+
+def apply_values(problem: OptimizationProblem, values: Sequence[float]) -> Dict[str, Any]:
+    """Returns a copy of the base design with the variable values applied."""
+    record = alula_engine.copy_design_record(problem.base_record)
+    for var, value in zip(problem.variables, values):
+        alula_engine.set_design_parameter(record, var.key, value)
+    return record
+
+
+def _result(calc: Dict[str, Any], key: str, what: str, v_type: str) -> float:
+    """Returns a numeric result of a candidate, or raises ValueError naming the offending key."""
+    value = calc.get(key)
+    if not isinstance(value, (int, float)):
+        raise ValueError(f"{what} '{key}' is not a numeric result for {v_type} designs")
+    return value
+
+
+def validate_problem(problem: OptimizationProblem):
+    """
+    Checks a problem before any worker starts: every variable must name a
+    design input or component (KeyError otherwise), and the objective and
+    constraint keys must be numeric results of the base design (ValueError).
+    Errors evaluating the base design itself are raised as they are.
+    """
+    apply_values(problem, [var.lower for var in problem.variables])
+    calc = alula_engine.evaluate_design(problem.base_record)
+    v_type = alula_engine.normalize_inputs(problem.base_record.get('main_inputs'))['vehicle_type']
+    _result(calc, problem.objective, "Objective", v_type)
+    for constraint in problem.constraints:
+        _result(calc, constraint.key, "Constraint key", v_type)
+
+
+def evaluate_candidate(problem: OptimizationProblem, values: Sequence[float]) -> Tuple[float, float, Dict[str, Any]]:
+    """
+    Evaluates one candidate. Returns the objective value, the total relative
+    constraint violation (0 when feasible) and the calculations dictionary.
+    A candidate the engine cannot evaluate (e.g. a zero wing span at a lower
+    bound) is infeasible: its objective is NaN and its violation infinite.
+    """
+    record = apply_values(problem, values)
+    try:
+        calc = alula_engine.evaluate_design(record)
+    except (ValueError, TypeError, ZeroDivisionError, OverflowError):
+        return float('nan'), float('inf'), {}
+    v_type = record['main_inputs']['vehicle_type']
+    objective = _result(calc, problem.objective, "Objective", v_type)
+
+    violation = 0.0
+    for check in alula_engine.part103_compliance(v_type, calc).values():
+        violation += max(0.0, (check["value"] - check["limit"]) / check["limit"])
+    for constraint in problem.constraints:
+        value = _result(calc, constraint.key, "Constraint key", v_type)
+        excess = value - constraint.bound if constraint.op == '<=' else constraint.bound - value
+        violation += max(0.0, excess / max(abs(constraint.bound), 1.0))
+    return float(objective), violation, calc
+
+
+def nelder_mead(f: Callable[[List[float]], float], x0: Sequence[float], step: float = 0.15,
+                max_evals: int = 400, tol: float = 1e-7) -> Tuple[List[float], float, int]:
+    """
+    Minimizes f over the unit hypercube with the Nelder-Mead simplex method.
+    Points are clamped to [0, 1] in every coordinate. Returns the best point,
+    its function value and the number of evaluations used.
+    """
+    clamp = lambda x: [min(1.0, max(0.0, v)) for v in x]
+    n = len(x0)
+    simplex = [clamp(x0)]
+    for i in range(n):
+        point = list(simplex[0])
+        point[i] = point[i] + step if point[i] + step <= 1.0 else point[i] - step
+        simplex.append(clamp(point))
+    scores = [f(p) for p in simplex]
+    evals = len(simplex)
+
+    while evals < max_evals:
+        order = sorted(range(n + 1), key=scores.__getitem__)
+        simplex, scores = [simplex[i] for i in order], [scores[i] for i in order]
+        if abs(scores[-1] - scores[0]) <= tol * (abs(scores[0]) + tol):
+            break
+        centroid = [sum(p[i] for p in simplex[:-1]) / n for i in range(n)]
+        worst = simplex[-1]
+
+        reflected = clamp([c + (c - w) for c, w in zip(centroid, worst)])
+        f_reflected = f(reflected); evals += 1
+        if f_reflected < scores[0]:
+            expanded = clamp([c + 2 * (c - w) for c, w in zip(centroid, worst)])
+            f_expanded = f(expanded); evals += 1
+            simplex[-1], scores[-1] = (expanded, f_expanded) if f_expanded < f_reflected else (reflected, f_reflected)
+        elif f_reflected < scores[-2]:
+            simplex[-1], scores[-1] = reflected, f_reflected
+        else:
+            contracted = clamp([c + 0.5 * (w - c) for c, w in zip(centroid, worst)])
+            f_contracted = f(contracted); evals += 1
+            if f_contracted < scores[-1]:
+                simplex[-1], scores[-1] = contracted, f_contracted
+            else:
+                # Shrink the simplex towards the best point
+                best = simplex[0]
+                for i in range(1, n + 1):
+                    simplex[i] = [b + 0.5 * (p - b) for b, p in zip(best, simplex[i])]
+                    scores[i] = f(simplex[i])
+                evals += n
+
+    best_index = min(range(n + 1), key=scores.__getitem__)
+    return simplex[best_index], scores[best_index], evals
+
+
+def run_start(problem: OptimizationProblem, x0: Sequence[float], max_evals: int) -> StartResult:
+    """
+    Runs one local search from a normalized start point and returns the best
+    point it found in real units. This is the task executed by each worker.
+    """
+    start_objective = evaluate_candidate(problem, _denormalize(problem, x0))[0]
+    scale = max(abs(start_objective), 1.0) if math.isfinite(start_objective) else 1.0
+    sign = -1.0 if problem.maximize else 1.0
+
+    def penalized(x: List[float]) -> float:
+        objective, violation, _ = evaluate_candidate(problem, _denormalize(problem, x))
+        if not math.isfinite(violation):
+            return float('inf') # Not evaluable
+        return sign * objective / scale + PENALTY_WEIGHT * violation
+
+    best_x, _, evals = nelder_mead(penalized, x0, max_evals=max_evals)
+    values = _denormalize(problem, best_x)
+    objective, violation, _ = evaluate_candidate(problem, values)
+    return StartResult(values, objective, violation, evals)
+
+
+def _denormalize(problem: OptimizationProblem, x: Sequence[float]) -> List[float]:
+    """Maps a point of the unit hypercube to variable values."""
+    return [var.lower + xi * (var.upper - var.lower) for var, xi in zip(problem.variables, x)]
+
+
+def optimize(problem: OptimizationProblem, starts: int = 8, workers: int = 1, max_evals: int = 400,
+             seed: Optional[int] = None) -> Tuple[Optional[StartResult], List[StartResult]]:
+    """
+    Runs a multi-start search: the base design (clamped into the bounds) plus
+    `starts - 1` random start points, each optimized independently, in
+    parallel when `workers` > 1. Returns the best feasible result (None if no
+    start reached a feasible design) and the results of every start.
+    """
+    rng = random.Random(seed)
+    base_inputs = alula_engine.copy_design_record(problem.base_record)
+    base_point = []
+    for var in problem.variables:
+        field, _, name = var.key.partition(':')
+        if var.key in base_inputs['main_inputs']:
+            current = alula_engine.get_input_value(base_inputs['main_inputs'], var.key, var.lower)
+        else:
+            current = next((alula_engine.get_input_value(c, field, var.lower) for c in base_inputs['component_weights'] if c.get('name') == name), var.lower)
+        base_point.append(min(1.0, max(0.0, (current - var.lower) / (var.upper - var.lower))))
+    points = [base_point] + [[rng.random() for _ in problem.variables] for _ in range(max(0, starts - 1))]
+
+    if workers <= 1:
+        results = [run_start(problem, x0, max_evals) for x0 in points]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(run_start, [problem] * len(points), points, [max_evals] * len(points)))
+
+    feasible = [r for r in results if r.violation <= 1e-9]
+    if not feasible:
+        return None, results
+    best = max(feasible, key=lambda r: r.objective) if problem.maximize else min(feasible, key=lambda r: r.objective)
+    return best, results
+
+
+def add_parser(subparsers):
+    """Registers the 'optimize' command with the ALULA command line parser."""
+    parser = subparsers.add_parser('optimize', help="Search design inputs for the best Part 103 compliant design",
+                                   description="Minimizes or maximizes a calculated result over bounded design inputs, "
+                                               "keeping empty weight, stall speed and VH within the FAR Part 103 limits.")
+    parser.add_argument('base', help="Base design JSON file (as written by 'Save Design...')")
+    parser.add_argument('--var', dest='variables', action='append', required=True, metavar='KEY=LOWER:UPPER',
+                        help="Continuous input to search, e.g. wing_area=150:300 or weight:Wing=40:80. Repeat for more inputs.")
+    goal = parser.add_mutually_exclusive_group(required=True)
+    goal.add_argument('--maximize', metavar='RESULT', help="Result to maximize, e.g. ROC")
+    goal.add_argument('--minimize', metavar='RESULT', help="Result to minimize, e.g. 'Empty Weight'")
+    parser.add_argument('--constraint', dest='constraints', action='append', default=[], metavar='RESULT<=VALUE',
+                        help="Extra constraint on a result, e.g. 'Static Margin>=5'. Repeat for more constraints.")
+    parser.add_argument('--starts', type=int, default=16, help="Number of start points (default: 16)")
+    parser.add_argument('--max-evals', type=int, default=400, help="Evaluation budget per start (default: 400)")
+    parser.add_argument('--seed', type=int, help="Random seed for reproducible start points")
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count() or 1, help="Worker processes (default: all cores)")
+    parser.add_argument('-o', '--output', help="Write the best design to this JSON file")
+    parser.set_defaults(func=run_command)
+
+
+def run_command(args) -> int:
+    """Runs the 'optimize' command from parsed command line arguments."""
+    try:
+        base = alula_engine.load_design_file(args.base)
+        problem = OptimizationProblem(
+            base_record=alula_engine.copy_design_record(base),
+            variables=[parse_variable(spec) for spec in args.variables],
+            objective=args.maximize or args.minimize,
+            maximize=args.maximize is not None,
+            constraints=[parse_constraint(spec) for spec in args.constraints],
+        )
+        validate_problem(problem) # Validate keys before starting workers
+    except (IOError, json.JSONDecodeError, ValueError, KeyError, TypeError, ZeroDivisionError, OverflowError) as e:
+        print(f"optimize: {e.args[0] if isinstance(e, KeyError) else e}", file=sys.stderr)
+        return 2
+
+    start = time.perf_counter()
+    best, results = optimize(problem, starts=max(1, args.starts), workers=args.workers, max_evals=args.max_evals, seed=args.seed)
+    elapsed = time.perf_counter() - start
+    evaluations = sum(r.evaluations for r in results)
+    print(f"Ran {len(results)} starts ({evaluations} evaluations) in {elapsed:.2f} s.")
+    if best is None:
+        print("No start reached a design that meets the Part 103 limits and constraints.", file=sys.stderr)
+        return 1
+
+    record = apply_values(problem, best.values)
+    calc = alula_engine.evaluate_design(record)
+    v_type = record['main_inputs']['vehicle_type']
+    print(f"Best {problem.objective}: {best.objective:.4g} ({'maximized' if problem.maximize else 'minimized'})")
+    for var, value in zip(problem.variables, best.values):
+        print(f"  {var.key} = {value:.4g}  [{var.lower:g} .. {var.upper:g}]")
+    for name, check in alula_engine.part103_compliance(v_type, calc).items():
+        print(f"  {name}: {check['value']:.1f} (limit {check['limit']})")
+
+    if args.output:
+        record['optimization'] = {
+            'objective': problem.objective,
+            'goal': 'maximize' if problem.maximize else 'minimize',
+            'value': best.objective,
+            'variables': {var.key: value for var, value in zip(problem.variables, best.values)},
+        }
+        with open(args.output, 'w', encoding="utf-8") as f:
+            json.dump(record, f, indent=4)
+        print(f"Best design written to {args.output}")
+    return 0
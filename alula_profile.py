@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+ALULA profiling.
+
+Opt-in wall time and call count instrumentation for the recalculation
+pipeline. Code marks stages with `alula_profile.stage(name)`; while
+profiling is disabled (the default) this returns a shared no-op context, so
+instrumented code pays almost nothing. Stages can also carry an item count,
+which the speed solvers use to record their iterations.
+
+The GUI groups the stages of one recalculation into a frame; finished frames
+can be appended to a JSON-lines log:
+
+    alula_profile.PROFILER.enable(log_path="alula_profile.jsonl")
+    alula_profile.PROFILER.begin_frame("full")
+    with alula_profile.stage("evaluate"): ...
+    alula_profile.PROFILER.end_frame()
+"""
+
+import json
+import time
+from typing import Any, Dict, Optional
+
+
+class StageStats:
+    """Accumulated timings of one stage."""
+    __slots__ = ('calls', 'items', 'total_s', 'last_s', 'max_s')
+
+    def __init__(self):
+        self.calls, self.items = 0, 0
+        self.total_s, self.last_s, self.max_s = 0.0, 0.0, 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        """Returns the statistics in milliseconds, including the mean per call and per item."""
+        return {
+            'calls': self.calls, 'items': self.items,
+            'total_ms': self.total_s * 1000, 'mean_ms': self.total_s * 1000 / self.calls if self.calls else 0.0,
+            'per_item_ms': self.total_s * 1000 / self.items if self.items else 0.0,
+            'last_ms': self.last_s * 1000, 'max_ms': self.max_s * 1000,
+        }
+
+
+class _NullStage:
+    """Context manager that does nothing; returned by stage() while profiling is off."""
+    __slots__ = ()
+    def __enter__(self): return self
+    def __exit__(self, *exc): return False
+    def add_items(self, count: int): pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    """Times one execution of a stage and records it in the profiler."""
+    __slots__ = ('profiler', 'name', 'items', 'start')
+
+    def __init__(self, profiler: "Profiler", name: str):
+        self.profiler, self.name, self.items, self.start = profiler, name, 0, 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, time.perf_counter() - self.start, self.items)
+        return False
+
+    def add_items(self, count: int):
+        """Adds to the item count of this execution (e.g. solver iterations)."""
+        self.items += count
+
+
+class Profiler:
+    """
+    Collects per-stage statistics while enabled. Between begin_frame() and
+    end_frame() the stage times are also gathered into a frame describing a
+    single recalculation, which is kept as `last_frame` and optionally
+    appended to a JSON-lines log.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.log_path: Optional[str] = None
+        self.stats: Dict[str, StageStats] = {}
+        self.frame: Optional[Dict[str, Any]] = None
+        self.last_frame: Optional[Dict[str, Any]] = None
+
+    def enable(self, log_path: Optional[str] = None):
+        """Starts collecting statistics, optionally logging frames to `log_path`."""
+        self.enabled = True
+        if log_path is not None:
+            self.log_path = log_path
+
+    def disable(self):
+        """Stops collecting statistics and logging (collected statistics are kept)."""
+        self.enabled = False
+        self.frame = None
+
+    def reset(self):
+        """Clears all collected statistics."""
+        self.stats.clear()
+        self.last_frame = None
+
+    def stage(self, name: str):
+        """Returns a context manager timing one execution of the named stage."""
+        return _Stage(self, name) if self.enabled else _NULL_STAGE
+
+    def record(self, name: str, seconds: float, items: int = 0):
+        """Adds one execution of a stage to the statistics and the current frame."""
+        stats = self.stats.get(name)
+        if stats is None:
+            stats = self.stats[name] = StageStats()
+        stats.calls += 1
+        stats.items += items
+        stats.total_s += seconds
+        stats.last_s = seconds
+        stats.max_s = max(stats.max_s, seconds)
+        if self.frame is not None:
+            entry = self.frame['stages'].setdefault(name, {'calls': 0, 'ms': 0.0, 'items': 0})
+            entry['calls'] += 1
+            entry['ms'] += seconds * 1000
+            entry['items'] += items
+
+    def begin_frame(self, trigger: str):
+        """Starts gathering the stages of one recalculation (e.g. trigger 'full' or 'live')."""
+        if self.enabled:
+            self.frame = {'time': time.strftime('%Y-%m-%dT%H:%M:%S'), 'trigger': trigger, 'stages': {}, '_start': time.perf_counter()}
+
+    def end_frame(self) -> Optional[Dict[str, Any]]:
+        """
+        Finishes the current frame, records its total time, appends it to the
+        log if one is set, and returns it.
+        """
+        frame, self.frame = self.frame, None
+        if frame is None:
+            return None
+        frame['total_ms'] = (time.perf_counter() - frame.pop('_start')) * 1000
+        self.last_frame = frame
+        if self.log_path:
+            try:
+                with open(self.log_path, 'a', encoding="utf-8") as f:
+                    f.write(json.dumps(frame) + "\n")
+            except OSError:
+                self.log_path = None # Stop logging rather than failing every recalculation
+        return frame
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Returns the statistics of every stage, keyed by stage name."""
+        return {name: stats.as_dict() for name, stats in self.stats.items()}
+
+
+# Process-wide profiler used by the engine and the GUI
+PROFILER = Profiler()
+
+
+def stage(name: str):
+    """Shorthand for PROFILER.stage(name)."""
+    return PROFILER.stage(name)
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""
+ALULA design reports.
+
+Loads and evaluates many saved designs at once (a directory, a glob or a list
+of files written by "Save Design...") in a process pool, and writes one
+consolidated report with each design's calculations, its FAR Part 103
+pass/fail per limit and the messages of the 'Issues & Feedback' tab. Files
+that cannot be read or evaluated are reported individually and do not stop
+the run.
+
+Command line usage (see `python ALULA.py report --help`):
+
+    python ALULA.py report designs/ -o report.json
+    python ALULA.py report "designs/**/*.json" -o report.csv
+"""
+
+import csv
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Sequence
+
+import alula_engine
+
+REPORT_FORMATS = ('json', 'csv')
+
+
+def collect_design_files(paths: Sequence[str], recursive: bool = False) -> List[str]:
+    """
+    Expands the command line paths into a list of design files: directories
+    contribute their '*.json' files (including subdirectories if
+    `recursive`), glob patterns their matches, and plain paths are kept as
+    given so that missing files show up as errors in the report. Duplicates
+    are dropped while keeping the first occurrence.
+    """
+    files: List[str] = []
+    for path in paths:
+        if os.path.isdir(path):
+            pattern = os.path.join(path, '**', '*.json') if recursive else os.path.join(path, '*.json')
+            files.extend(sorted(glob.glob(pattern, recursive=recursive)))
+        elif glob.has_magic(path):
+            files.extend(sorted(glob.glob(path, recursive=True)))
+        else:
+            files.append(path)
+    return list(dict.fromkeys(files))
+
+
+def evaluate_record(record: Any) -> Dict[str, Any]:
+    """
+    Evaluates one design record (as loaded from a saved design) and returns
+    its report entry: vehicle type, overall and per-limit Part 103
+    compliance, feedback messages and calculations. A record that is not a
+    valid design or cannot be evaluated gets an 'error' entry instead of
+    raising.
+    """
+    entry: Dict[str, Any] = {}
+    try:
+        if not isinstance(record, dict):
+            raise ValueError("Not a design record (expected a JSON object)")
+        if not isinstance(record.get('main_inputs') or {}, dict):
+            raise ValueError("'main_inputs' must be a JSON object")
+        components = record.get('component_weights')
+        if components is not None and not (isinstance(components, list) and all(isinstance(c, dict) for c in components)):
+            raise ValueError("'component_weights' must be a list of JSON objects")
+        v_type = alula_engine.normalize_inputs(record.get('main_inputs'))['vehicle_type']
+        entry['vehicle_type'] = v_type
+        calc = alula_engine.evaluate_design(record)
+    except (ValueError, KeyError, TypeError, ZeroDivisionError, OverflowError) as e:
+        entry['error'] = str(e.args[0]) if isinstance(e, KeyError) else str(e)
+        return entry
+    compliance = alula_engine.part103_compliance(v_type, calc)
+    entry['compliant'] = all(check['passed'] for check in compliance.values())
+    entry['compliance'] = compliance
+    entry['feedback'] = alula_engine.design_feedback(v_type, calc)
+    entry['calculations'] = calc
+    return entry
+
+
+def evaluate_file(path: str) -> Dict[str, Any]:
+    """
+    Loads and evaluates one design file and returns its report entry (see
+    evaluate_record), starting with the file name. A file that cannot be read
+    gets an 'error' entry instead of raising.
+    """
+    entry: Dict[str, Any] = {'file': path}
+    try:
+        record = alula_engine.load_design_file(path)
+    except (OSError, ValueError) as e:
+        entry['error'] = str(e)
+        return entry
+    entry.update(evaluate_record(record))
+    return entry
+
+
+def iter_report(files: Sequence[str], workers: int = 1, chunk_size: int = 8) -> Iterator[Dict[str, Any]]:
+    """
+    Yields the report entry of every file, in the order of `files`. With
+    more than one worker the files are loaded and evaluated in a process pool,
+    `chunk_size` files per task.
+    """
+    if workers <= 1 or len(files) <= 1:
+        for path in files:
+            yield evaluate_file(path)
+        return
+    with ProcessPoolExecutor(max_workers=min(workers, len(files))) as pool:
+        yield from pool.map(evaluate_file, files, chunksize=max(1, chunk_size))
+
+
+def summarize(entries: Sequence[Dict[str, Any]]) -> Dict[str, int]:
+    """Counts the designs in a report by outcome."""
+    errors = sum(1 for entry in entries if 'error' in entry)
+    compliant = sum(1 for entry in entries if entry.get('compliant'))
+    return {'designs': len(entries), 'evaluated': len(entries) - errors, 'compliant': compliant,
+            'not_compliant': len(entries) - errors - compliant, 'errors': errors}
+
+
+def report_columns(entries: Iterable[Dict[str, Any]]) -> List[str]:
+    """
+    Determines the CSV columns of a report: file, vehicle type, overall
+    compliance, one pass/fail column per Part 103 limit, every calculation
+    key in first-seen order, the feedback messages and a final 'error' column.
+    """
+    limits = list(alula_engine.part103_limits('').keys())
+    calc_keys: Dict[str, None] = {}
+    for entry in entries:
+        calc_keys.update(dict.fromkeys(entry.get('calculations', {})))
+    return ['file', 'vehicle_type', 'compliant'] + [f"Part 103 {limit}" for limit in limits] + list(calc_keys) + ['feedback', 'error']
+
+
+def write_report(entries: Sequence[Dict[str, Any]], output, fmt: str):
+    """
+    Writes a consolidated report to an open text file: a JSON document with
+    a summary and one entry per design, or a CSV table with one row per
+    design.
+    """
+    if fmt == 'json':
+        json.dump({'generated': time.strftime('%Y-%m-%dT%H:%M:%S'), 'summary': summarize(entries), 'designs': list(entries)},
+                  output, indent=2, ensure_ascii=False)
+        output.write("\n")
+        return
+    writer = csv.DictWriter(output, fieldnames=report_columns(entries), extrasaction='ignore', restval='')
+    writer.writeheader()
+    for entry in entries:
+        row = {key: value for key, value in entry.items() if key not in ('compliance', 'feedback', 'calculations')}
+        row.update(entry.get('calculations', {}))
+        for limit, check in entry.get('compliance', {}).items():
+            row[f"Part 103 {limit}"] = 'pass' if check['passed'] else 'FAIL'
+        row['feedback'] = " | ".join(entry.get('feedback', []))
+        writer.writerow(row)
+
+
+def add_parser(subparsers):
+    """Registers the 'report' command with the ALULA command line parser."""
+    parser = subparsers.add_parser('report', help="Evaluate saved design files in parallel and write a compliance report",
+                                   description="Loads and evaluates every design file given (directories, glob patterns or files) "
+                                               "and writes one report with the calculations, Part 103 pass/fail per limit and the "
+                                               "design feedback. Unreadable files are listed as errors.")
+    parser.add_argument('paths', nargs='+', help="Design JSON files, directories of them, or glob patterns (e.g. 'designs/*.json')")
+    parser.add_argument('-o', '--output', required=True, help="Report file ('-' for stdout)")
+    parser.add_argument('-f', '--format', choices=REPORT_FORMATS, help="Report format (default: from the file extension, else json)")
+    parser.add_argument('-r', '--recursive', action='store_true', help="Include designs in subdirectories of the given directories")
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count() or 1, help="Worker processes (default: all cores)")
+    parser.set_defaults(func=run_command)
+
+
+def run_command(args) -> int:
+    """Runs the 'report' command from parsed command line arguments."""
+    files = collect_design_files(args.paths, args.recursive)
+    if not files:
+        print("report: no design files found", file=sys.stderr)
+        return 2
+
+    fmt = args.format or ('csv' if args.output.endswith('.csv') else 'json')
+    start = time.perf_counter()
+    entries = list(iter_report(files, workers=args.workers))
+    if args.output == '-':
+        write_report(entries, sys.stdout, fmt)
+    else:
+        with open(args.output, 'w', encoding='utf-8', newline='') as f:
+            write_report(entries, f, fmt)
+    elapsed = time.perf_counter() - start
+
+    summary = summarize(entries)
+    for entry in entries:
+        if 'error' in entry:
+            print(f"report: {entry['file']}: {entry['error']}", file=sys.stderr)
+    print(f"Evaluated {summary['evaluated']} of {summary['designs']} designs in {elapsed:.2f} s: "
+          f"{summary['compliant']} compliant, {summary['not_compliant']} not compliant, {summary['errors']} failed -> {args.output}",
+          file=sys.stderr)
+    return 0
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+ALULA streaming mode.
+
+Runs ALULA as a filter in a design pipeline: reads one design per line from
+standard input (a JSON object in the "Save Design..." format, i.e.
+'main_inputs' plus 'component_weights') and writes one result object per
+line to standard output as soon as it has been computed. Input is read
+lazily and only a bounded number of designs is in flight at a time, so
+memory use stays constant however long the stream is.
+
+Each result holds the input line number, the design's 'id' if it has one,
+and the same fields as an entry of the 'report' command (vehicle type,
+Part 103 compliance, feedback and calculations), or an 'error'.
+
+Command line usage (see `python ALULA.py stream --help`):
+
+    generate_designs | python ALULA.py stream -j 4 --order completion | downstream_tool
+"""
+
+import json
+import os
+import queue
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, NamedTuple, Optional, Tuple
+
+import alula_report
+
+OUTPUT_ORDERS = ('input', 'completion')
+
+
+def evaluate_line(line_number: int, text: str) -> Dict[str, Any]:
+    """
+    Parses and evaluates one input line, returning its result object. Lines
+    that are not valid JSON or not valid designs get an 'error' entry.
+    """
+    result: Dict[str, Any] = {'line': line_number}
+    try:
+        record = json.loads(text)
+    except ValueError as e:
+        result['error'] = f"Invalid JSON: {e}"
+        return result
+    if isinstance(record, dict) and 'id' in record:
+        result['id'] = record['id']
+    result.update(alula_report.evaluate_record(record))
+    return result
+
+
+def _numbered_lines(lines: Iterable[str]) -> Iterator[Tuple[int, str]]:
+    """Yields (line number, text) for every non-blank input line, numbering from 1."""
+    for number, text in enumerate(lines, start=1):
+        if text.strip():
+            yield number, text
+
+
+class _StreamEnd(NamedTuple):
+    """End of input marker posted by the reader thread, with the number of designs submitted."""
+    submitted: int
+    error: Optional[Exception]
+
+
+def iter_stream(lines: Iterable[str], workers: int = 1, order: str = 'input',
+                max_in_flight: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Yields one result object per non-blank input line. With more than one
+    worker, a reader thread submits lines to a process pool while results are
+    yielded, in input order or, if `order` is 'completion', as soon as each
+    one finishes. At most `max_in_flight` designs (default: four per worker)
+    are submitted but not yet yielded; further lines are not read until one
+    of them has been yielded.
+    """
+    if order not in OUTPUT_ORDERS:
+        raise ValueError(f"Unknown output order {order!r}; expected one of {', '.join(OUTPUT_ORDERS)}")
+    numbered = _numbered_lines(lines)
+    if workers <= 1:
+        for number, text in numbered:
+            yield evaluate_line(number, text)
+        return
+
+    slots = threading.Semaphore(max(1, max_in_flight or workers * 4))
+    stopping = threading.Event()
+    # Futures (in submission order for 'input', as they complete for 'completion'), then an end marker
+    events: "queue.Queue[Any]" = queue.Queue()
+
+    def feed(pool: ProcessPoolExecutor):
+        """Reader thread: submits input lines as in-flight slots free up."""
+        submitted = 0
+        try:
+            for number, text in numbered:
+                slots.acquire()
+                if stopping.is_set():
+                    break
+                future = pool.submit(evaluate_line, number, text)
+                submitted += 1
+                if order == 'input':
+                    events.put(future)
+                else:
+                    future.add_done_callback(events.put)
+        except Exception as e: # e.g. undecodable input; re-raised by the consuming thread
+            events.put(_StreamEnd(submitted, e))
+        else:
+            events.put(_StreamEnd(submitted, None))
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        reader = threading.Thread(target=feed, args=(pool,), name="alula-stream-reader", daemon=True)
+        reader.start()
+        yielded, end = 0, None
+        try:
+            while end is None or yielded < end.submitted:
+                event = events.get()
+                if isinstance(event, _StreamEnd):
+                    end = event
+                    continue
+                yield event.result()
+                yielded += 1
+                slots.release()
+            if end.error is not None:
+                raise end.error
+        finally:
+            stopping.set()
+            slots.release() # Wake the reader if it is waiting for a slot
+
+
+def add_parser(subparsers):
+    """Registers the 'stream' command with the ALULA command line parser."""
+    parser = subparsers.add_parser('stream', help="Evaluate a JSON-lines stream of designs from stdin to stdout",
+                                   description="Reads one design per line (a saved design JSON object) from standard input and "
+                                               "writes one JSON result per line to standard output as soon as it is computed.")
+    parser.add_argument('-j', '--workers', type=int, default=1, help="Worker processes (default: 1, evaluate in the calling process)")
+    parser.add_argument('--order', choices=OUTPUT_ORDERS, default='input',
+                        help="Output order with several workers: input order (default) or completion order")
+    parser.add_argument('--max-in-flight', type=int, help="Designs evaluated or waiting at once (default: four per worker)")
+    parser.set_defaults(func=run_command)
+
+
+def run_command(args) -> int:
+    """Runs the 'stream' command from parsed command line arguments."""
+    try:
+        for result in iter_stream(sys.stdin, workers=args.workers, order=args.order, max_in_flight=args.max_in_flight):
+            sys.stdout.write(json.dumps(result) + "\n")
+            sys.stdout.flush() # Downstream tools see each result as soon as it is ready
+    except BrokenPipeError:
+        # The downstream tool stopped reading; exit quietly like other filters
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 1
+    return 0
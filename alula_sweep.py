@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+"""
+ALULA parametric sweeps.
+
+Evaluates the full Cartesian product of value ranges for any design inputs
+(e.g. wing_area x engine_hp x pilot_weight) on top of a base design, spreading
+the work across a process pool and streaming one row per design to a CSV or
+JSON-lines file as results come in.
+
+Command line usage (see `python ALULA.py sweep --help`):
+
+    python ALULA.py sweep base.json -r wing_area=150:300:10 -r engine_hp=10,15,20,28 -o sweep.csv
+
+With --cache-dir, results are stored in an on-disk cache shared by all
+workers, so re-running an overlapping sweep only solves the new designs.
+"""
+
+import csv
+import itertools
+import json
+import math
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import alula_cache
+import alula_engine
+
+# Base design and result cache shared by every task a worker process runs (set by _init_worker)
+_worker_base: Dict[str, Any] = {}
+_worker_cache: Optional[alula_cache.ResultCache] = None
+
+
+def parse_range(spec: str) -> Tuple[str, List[Any]]:
+    """
+    Parses a 'key=values' sweep specification. Values are either a numeric
+    range 'start:stop:step' (stop included) or a comma separated list, which
+    may also hold non-numeric choices such as vehicle types.
+    """
+    key, sep, values = spec.partition('=')
+    key, values = key.strip(), values.strip()
+    if not sep or not key or not values:
+        raise ValueError(f"Invalid range {spec!r}; expected KEY=START:STOP:STEP or KEY=V1,V2,...")
+    if ':' in values and ',' not in values:
+        try:
+            start, stop, step = (float(v) for v in values.split(':'))
+        except ValueError:
+            raise ValueError(f"Invalid numeric range {values!r} for {key!r}") from None
+        if step <= 0 or stop < start:
+            raise ValueError(f"Range for {key!r} must have step > 0 and stop >= start")
+        count = math.floor((stop - start) / step + 1e-9) + 1
+        return key, [round(start + i * step, 10) for i in range(count)]
+    return key, [_parse_value(v.strip()) for v in values.split(',') if v.strip()]
+
+
+def _parse_value(text: str) -> Any:
+    """Converts a list entry to a float when possible, otherwise keeps the string."""
+    try:
+        return float(text)
+    except ValueError:
+        return text
+
+
+def _init_worker(base_record: Dict[str, Any], cache_dir: Optional[str] = None):
+    """Process pool initializer: stores the base design and opens the result cache in the worker."""
+    global _worker_base, _worker_cache
+    _worker_base = base_record
+    _worker_cache = alula_cache.ResultCache(directory=cache_dir) if cache_dir else None
+
+
+def evaluate_point(base_record: Dict[str, Any], keys: Sequence[str], values: Sequence[Any],
+                   cache: Optional[alula_cache.ResultCache] = None) -> Dict[str, Any]:
+    """
+    Evaluates the base design with the given parameter values applied and
+    returns a flat result row (parameters first, then calculations). Designs
+    that cannot be evaluated get an 'error' entry instead of raising. When a
+    cache is given, previously solved designs are served from it.
+    """
+    row: Dict[str, Any] = dict(zip(keys, values))
+    record = alula_engine.copy_design_record(base_record)
+    try:
+        for key, value in zip(keys, values):
+            alula_engine.set_design_parameter(record, key, value)
+        row.update(cache.evaluate(record) if cache else alula_engine.evaluate_design(record))
+    except (KeyError, ValueError, TypeError, ZeroDivisionError, OverflowError) as e:
+        row['error'] = str(e.args[0]) if isinstance(e, KeyError) else str(e)
+    return row
+
+
+def _evaluate_chunk(keys: Sequence[str], chunk: Sequence[Sequence[Any]]) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """
+    Worker task: evaluates one chunk of sweep points against the worker's
+    base design, returning the rows and the cache counters for the chunk.
+    """
+    if _worker_cache is None:
+        return [evaluate_point(_worker_base, keys, values) for values in chunk], {}
+    before = _worker_cache.stats()
+    rows = [evaluate_point(_worker_base, keys, values, _worker_cache) for values in chunk]
+    after = _worker_cache.stats()
+    return rows, {name: after[name] - before[name] for name in ('hits', 'disk_hits', 'misses')}
+
+
+def _chunked(iterable: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Yields successive lists of at most `size` items from an iterable."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _add_stats(total: Optional[Dict[str, int]], stats: Dict[str, int]):
+    """Accumulates cache counters into `total` (if the caller asked for them)."""
+    if total is not None:
+        for name, value in stats.items():
+            total[name] = total.get(name, 0) + value
+
+
+def iter_sweep(base_record: Dict[str, Any], ranges: Sequence[Tuple[str, List[Any]]], workers: int = 1,
+               chunk_size: int = 256, cache_dir: Optional[str] = None,
+               cache_stats: Optional[Dict[str, int]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Yields one result row per point of the Cartesian product of `ranges`, in
+    grid order. With more than one worker the points are evaluated in a
+    process pool; only a bounded number of chunks is in flight at a time, so
+    memory use does not grow with the size of the sweep. `cache_dir` enables
+    the shared on-disk result cache; its hit/miss counters are added to
+    `cache_stats` as chunks complete.
+    """
+    keys = [key for key, _ in ranges]
+    points = itertools.product(*[values for _, values in ranges])
+    base = alula_engine.copy_design_record(base_record)
+    if workers <= 1:
+        _init_worker(base, cache_dir)
+        for chunk in _chunked(points, chunk_size):
+            rows, stats = _evaluate_chunk(keys, chunk)
+            _add_stats(cache_stats, stats)
+            yield from rows
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(base, cache_dir)) as pool:
+        pending: deque = deque()
+        chunks = _chunked(points, chunk_size)
+        for chunk in itertools.islice(chunks, workers * 2):
+            pending.append(pool.submit(_evaluate_chunk, keys, chunk))
+        while pending:
+            rows, stats = pending.popleft().result()
+            _add_stats(cache_stats, stats)
+            next_chunk = next(chunks, None)
+            if next_chunk is not None:
+                pending.append(pool.submit(_evaluate_chunk, keys, next_chunk))
+            yield from rows
+
+
+def output_columns(base_record: Dict[str, Any], ranges: Sequence[Tuple[str, List[Any]]]) -> List[str]:
+    """
+    Determines the output columns for a sweep: the swept parameters followed
+    by every calculation key produced in the sweep, and a final 'error'
+    column. Which results a design has depends on its non-numeric inputs
+    (e.g. the vehicle type or the airfoil), so a probe design is evaluated
+    for every combination of the swept non-numeric values, with the numeric
+    parameters at the first (or, if that cannot be evaluated, the last)
+    value of their ranges.
+    """
+    keys = [key for key, _ in ranges]
+    categorical = [any(not isinstance(v, (int, float)) for v in values) for _, values in ranges]
+    columns: List[str] = []
+    for combination in itertools.product(*[values if is_categorical else [None]
+                                           for (_, values), is_categorical in zip(ranges, categorical)]):
+        for end in (0, -1):
+            values = [choice if is_categorical else range_values[end]
+                      for choice, (_, range_values), is_categorical in zip(combination, ranges, categorical)]
+            row = evaluate_point(base_record, keys, values)
+            if 'error' not in row:
+                columns.extend(key for key in row if key not in columns and key not in keys)
+                break
+    return keys + columns + ['error']
+
+
+def write_sweep(rows: Iterable[Dict[str, Any]], columns: List[str], output, fmt: str) -> int:
+    """
+    Streams result rows to an open text file as CSV (one column per key) or
+    JSON lines, returning the number of rows written.
+    """
+    count = 0
+    if fmt == 'csv':
+        writer = csv.DictWriter(output, fieldnames=columns, extrasaction='ignore', restval='')
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    else:
+        for row in rows:
+            output.write(json.dumps(row) + "\n")
+            count += 1
+    return count
+
+
+def add_parser(subparsers):
+    """Registers the 'sweep' command with the ALULA command line parser."""
+    parser = subparsers.add_parser('sweep', help="Evaluate a grid of design variations in parallel",
+                                   description="Evaluates the Cartesian product of input ranges on top of a base design "
+                                               "and streams one row per design to a CSV or JSON-lines file.")
+    parser.add_argument('base', help="Base design JSON file (as written by 'Save Design...')")
+    parser.add_argument('-r', '--range', dest='ranges', action='append', required=True, metavar='KEY=VALUES',
+                        help="Values for one input: START:STOP:STEP or V1,V2,... Keys are design inputs "
+                             "(e.g. wing_area) or weight:<component>/arm:<component>. Repeat for more inputs.")
+    parser.add_argument('-o', '--output', required=True, help="Output file ('-' for stdout)")
+    parser.add_argument('-f', '--format', choices=['csv', 'jsonl'], help="Output format (default: from the file extension, else csv)")
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count() or 1, help="Worker processes (default: all cores)")
+    parser.add_argument('--chunk-size', type=int, default=256, help="Designs per worker task (default: 256)")
+    parser.add_argument('--cache-dir', help="Directory of an on-disk result cache shared across workers and runs")
+    parser.set_defaults(func=run_command)
+
+
+def run_command(args) -> int:
+    """Runs the 'sweep' command from parsed command line arguments."""
+    try:
+        base = alula_engine.load_design_file(args.base)
+        ranges = [parse_range(spec) for spec in args.ranges]
+        probe = alula_engine.copy_design_record(base)
+        for key, values in ranges:
+            alula_engine.set_design_parameter(probe, key, values[0])
+    except (IOError, json.JSONDecodeError, ValueError, KeyError) as e:
+        print(f"sweep: {e.args[0] if isinstance(e, KeyError) else e}", file=sys.stderr)
+        return 2
+
+    fmt = args.format or ('jsonl' if args.output.endswith(('.jsonl', '.ndjson')) else 'csv')
+    total = 1
+    for _, values in ranges:
+        total *= len(values)
+    start = time.perf_counter()
+    columns = output_columns(base, ranges)
+    cache_stats: Dict[str, int] = {}
+    rows = iter_sweep(base, ranges, workers=args.workers, chunk_size=max(1, args.chunk_size),
+                      cache_dir=args.cache_dir, cache_stats=cache_stats)
+    if args.output == '-':
+        count = write_sweep(rows, columns, sys.stdout, fmt)
+    else:
+        with open(args.output, 'w', encoding='utf-8', newline='') as f:
+            count = write_sweep(rows, columns, f, fmt)
+    elapsed = time.perf_counter() - start
+    print(f"Evaluated {count} of {total} designs in {elapsed:.2f} s ({count / elapsed if elapsed > 0 else 0:.0f}/s) -> {args.output}", file=sys.stderr)
+    if args.cache_dir:
+        hits = cache_stats.get('hits', 0) + cache_stats.get('disk_hits', 0)
+        print(f"Result cache: {hits} hits, {cache_stats.get('misses', 0)} misses ({args.cache_dir})", file=sys.stderr)
+    return 0
@@ -0,0 +1,398 @@
+# -*- coding: utf-8 -*-
+"""
+ALULA batch kernels.
+
+Array-at-a-time versions of the calculations in `alula_engine`, intended for
+trade studies with many thousands of candidate designs. Each kernel takes
+columnar inputs (NumPy arrays or anything broadcastable to them) and returns
+a dictionary of result arrays keyed with the same names the engine uses in
+its calculations dictionary.
+
+The air density `rho` may also be an array, e.g. one density per altitude
+of an altitude sweep (see alula_altitude); engine power is lapsed with
+density as in the engine.
+
+NumPy is an optional dependency: the GUI and the scalar engine never import
+this module, and the kernels raise a clear ImportError when NumPy is missing.
+"""
+
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError: # NumPy is optional; only the batch kernels need it
+    np = None
+
+import alula_engine
+from alula_engine import HELIUM_DENSITY_SLUG, KNOTS_TO_FPS, RHO_SEA_LEVEL_SLUG
+
+
+def _require_numpy():
+    """
+    Raises an informative error if NumPy is not installed.
+    """
+    if np is None:
+        raise ImportError("The ALULA batch kernels require NumPy. Install it with 'pip install numpy'.")
+
+
+def _as_arrays(*values):
+    """
+    Converts the given inputs to float64 arrays broadcast to a common shape.
+    """
+    return np.broadcast_arrays(*[np.asarray(v, dtype=np.float64) for v in values])
+
+
+def _power_ratio(rho):
+    """
+    Vectorized `alula_engine.engine_power_ratio` for air densities `rho`.
+    """
+    sigma = rho / RHO_SEA_LEVEL_SLUG
+    return np.maximum(0.0, sigma - (1 - sigma) / 7.55)
+
+
+def solve_bracketed(f: Callable, df: Callable, lo, hi, tol: float = 1e-3, max_iter: int = 60):
+    """
+    Vectorized safeguarded Newton solver for f(x) = 0 on the brackets [lo, hi].
+    Each element starts from `hi` and takes Newton steps, falling back to
+    bisection whenever a step leaves the current bracket. The brackets must
+    satisfy f(lo) <= 0 <= f(hi). Returns (root, converged) arrays.
+    """
+    lo, hi = np.array(lo, dtype=np.float64), np.array(hi, dtype=np.float64)
+    x = hi.copy()
+    converged = np.zeros(x.shape, dtype=bool)
+    for _ in range(max_iter):
+        active = ~converged
+        if not active.any():
+            break
+        with np.errstate(divide='ignore', invalid='ignore'):
+            fx, dfx = f(x), df(x)
+            step = fx / dfx
+        x_new = x - step
+        # Shrink the bracket around the root using the sign of f
+        lo = np.where(active & (fx < 0), x, lo)
+        hi = np.where(active & (fx > 0), x, hi)
+        outside = ~np.isfinite(x_new) | (x_new <= lo) | (x_new >= hi)
+        x_new = np.where(outside, 0.5 * (lo + hi), x_new)
+        done = (np.abs(x_new - x) < tol) | (fx == 0) | (hi - lo < tol)
+        x = np.where(active, x_new, x)
+        converged |= active & done
+    return x, converged
+
+
+def fixed_wing_batch(wing_area, wing_span, cd0, oswald_efficiency, engine_hp, prop_efficiency, cl_max, gross_weight,
+                     is_glider: bool = False, cockpit_drag=0.0, tail_drag=0.0, cg_location=0.0, neutral_point_ft=5.5,
+                     rho=RHO_SEA_LEVEL_SLUG, tol: float = 1e-3) -> Dict[str, "np.ndarray"]:
+    """
+    Evaluates fixed-wing (or, with `is_glider`, glider) performance for whole
+    columns of designs at once. Returns arrays for stall speed, VH, ROC,
+    L/D max, min sink rate and static margin in the same units as
+    `alula_engine.calculate_fixed_wing`, plus the best-climb speeds Vy and Vx
+    and the excess power at Vy (HP, negative if the design cannot climb)
+    for powered designs.
+
+    VH is the exact crossing of power required and power available (to
+    within `tol` ft/s) and the climb speeds come from the same closed-form
+    polar conditions as the scalar engine, so the two paths agree to within
+    the solver tolerances.
+    """
+    _require_numpy()
+    S, b, base_cd0, e, hp, eta, clm, W, cg, np_ft, rho = _as_arrays(
+        wing_area, wing_span, cd0, oswald_efficiency, engine_hp, prop_efficiency, cl_max, gross_weight,
+        cg_location, neutral_point_ft, rho)
+    total_cd0 = base_cd0 + np.asarray(cockpit_drag, dtype=np.float64) + np.asarray(tail_drag, dtype=np.float64)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Stall speed
+        lift_term = S * clm
+        vs = np.where(lift_term > 0, np.sqrt(2 * W / (rho * lift_term)), 0.0)
+
+        # Aspect Ratio and induced drag factor (k)
+        AR = np.where(S > 0, b ** 2 / S, 0.0)
+        k = np.where(AR * e > 0, 1 / (np.pi * AR * e), np.inf)
+
+        # L/D Max and Min Sink Rate
+        polar_ok = np.isfinite(k) & (k > 0) & (total_cd0 > 0)
+        ld_max = np.where(polar_ok, np.sqrt(total_cd0 / k) / (2 * total_cd0), 0.0)
+        v_ld_max = np.where(polar_ok, np.sqrt(2 * W / (rho * S * np.sqrt(total_cd0 / k))), 0.0)
+        min_sink = np.where(ld_max > 0, v_ld_max / ld_max, 0.0)
+
+        mean_chord = np.where(b > 0, S / b, 1.0)
+        static_margin = np.where(mean_chord > 0, (np_ft - cg) / mean_chord * 100, 0.0)
+
+    if is_glider:
+        return {
+            "Stall Speed": vs / KNOTS_TO_FPS,
+            "VH": v_ld_max / KNOTS_TO_FPS * 1.5, # VH for gliders estimated as 1.5 * speed at min sink
+            "ROC": np.zeros_like(vs),
+            "L/D Max": ld_max,
+            "Min Sink Rate": min_sink * 60,
+            "Static Margin": static_margin,
+        }
+
+    # Power required P(v) = a*v^3 + c/v for the parabolic drag polar
+    power_avail = hp * _power_ratio(rho) * eta * 550
+    a = 0.5 * rho * S * total_cd0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        c = np.where(polar_ok, 2 * k * W ** 2 / (rho * S), 0.0)
+        v_min_power = np.where(polar_ok, (c / (3 * a)) ** 0.25, 0.0)
+
+    def power_req(v):
+        return a * v ** 3 + c / v
+
+    # VH is the upper crossing of P_req and P_avail, bracketed between the
+    # minimum-power speed (or stall) and the speed where parasite power alone
+    # uses all of the available power.
+    valid = polar_ok & (vs > 0) & (power_avail > 0) & (a > 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        lo = np.where(valid, np.maximum(vs, v_min_power), 1.0)
+        hi = np.where(valid, (power_avail / a) ** (1 / 3), 2.0)
+        feasible = valid & (power_req(lo) <= power_avail) & (hi > lo)
+    lo, hi = np.where(feasible, lo, 1.0), np.where(feasible, hi, 2.0)
+    vh, _ = solve_bracketed(lambda v: power_req(v) - power_avail, lambda v: 3 * a * v ** 2 - c / v ** 2, lo, hi, tol)
+    vh = np.where(feasible, vh, 0.0)
+
+    # Best rate of climb (Vy) is at the minimum-power speed and best angle (Vx)
+    # at the root of 2*a*v^4 + P*v - 2*c below the min-drag speed, both limited
+    # to the range from 1.05 Vs up to 1.05 VH as in the scalar engine.
+    climb_ok = polar_ok & (vs > 0) & (a > 0) & (c > 0)
+    climb_lo = vs * 1.05
+    climb_hi = np.maximum(climb_lo, np.where(vh > vs, vh * 1.05, vs * 1.5))
+    vy = np.where(climb_ok, np.clip(v_min_power, climb_lo, climb_hi), 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        v_min_drag = np.where(climb_ok, (c / a) ** 0.25, 1.0)
+    vx, _ = solve_bracketed(lambda v: 2 * a * v ** 4 + power_avail * v - 2 * c, lambda v: 8 * a * v ** 3 + power_avail,
+                            np.zeros_like(v_min_drag), v_min_drag, tol)
+    vx = np.where(power_avail > 0, vx, 0.0) # No excess thrust without power: Vx stays at its lower limit
+    vx = np.where(climb_ok, np.minimum(np.maximum(vx, climb_lo), vy), 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        excess_power = power_avail - np.where(vy > 0, power_req(vy), np.inf)
+        roc = np.where((W > 0) & np.isfinite(excess_power), excess_power / W * 60, 0.0)
+
+    return {
+        "Stall Speed": vs / KNOTS_TO_FPS,
+        "VH": vh / KNOTS_TO_FPS,
+        "ROC": np.maximum(roc, 0.0),
+        "Vy": vy / KNOTS_TO_FPS,
+        "Vx": vx / KNOTS_TO_FPS,
+        "Excess Power": excess_power / 550,
+        "L/D Max": ld_max,
+        "Min Sink Rate": min_sink * 60,
+        "Static Margin": static_margin,
+    }
+
+
+def wing_aerodynamics_batch(airfoil: str, wing_area, wing_span, cl_max, gross_weight,
+                            rho=RHO_SEA_LEVEL_SLUG) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Returns the wing Cl_max and profile drag coefficient columns of a fixed
+    wing with an airfoil from the polar library, as `alula_engine.wing_aerodynamics`
+    computes them, interpolating the section's summary table in log(Re).
+    """
+    _require_numpy()
+    import alula_airfoils
+    table = alula_airfoils.get_library().summary_table(airfoil)
+    S, b, clm, W, rho = _as_arrays(wing_area, wing_span, cl_max, gross_weight, rho)
+    log_re, min_re = np.asarray(table['log_reynolds']), np.exp(table['log_reynolds'][0])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        chord = np.where(b > 0, S / b, 0.0)
+
+        def section(field: str, v):
+            reynolds = np.nan_to_num(rho * v * chord / alula_engine.AIR_VISCOSITY_SLUG_FT_S)
+            return np.interp(np.log(np.maximum(reynolds, min_re)), log_re, table[field])
+
+        def stall_speed(cl):
+            return np.where(S * cl > 0, np.sqrt(2 * W / (rho * S * cl)), 0.0)
+
+        section_cl_max = section('cl_max', stall_speed(clm))
+        for _ in range(alula_engine.AIRFOIL_STALL_ITERATIONS - 1):
+            section_cl_max = section('cl_max', stall_speed(alula_engine.AIRFOIL_CL_MAX_FACTOR * section_cl_max))
+        profile_cd0 = section('cd_min', np.full_like(S, alula_engine.AIRFOIL_CRUISE_SPEED_KNOTS * KNOTS_TO_FPS))
+    return alula_engine.AIRFOIL_CL_MAX_FACTOR * section_cl_max, profile_cd0
+
+
+def rotorcraft_batch(rotor_diameter, rotor_rpm, num_blades, gross_weight, engine_hp, is_helicopter: bool,
+                     rotor_blade_chord=0.6, rotor_blade_cd=0.012, cd0=0.05, cockpit_drag=0.0, prop_efficiency=0.75,
+                     rho=RHO_SEA_LEVEL_SLUG, speeds_knots: Optional[Sequence[float]] = None,
+                     tol: float = 1e-3) -> Dict[str, "np.ndarray"]:
+    """
+    Evaluates helicopter (or, with `is_helicopter=False`, gyrocopter)
+    performance for whole columns of rotor designs. Returns arrays for disc
+    loading, tip speed, VH, hover ROC, the minimum-power speed and the power
+    margin there, using the same power model as
+    `alula_engine.rotorcraft_power_model`. Helicopters also get the excess
+    power in hover (HP, negative above the hover ceiling).
+
+    If `speeds_knots` is given, the result also holds "Power Margin": a
+    (designs x speeds) array of power available minus power required in HP.
+    """
+    _require_numpy()
+    D, rpm, nb, W, hp, chord, blade_cd, base_cd0, cockpit, eta, rho = _as_arrays(
+        rotor_diameter, rotor_rpm, num_blades, gross_weight, engine_hp, rotor_blade_chord, rotor_blade_cd,
+        cd0, cockpit_drag, prop_efficiency, rho)
+
+    fuselage_drag_area = (base_cd0 + cockpit) * 15 # Assumed reference area for fuselage drag
+    rotor_area = np.pi * (D / 2) ** 2
+    tip_speed = (rpm * 2 * np.pi / 60) * (D / 2)
+    power_avail = hp * _power_ratio(rho) * eta * 550
+    with np.errstate(divide='ignore', invalid='ignore'):
+        solidity = np.where(D > 0, nb * chord / (np.pi * D), 0.0)
+        disc_loading = np.where(rotor_area > 0, W / rotor_area, 0.0)
+
+    if is_helicopter:
+        parasite = 0.5 * rho * fuselage_drag_area
+        profile = (solidity / 8) * rho * rotor_area * tip_speed ** 3 * blade_cd
+        with np.errstate(divide='ignore', invalid='ignore'):
+            induced = np.where(rotor_area > 0, W ** 2 / (2 * rho * rotor_area), 0.0)
+            hover_power = np.where(rotor_area > 0, W ** 1.5 / np.sqrt(2 * rho * rotor_area), np.inf) + profile
+            roc = np.where(W > 0, (power_avail - hover_power) / W * 60, 0.0)
+            v_min_power = np.where((induced > 0) & (parasite > 0), (induced / (3 * parasite)) ** 0.25, 0.0)
+    else:
+        parasite = 0.5 * rho * (fuselage_drag_area + rotor_area * 0.05)
+        profile = np.zeros_like(parasite)
+        induced = np.zeros_like(parasite)
+        roc = np.zeros_like(parasite)
+        v_min_power = np.full_like(parasite, 15 * KNOTS_TO_FPS) # Power only grows with speed
+
+    def power_req(v):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return parasite * v ** 3 + profile + np.where(induced > 0, induced / v, 0.0)
+
+    # VH is the upper crossing of P_req and P_avail above the minimum-power speed
+    excess_power = power_avail - profile
+    with np.errstate(divide='ignore', invalid='ignore'):
+        v_hi = np.where((parasite > 0) & (excess_power > 0), (excess_power / parasite) ** (1 / 3), 0.0)
+    if is_helicopter:
+        feasible = (v_hi > v_min_power) & (v_min_power > 0) & (power_req(v_min_power) <= power_avail)
+        lo, hi = np.where(feasible, v_min_power, 1.0), np.where(feasible, v_hi, 2.0)
+        vh, _ = solve_bracketed(lambda v: power_req(v) - power_avail,
+                                lambda v: 3 * parasite * v ** 2 - induced / v ** 2, lo, hi, tol)
+        vh = np.where(feasible, vh, 0.0)
+    else:
+        vh = v_hi # Pure cubic power curve, solved in closed form
+
+    result = {
+        "Disc Loading": disc_loading,
+        "Tip Speed": tip_speed,
+        "VH": vh / KNOTS_TO_FPS,
+        "ROC": np.maximum(roc, 0.0),
+        "Min Power Speed": v_min_power / KNOTS_TO_FPS,
+        "Power Margin @ Min Power": np.where(v_min_power > 0, (power_avail - power_req(v_min_power)) / 550, 0.0),
+    }
+    if is_helicopter:
+        result["Excess Power"] = (power_avail - hover_power) / 550
+    if speeds_knots is not None:
+        v = np.asarray(speeds_knots, dtype=np.float64) * KNOTS_TO_FPS
+        expand = lambda arr: np.asarray(arr)[..., None]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            p_req = expand(parasite) * v ** 3 + expand(profile) + np.where(expand(induced) > 0, expand(induced) / v, 0.0)
+        result["Power Margin"] = np.where(v > 0, (expand(power_avail) - p_req) / 550, -np.inf)
+    return result
+
+
+def paraglider_batch(wing_area, aspect_ratio, gross_weight, glider_class: str, rho=RHO_SEA_LEVEL_SLUG) -> Dict[str, "np.ndarray"]:
+    """
+    Evaluates paraglider performance for columns of wing area, aspect ratio
+    and gross weight, using the aerodynamic properties of one EN glider
+    class as in `alula_engine.calculate_paraglider`.
+    """
+    _require_numpy()
+    S, ar, W, rho = _as_arrays(wing_area, aspect_ratio, gross_weight, rho)
+    aero_props = alula_engine.PARAGLIDER_CLASS_MAP.get(glider_class)
+    if aero_props is None:
+        zeros = np.zeros_like(S)
+        return {"L/D Max": zeros, "Min Sink Rate": zeros, "Trim Speed": zeros, "Stall Speed": zeros, "Wing Loading": zeros, "VH": zeros}
+    cl_trim, cl_max, cd0, oswald_eff = aero_props['cl_trim'], aero_props['cl_max'], aero_props['cd0'], aero_props['oswald']
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        vs = np.where(S * cl_max > 0, np.sqrt(2 * W / (rho * S * cl_max)), 0.0)
+        trim_speed = np.where(S * cl_trim > 0, np.sqrt(2 * W / (rho * S * cl_trim)), 0.0)
+        k = np.where(ar * oswald_eff > 0, 1 / (np.pi * ar * oswald_eff), np.inf)
+        polar_ok = np.isfinite(k) & (k > 0)
+        ld_max = np.where(polar_ok, np.sqrt(cd0 / k) / (2 * cd0), 0.0)
+        v_ld_max = np.where(polar_ok, np.sqrt(2 * W / (rho * S * np.sqrt(cd0 / k))), 0.0)
+        min_sink = np.where(ld_max > 0, v_ld_max / ld_max, 0.0)
+        wing_loading = np.where(S > 0, W / S, 0.0)
+
+    return {
+        "L/D Max": ld_max,
+        "Min Sink Rate": min_sink * 60,
+        "Trim Speed": trim_speed / KNOTS_TO_FPS,
+        "Stall Speed": vs / KNOTS_TO_FPS,
+        "Wing Loading": wing_loading,
+        "VH": trim_speed * 1.4 / KNOTS_TO_FPS, # Top speed estimated from trim speed
+    }
+
+
+def lta_batch(envelope_volume, cd0, engine_hp, prop_efficiency, gross_weight, rho=RHO_SEA_LEVEL_SLUG) -> Dict[str, "np.ndarray"]:
+    """
+    Evaluates Lighter Than Air vehicles for columns of envelope volume, drag
+    coefficient, power and gross weight as in `alula_engine.calculate_lta`
+    (helium at the pressure and temperature of the surrounding air).
+    """
+    _require_numpy()
+    volume, base_cd0, hp, eta, W, rho = _as_arrays(envelope_volume, cd0, engine_hp, prop_efficiency, gross_weight, rho)
+    buoyant_lift = (RHO_SEA_LEVEL_SLUG - HELIUM_DENSITY_SLUG) * (rho / RHO_SEA_LEVEL_SLUG) * 32.174 * volume
+    power_avail = hp * _power_ratio(rho) * eta * 550
+    frontal_area = np.pi * (volume * 0.75 / np.pi) ** (2 / 3) # Spherical equivalent
+    with np.errstate(divide='ignore', invalid='ignore'):
+        vh = np.where(base_cd0 > 0, (power_avail / (0.5 * rho * frontal_area * base_cd0)) ** (1 / 3), 0.0)
+    return {
+        "Buoyant Lift": buoyant_lift,
+        "Net Lift": buoyant_lift - W,
+        "VH": np.nan_to_num(vh) / KNOTS_TO_FPS,
+    }
+
+
+def evaluate_batch(inputs: Dict[str, Any], columns: Dict[str, Any], empty_weight, cg_location,
+                   rho=RHO_SEA_LEVEL_SLUG) -> Dict[str, "np.ndarray"]:
+    """
+    Evaluates one vehicle type for many variations of a design at once.
+    `inputs` are the normalized scalar inputs of the base design, `columns`
+    overrides any numeric inputs with arrays, and `empty_weight` /
+    `cg_location` come from the (possibly sampled) component table. Returns
+    the kernel results plus the weight columns, keyed like the engine's
+    calculations dictionary.
+    """
+    _require_numpy()
+    v_type = inputs['vehicle_type']
+
+    def col(key: str, default: float):
+        return columns[key] if key in columns else alula_engine.get_input_value(inputs, key, default)
+
+    empty_weight, cg_location = _as_arrays(empty_weight, cg_location)
+    fuel_weight = 0 if v_type in ['Glider', 'Paraglider'] else alula_engine.FAR_103_MAX_FUEL_LBS
+    pilot_weight = col('pilot_weight', 0.0)
+    gross_weight = empty_weight + pilot_weight + fuel_weight
+    cockpit_drag = alula_engine.COCKPIT_DRAG_MAP.get(inputs['cockpit_style'], 0)
+
+    if v_type in ['Fixed Wing', 'Glider']:
+        cl_max, cd0 = col('cl_max', 1.5), col('cd0', 0.025)
+        airfoil = str(inputs.get('airfoil') or '').strip()
+        if airfoil: # Section data of the airfoil, at each sample's Reynolds numbers
+            cl_max, profile_cd0 = wing_aerodynamics_batch(airfoil, col('wing_area', 1), col('wing_span', 1), cl_max, gross_weight, rho)
+            cd0 = cd0 + profile_cd0
+        result = fixed_wing_batch(
+            col('wing_area', 1), col('wing_span', 1), cd0, col('oswald_efficiency', 0.8),
+            0 if v_type == 'Glider' else col('engine_hp', 20), col('prop_efficiency', 0.75), cl_max, gross_weight,
+            is_glider=v_type == 'Glider', cockpit_drag=cockpit_drag, tail_drag=alula_engine.TAIL_DRAG_MAP.get(inputs['tail_style'], 0),
+            cg_location=cg_location, neutral_point_ft=col('neutral_point_ft', 5.5), rho=rho)
+    elif v_type in ['Gyrocopter', 'Helicopter']:
+        result = rotorcraft_batch(
+            col('rotor_diameter', 23), col('rotor_rpm', 350), col('num_blades', 2), gross_weight, col('engine_hp', 20),
+            v_type == 'Helicopter', col('rotor_blade_chord', 0.6), col('rotor_blade_cd', 0.012), col('cd0', 0.05),
+            cockpit_drag, col('prop_efficiency', 0.75), rho=rho)
+        result["Min. Fwd Speed"] = np.full(np.shape(gross_weight), 15.0)
+    elif v_type == 'Paraglider':
+        result = paraglider_batch(col('wing_area', 250), col('aspect_ratio', 5.5), gross_weight, inputs['glider_class'], rho=rho)
+    elif v_type == 'Lighter Than Air':
+        result = lta_batch(col('envelope_volume', 8000), col('cd0', 0.025), col('engine_hp', 20), col('prop_efficiency', 0.75), gross_weight, rho=rho)
+    else:
+        raise ValueError(f"Unknown vehicle type: {v_type!r}")
+
+    shape = np.shape(result["VH"])
+    result.update({
+        "Empty Weight": np.broadcast_to(empty_weight, shape),
+        "Gross Weight": np.broadcast_to(gross_weight, shape),
+        "CG Location": np.broadcast_to(cg_location, shape),
+    })
+    return result